@@ -1,62 +1,12 @@
-from typing import Generator, Optional, Annotated
 from fastapi import Depends, HTTPException, status
-from fastapi.security import OAuth2PasswordBearer
-from jose import jwt, JWTError
-from pydantic import ValidationError
-from sqlalchemy.orm import Session
 
-from app.core.config import settings
-from app.core.security import verify_password
-from app.core.database import SessionLocal
-from app.models import User
-from app.schemas.user import TokenData
-
-# OAuth2 scheme for token authentication
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login")
-
-def get_db() -> Generator:
-    """
-    Dependency that provides a database session.
-    Ensures the session is properly closed after use.
-    """
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-async def get_current_user(
-    db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)
-) -> User:
-    """
-    Dependency that gets the current user from the JWT token.
-    Raises an HTTP 401 Unauthorized error if the token is invalid or the user doesn't exist.
-    """
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-    
-    try:
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
-        )
-        email: str = payload.get("sub")
-        if email is None:
-            raise credentials_exception
-        token_data = TokenData(email=email)
-    except (JWTError, ValidationError):
-        raise credentials_exception
-    
-    user = db.query(User).filter(User.email == token_data.email).first()
-    if user is None:
-        raise credentials_exception
-    return user
+# Single cached implementation shared with the endpoint modules
+from app.core.security import get_current_user, oauth2_scheme
+from app.schemas.user import UserInDB
 
 async def get_current_active_user(
-    current_user: User = Depends(get_current_user),
-) -> User:
+    current_user: UserInDB = Depends(get_current_user),
+) -> UserInDB:
     """
     Dependency that checks if the current user is active.
     Raises an HTTP 400 Bad Request error if the user is inactive.
@@ -66,8 +16,8 @@ async def get_current_active_user(
     return current_user
 
 async def get_current_active_superuser(
-    current_user: User = Depends(get_current_user),
-) -> User:
+    current_user: UserInDB = Depends(get_current_user),
+) -> UserInDB:
     """
     Dependency that checks if the current user is a superuser.
     Raises an HTTP 403 Forbidden error if the user is not a superuser.
@@ -0,0 +1,86 @@
+"""
+Weak ETags and conditional requests for the project and task endpoints.
+
+Detail responses are tagged with the row's ``version`` column. List responses
+are tagged with the caller's ``data_version``, a counter every write to their
+projects or tasks bumps in the same transaction, combined with a digest of the
+request's query string. Both are counters rather than ``updated_at`` values
+because SQLite timestamps only have one-second resolution.
+
+Tasks embed their assignee, so when the assignee's profile changes a trigger
+in ``app.models.user`` bumps the version of each task assigned to them and the
+``data_version`` of each of those tasks' owners.
+
+If-Match compares tags weakly, since weak tags are the only ones we issue.
+"""
+import hashlib
+from typing import Optional
+
+from fastapi import HTTPException, Request, Response
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.user import User as UserModel
+
+ETAG_HEADER = "ETag"
+
+
+def _opaque(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def etag_matches(header: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match / If-Match header value matches etag."""
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return any(_opaque(tag) == _opaque(etag) for tag in header.split(","))
+
+
+def row_etag(version: int) -> str:
+    return f'W/"{version}"'
+
+
+def list_etag(request: Request, data_version: int) -> str:
+    query = "&".join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items()))
+    digest = hashlib.blake2b(
+        f"{request.url.path}?{query}".encode(), digest_size=8
+    ).hexdigest()
+    return f'W/"{data_version}-{digest}"'
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={ETAG_HEADER: etag})
+
+
+def check_if_match(request: Request, etag: str):
+    header = request.headers.get("if-match")
+    if header is not None and not etag_matches(header, etag):
+        raise HTTPException(status_code=412, detail="Precondition Failed")
+
+
+def stale_write(request: Request) -> HTTPException:
+    """Error for a write that lost a race with another one (StaleDataError)."""
+    if request.headers.get("if-match") is not None:
+        return HTTPException(status_code=412, detail="Precondition Failed")
+    return HTTPException(status_code=409, detail="Modified concurrently, retry")
+
+
+async def get_data_version(db: AsyncSession, user_id: int) -> int:
+    result = await db.execute(
+        select(UserModel.data_version).where(UserModel.id == user_id)
+    )
+    return result.scalar_one()
+
+
+async def bump_data_version(db: AsyncSession, user_id: int):
+    """Invalidate the user's list ETags; call before committing a write."""
+    users = UserModel.__table__
+    await db.execute(
+        update(users)
+        .where(users.c.id == user_id)
+        # Not a profile change, so keep updated_at out of it
+        .values(data_version=users.c.data_version + 1, updated_at=users.c.updated_at)
+    )
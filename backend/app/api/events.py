@@ -0,0 +1,248 @@
+"""
+In-process fan-out of project, task and comment changes to ``/api/v1/events``.
+
+The change log (``app.models.sync``) is the source of events: write endpoints
+call ``event_broker.notify()`` after they commit, and the broker reads the
+entries added since the last version it saw with one query and hands each to
+the subscribers of that owner (and project, when a subscriber picked some).
+The log is also polled every ``EVENTS_POLL_SECONDS``, which picks up writes
+made by other worker processes. Nothing is read while nobody is subscribed.
+
+Every subscriber has a bounded queue. A subscriber that falls that far
+behind has its queue emptied and gets a single ``resync`` event carrying the
+last version it was sent; changes are dropped for it until it has read that
+event, and it catches up with ``GET /api/v1/sync?since=<version>``.
+Events themselves only name what changed; the data comes from ``/sync`` or
+the regular read endpoints.
+"""
+import asyncio
+import json
+import logging
+import time
+from collections import defaultdict
+from typing import AsyncIterator, Dict, FrozenSet, Optional, Set
+
+from sqlalchemy import func, select
+
+from app.core.config import settings
+from app.core.database import async_engine
+from app.models.sync import ChangeLog
+
+EVENT_STREAM_MEDIA_TYPE = "text/event-stream"
+
+logger = logging.getLogger(__name__)
+
+# Queue entry standing in for the changes dropped from a full queue
+_RESYNC = object()
+# Queue entry that ends the stream (broker shutdown)
+_CLOSE = object()
+# Queue entry for an idle stream, so proxies do not close it
+_KEEPALIVE = object()
+
+
+def _message(event: str, data: dict, event_id: Optional[int] = None) -> bytes:
+    lines = f"id: {event_id}\n" if event_id is not None else ""
+    return f"{lines}event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n".encode()
+
+
+class Subscription:
+    def __init__(self, owner_id: int, project_ids: Optional[FrozenSet[int]], version: int):
+        self.owner_id = owner_id
+        # None: all of the owner's projects
+        self.project_ids = project_ids
+        # Version of the last change sent to the client
+        self.version = version
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=settings.EVENTS_QUEUE_SIZE)
+        self.resync_pending = False
+
+    def offer(self, project_id: Optional[int], version: int, message: bytes) -> bool:
+        """Queue a change; False if it overflowed the queue."""
+        if self.project_ids is not None and project_id not in self.project_ids:
+            return True
+        if self.resync_pending:
+            return True
+        if self.queue.full():
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.resync_pending = True
+            self.queue.put_nowait(_RESYNC)
+            return False
+        self.queue.put_nowait((version, message))
+        return True
+
+    def keepalive(self) -> None:
+        if self.queue.empty():
+            self.queue.put_nowait(_KEEPALIVE)
+
+    def close(self) -> None:
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(_CLOSE)
+
+
+class EventBroker:
+    def __init__(self, read_batch: int = 1000):
+        self.read_batch = read_batch
+        self._subscribers: Dict[int, Set[Subscription]] = defaultdict(set)
+        self._count = 0
+        # Last change log version handed out; None while nobody is subscribed
+        self._version: Optional[int] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._task: Optional[asyncio.Task] = None
+        self.published = 0
+        self.resyncs = 0
+
+    def notify(self) -> None:
+        """Have the broker read the change log now (call after a commit)."""
+        if self._wakeup is not None and self._count:
+            self._wakeup.set()
+
+    async def subscribe(
+        self, owner_id: int, project_ids: Optional[FrozenSet[int]] = None
+    ) -> Subscription:
+        if self._task is None:
+            self._wakeup = asyncio.Event()
+            self._lock = asyncio.Lock()
+            self._task = asyncio.create_task(self._run())
+        async with self._lock:
+            if self._version is None:
+                async with async_engine.connect() as conn:
+                    self._version = await conn.scalar(
+                        select(func.coalesce(func.max(ChangeLog.version), 0))
+                    )
+            subscription = Subscription(owner_id, project_ids, self._version)
+            self._subscribers[owner_id].add(subscription)
+            self._count += 1
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        subscribers = self._subscribers.get(subscription.owner_id)
+        if subscribers is None or subscription not in subscribers:
+            return
+        subscribers.discard(subscription)
+        if not subscribers:
+            del self._subscribers[subscription.owner_id]
+        self._count -= 1
+
+    async def _run(self) -> None:
+        # Keepalives are sent from here on a timer, rather than by every
+        # stream waiting on its queue with a timeout of its own
+        next_keepalive = time.monotonic() + settings.EVENTS_KEEPALIVE_SECONDS
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), settings.EVENTS_POLL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            async with self._lock:
+                if not self._count:
+                    # Start again from the end of the log on the next subscribe
+                    self._version = None
+                    continue
+                try:
+                    await self._publish_new_entries()
+                except Exception:
+                    # Try again on the next wakeup rather than end the task
+                    logger.exception("Reading the change log for /events failed")
+            if time.monotonic() >= next_keepalive:
+                next_keepalive = time.monotonic() + settings.EVENTS_KEEPALIVE_SECONDS
+                for subscribers in self._subscribers.values():
+                    for subscription in subscribers:
+                        subscription.keepalive()
+
+    async def _publish_new_entries(self) -> None:
+        async with async_engine.connect() as conn:
+            while True:
+                rows = (await conn.execute(
+                    select(
+                        ChangeLog.version,
+                        ChangeLog.owner_id,
+                        ChangeLog.project_id,
+                        ChangeLog.entity,
+                        ChangeLog.entity_id,
+                        ChangeLog.deleted,
+                    )
+                    .where(ChangeLog.version > self._version)
+                    .order_by(ChangeLog.version)
+                    .limit(self.read_batch)
+                )).all()
+                for row in rows:
+                    self._publish(row)
+                if rows:
+                    self._version = rows[-1].version
+                if len(rows) < self.read_batch:
+                    return
+
+    def _publish(self, row) -> None:
+        subscribers = self._subscribers.get(row.owner_id)
+        if not subscribers:
+            return
+        # Encoded once and shared by every subscriber it goes to
+        message = _message("change", {
+            "entity": row.entity,
+            "id": row.entity_id,
+            "project_id": row.project_id,
+            "deleted": row.deleted,
+        }, row.version)
+        for subscription in subscribers:
+            if not subscription.offer(row.project_id, row.version, message):
+                self.resyncs += 1
+        self.published += 1
+
+    async def close(self) -> None:
+        """End every open stream and stop reading the change log."""
+        for subscribers in self._subscribers.values():
+            for subscription in subscribers:
+                subscription.close()
+        self._subscribers.clear()
+        self._count = 0
+        self._version = None
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        # The primitives belong to this event loop
+        self._task = self._wakeup = self._lock = None
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "subscribers": self._count,
+            "owners": len(self._subscribers),
+            "published": self.published,
+            "resyncs": self.resyncs,
+        }
+
+
+event_broker = EventBroker()
+
+
+async def stream_events(
+    owner_id: int,
+    project_ids: Optional[FrozenSet[int]] = None,
+    last_event_id: Optional[int] = None,
+) -> AsyncIterator[bytes]:
+    """Server-sent events for one client, subscribed for as long as it reads."""
+    subscription = await event_broker.subscribe(owner_id, project_ids)
+    try:
+        yield _message("ready", {"version": subscription.version})
+        if last_event_id is not None and last_event_id < subscription.version:
+            # A reconnecting client missed what happened in between
+            yield _message("resync", {"since": last_event_id})
+        while True:
+            item = await subscription.queue.get()
+            if item is _KEEPALIVE:
+                yield b": keepalive\n\n"
+                continue
+            if item is _CLOSE:
+                return
+            if item is _RESYNC:
+                subscription.resync_pending = False
+                yield _message("resync", {"since": subscription.version})
+                continue
+            subscription.version, message = item
+            yield message
+    finally:
+        event_broker.unsubscribe(subscription)
@@ -0,0 +1,60 @@
+"""
+``@email`` mentions in comments.
+
+``create_comment`` only checks whether the text looks like it mentions
+anyone and, if so, queues a ``comment_mentions`` job in the comment's
+transaction. The job looks the addresses up and records a notification for
+every active user mentioned other than the author; addresses that match no
+one are ignored.
+"""
+import re
+from typing import Any, Dict, Set
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.jobs import job_handler
+from app.models.comment import Comment as CommentModel
+from app.models.notification import Notification
+from app.models.user import User as UserModel
+
+MENTION_JOB = "comment_mentions"
+
+# "@" + an email address, not preceded by a word character (so a bare
+# address is not read as a mention of its domain part)
+MENTION_PATTERN = re.compile(r"(?<![\w@])@([\w.+-]+@[\w-]+(?:\.[\w-]+)+)")
+
+
+def parse_mentions(content: str) -> Set[str]:
+    return set(MENTION_PATTERN.findall(content))
+
+
+@job_handler(MENTION_JOB)
+async def notify_mentions(db: AsyncSession, payload: Dict[str, Any]) -> None:
+    comment = (await db.execute(
+        select(CommentModel.id, CommentModel.task_id, CommentModel.user_id, CommentModel.content)
+        .where(CommentModel.id == payload["comment_id"])
+    )).first()
+    if comment is None:
+        # Deleted before the job ran
+        return
+    emails = parse_mentions(comment.content)
+    if not emails:
+        return
+    notified = select(Notification.user_id).where(
+        Notification.comment_id == comment.id, Notification.kind == "mention"
+    )
+    recipients = (await db.scalars(
+        select(UserModel.id).where(
+            UserModel.email.in_(emails),
+            UserModel.is_active.is_(True),
+            UserModel.id != comment.user_id,
+            UserModel.id.not_in(notified),
+        )
+    )).all()
+    if recipients:
+        await db.execute(insert(Notification), [
+            {"user_id": user_id, "kind": "mention", "actor_id": comment.user_id,
+             "task_id": comment.task_id, "comment_id": comment.id}
+            for user_id in recipients
+        ])
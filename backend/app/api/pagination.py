@@ -0,0 +1,92 @@
+import base64
+import binascii
+import json
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, Response
+from sqlalchemy import Select, String, tuple_, type_coerce
+from sqlalchemy.orm import InstrumentedAttribute
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(order_by: str, key: Any, row_id: int) -> str:
+    raw = json.dumps({"o": order_by, "k": key, "i": row_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, order_by: str) -> Tuple[Any, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        key, row_id = data["k"], int(data["i"])
+        cursor_order = data["o"]
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if cursor_order != order_by:
+        raise HTTPException(status_code=400, detail="Cursor does not match order_by")
+    return key, row_id
+
+
+def paginate(
+    stmt: Select,
+    *,
+    sort_columns: Dict[str, InstrumentedAttribute],
+    id_column: InstrumentedAttribute,
+    order_by: str,
+    cursor: Optional[str],
+    skip: int,
+    limit: int,
+) -> Select:
+    """
+    Apply a stable ``(order_by, id)`` ordering and either offset or keyset
+    pagination to ``stmt``.
+
+    ``order_by`` names one of ``sort_columns``, optionally prefixed with ``-``
+    for descending order. The statement gains a trailing ``sort_key`` column
+    holding the raw stored sort value, which ``page_results`` uses to build
+    the next cursor; comparing against the raw value keeps keyset seeks exact
+    for SQLite DATETIME columns, whose text format varies with the writer.
+    """
+    descending = order_by.startswith("-")
+    column = sort_columns.get(order_by.lstrip("-"))
+    if column is None:
+        raise HTTPException(
+            status_code=400,
+            detail=f"order_by must be one of: {', '.join(sorted(sort_columns))}",
+        )
+    if cursor is not None and skip:
+        raise HTTPException(status_code=400, detail="Use either skip or cursor, not both")
+
+    sort_key = column if column is id_column else type_coerce(column, String)
+    stmt = stmt.add_columns(sort_key.label("sort_key"))
+
+    if cursor is not None:
+        key, row_id = decode_cursor(cursor, order_by)
+        if column is id_column:
+            stmt = stmt.where(id_column < row_id if descending else id_column > row_id)
+        else:
+            position = tuple_(sort_key, id_column)
+            stmt = stmt.where(
+                position < (key, row_id) if descending else position > (key, row_id)
+            )
+
+    ordering = [column, id_column] if column is not id_column else [id_column]
+    stmt = stmt.order_by(*(c.desc() if descending else c.asc() for c in ordering))
+    if skip:
+        stmt = stmt.offset(skip)
+    return stmt.limit(limit)
+
+
+def page_results(
+    rows: Sequence[Any], *, order_by: str, limit: int, response: Response
+) -> List[Any]:
+    """
+    Unpack ``(entity, sort_key)`` rows produced by ``paginate`` and, when the
+    page is full, advertise the cursor for the next page in a response header.
+    """
+    items = [row[0] for row in rows]
+    if rows and len(rows) == limit:
+        last, key = rows[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(order_by, key, last.id)
+    return items
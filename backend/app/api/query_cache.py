@@ -0,0 +1,65 @@
+"""
+Result cache for the project and task list endpoints.
+
+Entries hold the serialized page and its next cursor, keyed by endpoint,
+user, the user's ``data_version`` and the parsed query parameters. Every
+write to a user's projects or tasks bumps ``data_version`` in the same
+transaction (see ``app.api.etags``), as does a profile change by anyone
+assigned one of their tasks, so a write makes all of that user's cached
+pages unreachable at once, in every worker, and they age out of the LRU.
+Parameters are keyed after FastAPI has parsed them, so ``?limit=100`` and no
+``limit`` at all share an entry.
+"""
+from typing import Any, NamedTuple, Optional, Union
+
+from fastapi import Response
+
+from app.api.etags import ETAG_HEADER
+from app.api.pagination import NEXT_CURSOR_HEADER
+from app.core.cache import SQLiteCache, TTLCache
+from app.core.config import settings
+
+
+class CachedPage(NamedTuple):
+    body: bytes
+    next_cursor: Optional[str]
+
+
+def create_query_cache() -> Union[TTLCache, SQLiteCache]:
+    if settings.QUERY_CACHE_BACKEND == "sqlite":
+        return SQLiteCache(
+            settings.QUERY_CACHE_PATH,
+            maxsize=settings.QUERY_CACHE_MAX_ENTRIES,
+            ttl=settings.QUERY_CACHE_TTL_SECONDS,
+        )
+    if settings.QUERY_CACHE_BACKEND != "memory":
+        raise ValueError(f"Unknown QUERY_CACHE_BACKEND {settings.QUERY_CACHE_BACKEND!r}")
+    return TTLCache(
+        maxsize=settings.QUERY_CACHE_MAX_ENTRIES,
+        ttl=settings.QUERY_CACHE_TTL_SECONDS,
+    )
+
+
+query_cache = create_query_cache()
+
+
+def list_cache_key(endpoint: str, user_id: int, data_version: int, **params: Any) -> str:
+    normalized = "&".join(
+        f"{name}={'' if value is None else value}" for name, value in sorted(params.items())
+    )
+    return f"{endpoint}:{user_id}:{data_version}:{normalized}"
+
+
+def store_page(key: str, body: bytes, response: Response) -> CachedPage:
+    """Cache a freshly serialized page unless it is too large to keep."""
+    page = CachedPage(body, response.headers.get(NEXT_CURSOR_HEADER))
+    if len(body) <= settings.QUERY_CACHE_MAX_ENTRY_BYTES:
+        query_cache.set(key, page)
+    return page
+
+
+def page_response(page: CachedPage, etag: str) -> Response:
+    headers = {ETAG_HEADER: etag}
+    if page.next_cursor:
+        headers[NEXT_CURSOR_HEADER] = page.next_cursor
+    return Response(content=page.body, media_type="application/json", headers=headers)
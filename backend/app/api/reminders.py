@@ -0,0 +1,268 @@
+"""
+Due-date reminders.
+
+``ReminderScheduler`` hands every task whose due date arrives to a sink, once,
+in (due_date, task id) order. How far it has got is kept in
+``reminder_watermark``; each batch goes to the sink inside the transaction
+that advances the watermark with a compare-and-set, so a batch lands once
+even with a scheduler in every worker process, and a restarted scheduler
+carries on where the last one stopped. The first scheduler to run starts the
+watermark at the current time rather than reminding of every past due date.
+
+What to send comes from an indexed range query from the watermark up to the
+current time. The in-memory min-heap only decides when to wake up: it is
+loaded with the next REMINDER_BATCH due dates after what it already holds
+and topped up as it drains, and the task write endpoints ``touch`` tasks
+whose due date they set so a new, earlier one is not slept through. Writes
+the heap never hears of (other processes) are picked up within
+REMINDER_MAX_SLEEP_SECONDS, the longest the scheduler sleeps.
+
+Due dates are compared with the wall clock, so a clock jump is handled like
+any other wakeup: jumping forward sends everything that became due in
+between, jumping back sends nothing twice. A reminder sent more than
+REMINDER_GRACE_SECONDS after its due date (after a restart or a jump) is
+marked overdue.
+"""
+import asyncio
+import heapq
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Dict, List, NamedTuple, Optional, Set, Tuple
+
+from sqlalchemy import DateTime, bindparam, insert, select, text, tuple_, update
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.notification import Notification
+from app.models.reminder import ReminderWatermark
+from app.models.task import Task as TaskModel, TaskStatus
+
+logger = logging.getLogger(__name__)
+
+# (due_date, task id), the order reminders go out in
+Key = Tuple[datetime, int]
+
+
+class DueTask(NamedTuple):
+    task_id: int
+    project_id: int
+    owner_id: int
+    assignee_id: Optional[int]
+    due_date: datetime
+    # Sent late (restart, clock jump) rather than when it fell due
+    overdue: bool
+
+
+# Called with the session whose transaction advances the watermark; whatever
+# it writes there commits with it. It must not commit itself.
+ReminderSink = Callable[[AsyncSession, List[DueTask]], Awaitable[None]]
+
+
+def utcnow() -> datetime:
+    # Due dates are stored as naive UTC
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+async def notify_due_tasks(db: AsyncSession, due: List[DueTask]) -> None:
+    """Default sink: a "due" or "overdue" notification for owner and assignee."""
+    rows = [
+        {"user_id": user_id, "kind": "overdue" if task.overdue else "due", "task_id": task.task_id}
+        for task in due
+        for user_id in {task.owner_id, task.assignee_id} - {None}
+    ]
+    if rows:
+        await db.execute(insert(Notification), rows)
+
+
+class ReminderScheduler:
+    def __init__(self, sink: ReminderSink, clock: Callable[[], datetime] = utcnow):
+        self.sink = sink
+        self.clock = clock
+        self._heap: List[Key] = []
+        # Everything up to this key is in the heap; None once the heap holds
+        # every future due date
+        self._frontier: Optional[Key] = None
+        self._loaded = False
+        self._watermark: Optional[Key] = None
+        self._watermark_version = 0
+        self._touched: Set[int] = set()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self.sent = 0
+
+    def start(self) -> None:
+        if self._task is None:
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+        self._task = self._wakeup = None
+
+    def touch(self, *task_ids: int) -> None:
+        """Re-read these tasks' due dates (call after a write that sets one)."""
+        if not task_ids:
+            return
+        self._touched.update(task_ids)
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.tick()
+            except Exception:
+                logger.exception("Sending due-date reminders failed")
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.next_delay())
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    async def tick(self) -> int:
+        """Send whatever is due now and refill the heap; returns tasks sent."""
+        async with AsyncSessionLocal() as db:
+            if self._watermark is None:
+                await self._load_watermark(db)
+            if self._touched:
+                await self._load_touched(db)
+        sent = await self._send_due()
+        async with AsyncSessionLocal() as db:
+            await self._refill(db)
+        return sent
+
+    def next_delay(self) -> float:
+        """Seconds until the earliest due date in the heap, capped."""
+        while self._heap and self._watermark is not None and self._heap[0] <= self._watermark:
+            heapq.heappop(self._heap)
+        if not self._heap:
+            return settings.REMINDER_MAX_SLEEP_SECONDS
+        delay = (self._heap[0][0] - self.clock()).total_seconds()
+        return min(max(delay, 0.0), settings.REMINDER_MAX_SLEEP_SECONDS)
+
+    async def _load_watermark(self, db: AsyncSession) -> None:
+        await db.execute(text(
+            "INSERT INTO reminder_watermark (id, due_date, task_id, version) "
+            "VALUES (1, :due_date, 0, 0) ON CONFLICT (id) DO NOTHING"
+        ).bindparams(bindparam("due_date", type_=DateTime())), {"due_date": self.clock()})
+        await db.commit()
+        row = (await db.execute(
+            select(
+                ReminderWatermark.due_date,
+                ReminderWatermark.task_id,
+                ReminderWatermark.version,
+            ).where(ReminderWatermark.id == 1)
+        )).one()
+        self._watermark = (row.due_date, row.task_id)
+        self._watermark_version = row.version
+
+    async def _load_touched(self, db: AsyncSession) -> None:
+        task_ids, self._touched = self._touched, set()
+        rows = await db.execute(
+            select(TaskModel.due_date, TaskModel.id)
+            .where(TaskModel.id.in_(task_ids), TaskModel.due_date.is_not(None))
+        )
+        for due_date, task_id in rows:
+            key = (due_date, task_id)
+            # Keys past the frontier come in with a later refill
+            if key > self._watermark and (self._frontier is None or key <= self._frontier):
+                heapq.heappush(self._heap, key)
+
+    async def _refill(self, db: AsyncSession) -> None:
+        if self._loaded and (self._frontier is None or len(self._heap) >= settings.REMINDER_BATCH // 2):
+            return
+        start = max(self._frontier or self._watermark, self._watermark)
+        keys = (await db.execute(
+            select(TaskModel.due_date, TaskModel.id)
+            .where(
+                TaskModel.due_date.is_not(None),
+                tuple_(TaskModel.due_date, TaskModel.id) > tuple_(*start),
+            )
+            .order_by(TaskModel.due_date, TaskModel.id)
+            .limit(settings.REMINDER_BATCH)
+        )).all()
+        for due_date, task_id in keys:
+            heapq.heappush(self._heap, (due_date, task_id))
+        self._loaded = True
+        self._frontier = tuple(keys[-1]) if len(keys) == settings.REMINDER_BATCH else None
+
+    async def _send_due(self) -> int:
+        sent = 0
+        while True:
+            now = self.clock()
+            async with AsyncSessionLocal() as db:
+                rows = (await db.execute(
+                    select(
+                        TaskModel.id,
+                        TaskModel.project_id,
+                        TaskModel.owner_id,
+                        TaskModel.assignee_id,
+                        TaskModel.due_date,
+                        TaskModel.status,
+                    )
+                    .where(
+                        TaskModel.due_date.is_not(None),
+                        tuple_(TaskModel.due_date, TaskModel.id) > tuple_(*self._watermark),
+                        TaskModel.due_date <= now,
+                    )
+                    .order_by(TaskModel.due_date, TaskModel.id)
+                    .limit(settings.REMINDER_BATCH)
+                )).all()
+                if not rows:
+                    return sent
+                grace = timedelta(seconds=settings.REMINDER_GRACE_SECONDS)
+                # Finished tasks are passed over but still move the watermark
+                due = [
+                    DueTask(row.id, row.project_id, row.owner_id, row.assignee_id,
+                            row.due_date, now - row.due_date > grace)
+                    for row in rows
+                    if row.status != TaskStatus.DONE
+                ]
+                last = (rows[-1].due_date, rows[-1].id)
+                try:
+                    if due:
+                        await self.sink(db, due)
+                    advanced = await db.execute(
+                        update(ReminderWatermark)
+                        .where(
+                            ReminderWatermark.id == 1,
+                            ReminderWatermark.version == self._watermark_version,
+                        )
+                        .values(
+                            due_date=last[0], task_id=last[1],
+                            version=ReminderWatermark.version + 1,
+                        )
+                    )
+                    if advanced.rowcount != 1:
+                        raise _Conflict()
+                    await db.commit()
+                except _Conflict:
+                    # Another scheduler sent this batch first
+                    await db.rollback()
+                    await self._load_watermark(db)
+                    continue
+                except OperationalError as exc:
+                    # Most likely another scheduler writing the same batch;
+                    # try again on the next wakeup
+                    logger.warning("Could not advance the reminder watermark: %s", exc)
+                    await db.rollback()
+                    await self._load_watermark(db)
+                    return sent
+            self._watermark = last
+            self._watermark_version += 1
+            sent += len(due)
+            self.sent += len(due)
+
+    def stats(self) -> Dict[str, int]:
+        return {"scheduled": len(self._heap), "sent": self.sent}
+
+
+class _Conflict(Exception):
+    pass
+
+
+reminder_scheduler = ReminderScheduler(notify_due_tasks)
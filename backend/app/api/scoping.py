@@ -0,0 +1,122 @@
+"""
+Ownership-scoped queries shared by the project, task and comment endpoints.
+
+A task is visible to a user when the project it belongs to is owned by that
+user. Every statement here expresses that as a join on Task.project_id, so
+SQLite drives it from the owner_id / project_id leading indexes instead of
+pairing every task with every project the user owns.
+
+Statements here load no relationships; callers add the loader options for
+what they serialize. Many-to-one relationships are ``lazy="raise_on_sql"``,
+so a missing option fails loudly instead of costing a query per row.
+"""
+from typing import Iterable, Optional, Set
+
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.interfaces import LoaderOption
+
+from app.models.comment import Comment as CommentModel
+from app.models.project import Project as ProjectModel
+from app.models.task import Task as TaskModel
+from app.models.user import User as UserModel
+
+
+def scoped_projects(user_id: int) -> Select:
+    return select(ProjectModel).where(ProjectModel.owner_id == user_id)
+
+
+def scoped_tasks(user_id: int) -> Select:
+    return (
+        select(TaskModel)
+        .join(ProjectModel, TaskModel.project_id == ProjectModel.id)
+        .where(ProjectModel.owner_id == user_id)
+    )
+
+
+def task_comments(task_id: int) -> Select:
+    # Callers check task visibility with get_task_version first
+    return (
+        select(CommentModel)
+        .where(CommentModel.task_id == task_id)
+        .order_by(CommentModel.created_at, CommentModel.id)
+    )
+
+
+async def get_project(
+    db: AsyncSession, project_id: int, user_id: int
+) -> Optional[ProjectModel]:
+    result = await db.execute(
+        scoped_projects(user_id).where(ProjectModel.id == project_id)
+    )
+    return result.scalars().first()
+
+
+async def get_task(
+    db: AsyncSession, task_id: int, user_id: int, *options: LoaderOption
+) -> Optional[TaskModel]:
+    result = await db.execute(
+        scoped_tasks(user_id).where(TaskModel.id == task_id).options(*options)
+    )
+    return result.scalars().first()
+
+
+async def get_project_version(
+    db: AsyncSession, project_id: int, user_id: int
+) -> Optional[int]:
+    result = await db.execute(
+        select(ProjectModel.version).where(
+            ProjectModel.owner_id == user_id, ProjectModel.id == project_id
+        )
+    )
+    return result.scalar_one_or_none()
+
+
+async def get_task_version(
+    db: AsyncSession, task_id: int, user_id: int
+) -> Optional[int]:
+    result = await db.execute(
+        select(TaskModel.version)
+        .join(ProjectModel, TaskModel.project_id == ProjectModel.id)
+        .where(ProjectModel.owner_id == user_id, TaskModel.id == task_id)
+    )
+    return result.scalar_one_or_none()
+
+
+async def owned_project_ids(
+    db: AsyncSession, project_ids: Iterable[int], user_id: int
+) -> Set[int]:
+    """Subset of project_ids owned by the user, in a single query."""
+    project_ids = set(project_ids)
+    if not project_ids:
+        return set()
+    result = await db.execute(
+        select(ProjectModel.id).where(
+            ProjectModel.owner_id == user_id, ProjectModel.id.in_(project_ids)
+        )
+    )
+    return set(result.scalars())
+
+
+async def visible_task_ids(
+    db: AsyncSession, task_ids: Iterable[int], user_id: int
+) -> Set[int]:
+    """Subset of task_ids the user can see, in a single query."""
+    task_ids = set(task_ids)
+    if not task_ids:
+        return set()
+    result = await db.execute(
+        select(TaskModel.id)
+        .join(ProjectModel, TaskModel.project_id == ProjectModel.id)
+        .where(ProjectModel.owner_id == user_id, TaskModel.id.in_(task_ids))
+    )
+    return set(result.scalars())
+
+
+async def existing_user_ids(db: AsyncSession, user_ids: Iterable[Optional[int]]) -> Set[int]:
+    """Subset of user_ids that exist (None entries are ignored), in a single query."""
+    user_ids = {user_id for user_id in user_ids if user_id is not None}
+    if not user_ids:
+        return set()
+    result = await db.execute(select(UserModel.id).where(UserModel.id.in_(user_ids)))
+    return set(result.scalars())
@@ -0,0 +1,79 @@
+"""
+Ranked full-text task search on the FTS5 ``task_search`` index.
+
+User input is never passed to MATCH as-is: it is reduced to word tokens,
+each quoted as a phrase (the last one as a prefix so results follow the user
+while typing), which FTS5 combines with AND.
+
+Bulk comment writes defer indexing for the tasks involved and reindex them
+once before they commit.
+"""
+import html
+import re
+from typing import Iterable, Optional, Union
+
+from sqlalchemy import Select, func, insert, literal_column, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app.models.project import Project as ProjectModel
+from app.models.search import (
+    REINDEX_DEFERRED_COMMENTS,
+    task_search,
+    task_search_deferred,
+)
+from app.models.task import Task as TaskModel
+
+# bm25 column weights: title, description, comments
+RANK_WEIGHTS = (10.0, 4.0, 1.0)
+
+# Highlight markers that cannot occur in escaped text
+_MARK_START, _MARK_END = "\x02", "\x03"
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+def fts_query(q: str) -> Optional[str]:
+    tokens = _TOKEN.findall(q)
+    if not tokens:
+        return None
+    return " ".join(f'"{token}"' for token in tokens) + "*"
+
+
+def search_tasks_statement(user_id: int, match: str) -> Select:
+    index = literal_column("task_search")
+    return (
+        select(
+            TaskModel,
+            func.snippet(index, -1, _MARK_START, _MARK_END, "…", 16).label("snippet"),
+        )
+        .join_from(task_search, TaskModel, TaskModel.id == task_search.c.rowid)
+        .join(ProjectModel, TaskModel.project_id == ProjectModel.id)
+        .where(index.match(match), ProjectModel.owner_id == user_id)
+        .order_by(func.bm25(index, *RANK_WEIGHTS), TaskModel.id)
+        .options(selectinload(TaskModel.assignee))
+    )
+
+
+def highlight(snippet: Optional[str]) -> str:
+    """HTML-escape an FTS5 snippet and turn its markers into <mark> tags."""
+    escaped = html.escape(snippet or "")
+    return escaped.replace(_MARK_START, "<mark>").replace(_MARK_END, "</mark>")
+
+
+async def defer_comment_indexing(
+    db: AsyncSession, task_ids: Union[Select, Iterable[int]]
+):
+    """Have the comment triggers skip these tasks until reindex_deferred_comments."""
+    if isinstance(task_ids, Select):
+        await db.execute(insert(task_search_deferred).from_select(["task_id"], task_ids))
+        return
+    rows = [{"task_id": task_id} for task_id in task_ids]
+    if rows:
+        await db.execute(insert(task_search_deferred), rows)
+
+
+async def reindex_deferred_comments(db: AsyncSession):
+    """Index the comments of every deferred task once; call before committing."""
+    for statement in REINDEX_DEFERRED_COMMENTS:
+        await db.execute(text(statement))
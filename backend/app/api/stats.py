@@ -0,0 +1,60 @@
+"""
+Dashboard stats for projects, read from the ``project_task_counts`` counters.
+
+Status and priority totals come straight from the counters (at most nine
+rows per project). Overdue depends on the clock rather than on writes, so it
+cannot be a counter; it is counted at read time as a range scan of the
+(project_id, due_date) index.
+"""
+from typing import Dict, Iterable
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.reminders import utcnow
+from app.models.stats import ProjectTaskCount
+from app.models.task import Task as TaskModel, TaskPriority, TaskStatus
+from app.schemas.project import ProjectStats
+
+
+async def project_stats(
+    db: AsyncSession, project_ids: Iterable[int]
+) -> Dict[int, ProjectStats]:
+    """Stats keyed by project id, in project_ids order; ids are not scoped."""
+    stats = {
+        project_id: ProjectStats(
+            project_id=project_id,
+            by_status={status: 0 for status in TaskStatus},
+            by_priority={priority: 0 for priority in TaskPriority},
+        )
+        for project_id in project_ids
+    }
+    if not stats:
+        return stats
+
+    counts = await db.execute(
+        select(
+            ProjectTaskCount.project_id,
+            ProjectTaskCount.status,
+            ProjectTaskCount.priority,
+            ProjectTaskCount.task_count,
+        ).where(ProjectTaskCount.project_id.in_(stats))
+    )
+    for project_id, status, priority, task_count in counts:
+        project = stats[project_id]
+        project.total += task_count
+        project.by_status[status] += task_count
+        project.by_priority[priority] += task_count
+
+    overdue = await db.execute(
+        select(TaskModel.project_id, func.count())
+        .where(
+            TaskModel.project_id.in_(stats),
+            TaskModel.due_date < utcnow(),
+            TaskModel.status != TaskStatus.DONE,
+        )
+        .group_by(TaskModel.project_id)
+    )
+    for project_id, count in overdue:
+        stats[project_id].overdue = count
+    return stats
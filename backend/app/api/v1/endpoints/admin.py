@@ -0,0 +1,36 @@
+from fastapi import APIRouter, Depends, Query
+
+from ....api.deps import get_current_active_superuser
+from ....api.query_cache import query_cache
+from ....core.config import settings
+from ....core.database import slow_query_log
+from ....core.security import principal_cache
+from ....schemas.user import UserInDB
+
+router = APIRouter()
+
+@router.get("/cache-stats")
+async def read_cache_stats(
+    current_user: UserInDB = Depends(get_current_active_superuser)
+):
+    """Size, hit/miss/eviction counters and hit ratio of this process's caches."""
+    return {
+        "query_cache": query_cache.stats(),
+        "principal_cache": principal_cache.stats(),
+    }
+
+@router.get("/slow-queries")
+async def read_slow_queries(
+    limit: int = Query(20, ge=1, le=200),
+    current_user: UserInDB = Depends(get_current_active_superuser)
+):
+    """
+    The statements this process spent the most time on, with call counts,
+    mean and max time, how many went over the slow-query threshold and the
+    last plan captured for them. Empty unless SLOW_QUERY_LOG is on.
+    """
+    return {
+        "enabled": settings.SLOW_QUERY_LOG,
+        "threshold_ms": settings.SLOW_QUERY_THRESHOLD_MS,
+        "statements": slow_query_log.top(limit),
+    }
@@ -0,0 +1,43 @@
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+
+from ....api.events import EVENT_STREAM_MEDIA_TYPE, stream_events
+from ....api.scoping import owned_project_ids
+from ....core.database import get_async_db
+from ....core.security import get_current_user
+from ....schemas.user import UserInDB
+
+router = APIRouter()
+
+@router.get("", response_class=StreamingResponse)
+async def stream_changes(
+    project_id: Optional[List[int]] = Query(None),
+    last_event_id: Optional[int] = Header(None),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserInDB = Depends(get_current_user)
+):
+    """
+    Server-sent events for changes to the current user's projects, tasks and
+    comments, optionally limited to some projects (repeat project_id).
+
+    The stream opens with a `ready` event carrying the current sync version.
+    Each `change` event has the change log version as its id and names the
+    entity, its project and whether it was deleted. A `resync` event means
+    changes were missed: fetch `GET /api/v1/sync?since=<since>` and carry on
+    reading. Reconnecting with Last-Event-ID gets a `resync` straight away if
+    anything happened in between.
+    """
+    project_ids = None
+    if project_id is not None:
+        project_ids = frozenset(project_id)
+        if await owned_project_ids(db, project_ids, current_user.id) != project_ids:
+            raise HTTPException(status_code=404, detail="Project not found")
+    # Nothing on the stream needs the request's database connection
+    await db.close()
+    return StreamingResponse(
+        stream_events(current_user.id, project_ids, last_event_id),
+        media_type=EVENT_STREAM_MEDIA_TYPE,
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
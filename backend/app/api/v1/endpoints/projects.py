@@ -1,37 +1,95 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.exc import StaleDataError
+from typing import List, Optional
 
-from ....core.database import get_db
+from ....api.etags import (
+    ETAG_HEADER,
+    bump_data_version,
+    check_if_match,
+    etag_matches,
+    get_data_version,
+    list_etag,
+    not_modified,
+    row_etag,
+    stale_write,
+)
+from ....api.events import event_broker
+from ....api.fieldsets import FIELDS_DESCRIPTION, fieldset_options, parse_fields, sparse_list_adapter
+from ....api.pagination import paginate, page_results
+from ....api.query_cache import list_cache_key, page_response, query_cache, store_page
+from ....api.scoping import get_project, get_project_version, scoped_projects
+from ....api.stats import project_stats
+from ....api.transfer import NDJSON_MEDIA_TYPE, import_project_lines, stream_project_export
+from ....core.database import get_async_db
 from ....core.security import get_current_user
 from ....models.project import Project as ProjectModel
-from ....schemas.project import Project, ProjectCreate, ProjectUpdate
+from ....schemas.project import Project, ProjectCreate, ProjectStats, ProjectUpdate
+from ....schemas.transfer import ProjectImportResult
 from ....schemas.user import UserInDB
 
 router = APIRouter()
 
-def get_project(db: Session, project_id: int, user_id: int):
-    return db.query(ProjectModel).filter(
-        ProjectModel.id == project_id,
-        ProjectModel.owner_id == user_id
-    ).first()
+PROJECT_LIST = TypeAdapter(List[Project])
+
+# Columns clients may order project listings by (always tie-broken on id)
+PROJECT_SORT_COLUMNS = {
+    "created_at": ProjectModel.created_at,
+    "name": ProjectModel.name,
+    "id": ProjectModel.id,
+}
 
 @router.get("/", response_model=List[Project])
-def read_projects(
+async def read_projects(
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = None,
+    order_by: str = "created_at",
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    db: AsyncSession = Depends(get_async_db),
     current_user: UserInDB = Depends(get_current_user)
 ):
-    projects = db.query(ProjectModel).filter(
-        ProjectModel.owner_id == current_user.id
-    ).offset(skip).limit(limit).all()
-    return projects
+    fieldset = parse_fields(fields, Project)
+    # Answer unchanged polls before touching the projects table
+    data_version = await get_data_version(db, current_user.id)
+    etag = list_etag(request, data_version)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return not_modified(etag)
+    
+    key = list_cache_key(
+        "projects", current_user.id, data_version,
+        skip=skip, limit=limit, cursor=cursor, order_by=order_by,
+        fields=fieldset and ",".join(fieldset),
+    )
+    page = query_cache.get(key)
+    if page is None:
+        query = scoped_projects(current_user.id)
+        if fieldset:
+            query = query.options(*fieldset_options(ProjectModel, fieldset, {}))
+        query = paginate(
+            query,
+            sort_columns=PROJECT_SORT_COLUMNS,
+            id_column=ProjectModel.id,
+            order_by=order_by,
+            cursor=cursor,
+            skip=skip,
+            limit=limit,
+        )
+        result = await db.execute(query)
+        projects = page_results(result.all(), order_by=order_by, limit=limit, response=response)
+        adapter = sparse_list_adapter(Project, fieldset) if fieldset else PROJECT_LIST
+        page = store_page(key, adapter.dump_json(adapter.validate_python(projects)), response)
+    return page_response(page, etag)
 
 @router.post("/", response_model=Project, status_code=status.HTTP_201_CREATED)
-def create_project(
+async def create_project(
     project: ProjectCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: UserInDB = Depends(get_current_user)
 ):
     db_project = ProjectModel(
@@ -39,50 +97,132 @@ def create_project(
         owner_id=current_user.id
     )
     db.add(db_project)
-    db.commit()
-    db.refresh(db_project)
+    await bump_data_version(db, current_user.id)
+    await db.commit()
+    event_broker.notify()
+    await db.refresh(db_project)
     return db_project
 
+@router.post("/import", response_model=ProjectImportResult, status_code=status.HTTP_201_CREATED)
+async def import_project(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserInDB = Depends(get_current_user)
+):
+    # The NDJSON body is consumed as it arrives rather than parsed up front
+    return await import_project_lines(db, current_user.id, request.stream())
+
+@router.get("/stats", response_model=List[ProjectStats])
+async def read_all_project_stats(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserInDB = Depends(get_current_user)
+):
+    """Task counts for every project of the current user, oldest project first."""
+    project_ids = await db.scalars(
+        select(ProjectModel.id)
+        .where(ProjectModel.owner_id == current_user.id)
+        .order_by(ProjectModel.created_at, ProjectModel.id)
+    )
+    stats = await project_stats(db, project_ids.all())
+    return list(stats.values())
+
 @router.get("/{project_id}", response_model=Project)
-def read_project(
+async def read_project(
     project_id: int,
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
     current_user: UserInDB = Depends(get_current_user)
 ):
-    db_project = get_project(db, project_id, current_user.id)
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        version = await get_project_version(db, project_id, current_user.id)
+        if version is None:
+            raise HTTPException(status_code=404, detail="Project not found")
+        if etag_matches(if_none_match, row_etag(version)):
+            return not_modified(row_etag(version))
+    
+    db_project = await get_project(db, project_id, current_user.id)
     if db_project is None:
         raise HTTPException(status_code=404, detail="Project not found")
+    response.headers[ETAG_HEADER] = row_etag(db_project.version)
     return db_project
 
 @router.put("/{project_id}", response_model=Project)
-def update_project(
+async def update_project(
     project_id: int,
     project: ProjectUpdate,
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
     current_user: UserInDB = Depends(get_current_user)
 ):
-    db_project = get_project(db, project_id, current_user.id)
+    db_project = await get_project(db, project_id, current_user.id)
     if db_project is None:
         raise HTTPException(status_code=404, detail="Project not found")
+    check_if_match(request, row_etag(db_project.version))
     
     update_data = project.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(db_project, field, value)
     
-    db.commit()
-    db.refresh(db_project)
+    # The UPDATE is conditional on the version loaded above
+    await bump_data_version(db, current_user.id)
+    try:
+        await db.commit()
+    except StaleDataError:
+        await db.rollback()
+        raise stale_write(request)
+    event_broker.notify()
+    await db.refresh(db_project)
+    response.headers[ETAG_HEADER] = row_etag(db_project.version)
     return db_project
 
 @router.delete("/{project_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_project(
+async def delete_project(
     project_id: int,
-    db: Session = Depends(get_db),
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
     current_user: UserInDB = Depends(get_current_user)
 ):
-    db_project = get_project(db, project_id, current_user.id)
+    db_project = await get_project(db, project_id, current_user.id)
     if db_project is None:
         raise HTTPException(status_code=404, detail="Project not found")
     
-    db.delete(db_project)
-    db.commit()
+    await db.delete(db_project)
+    await bump_data_version(db, current_user.id)
+    try:
+        await db.commit()
+    except StaleDataError:
+        await db.rollback()
+        raise stale_write(request)
+    event_broker.notify()
     return {"ok": True}
+
+@router.get("/{project_id}/stats", response_model=ProjectStats)
+async def read_project_stats(
+    project_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserInDB = Depends(get_current_user)
+):
+    """Task counts by status and priority, and how many are overdue."""
+    if await get_project_version(db, project_id, current_user.id) is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+    stats = await project_stats(db, [project_id])
+    return stats[project_id]
+
+@router.get("/{project_id}/export")
+async def export_project(
+    project_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserInDB = Depends(get_current_user)
+):
+    db_project = await get_project(db, project_id, current_user.id)
+    if db_project is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+    
+    return StreamingResponse(
+        stream_project_export(db_project),
+        media_type=NDJSON_MEDIA_TYPE,
+        headers={"Content-Disposition": f'attachment; filename="project-{project_id}.ndjson"'},
+    )
@@ -0,0 +1,28 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ....api.sync import collect_changes
+from ....core.config import settings
+from ....core.database import get_async_db
+from ....core.security import get_current_user
+from ....schemas.sync import SyncResult
+from ....schemas.user import UserInDB
+
+router = APIRouter()
+
+@router.get("", response_model=SyncResult)
+async def read_changes(
+    since: int = Query(0, ge=0),
+    limit: int = Query(settings.SYNC_MAX_CHANGES, ge=1, le=settings.SYNC_MAX_CHANGES),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserInDB = Depends(get_current_user)
+):
+    """
+    Projects, tasks and comments created, changed or deleted after `since`.
+
+    Start with since=0 (or the version of a full fetch) and pass back the
+    returned version each time. 410 means the change log no longer reaches
+    back that far: the client must re-fetch everything, then continue from the
+    version in the X-Sync-Version header.
+    """
+    return await collect_changes(db, current_user.id, since, limit)
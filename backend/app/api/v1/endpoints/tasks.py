@@ -1,69 +1,151 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from collections import defaultdict
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, Query
+from pydantic import TypeAdapter
+from sqlalchemy import bindparam, delete, insert, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, selectinload
+from sqlalchemy.orm.exc import StaleDataError
 from typing import List, Optional
-from datetime import datetime
 
-from ....core.database import get_db
+from ....api.etags import (
+    ETAG_HEADER,
+    bump_data_version,
+    check_if_match,
+    etag_matches,
+    get_data_version,
+    list_etag,
+    not_modified,
+    row_etag,
+    stale_write,
+)
+from ....api.events import event_broker
+from ....api.fieldsets import FIELDS_DESCRIPTION, fieldset_options, parse_fields, sparse_list_adapter
+from ....api.mentions import MENTION_JOB, parse_mentions
+from ....api.pagination import paginate, page_results
+from ....api.query_cache import list_cache_key, page_response, query_cache, store_page
+from ....api.reminders import reminder_scheduler
+from ....api.scoping import (
+    existing_user_ids,
+    get_project,
+    get_task,
+    get_task_version,
+    owned_project_ids,
+    scoped_tasks,
+    task_comments,
+    visible_task_ids,
+)
+from ....api.search import fts_query, highlight, search_tasks_statement
+from ....core.config import settings
+from ....core.database import get_async_db
+from ....core.jobs import enqueue, job_pool
 from ....core.security import get_current_user
-from ....models.task import Task as TaskModel
-from ....models.project import Project as ProjectModel
+from ....models.task import Task as TaskModel, TaskStatus
 from ....models.comment import Comment as CommentModel
-from ....schemas.task import Task, TaskCreate, TaskUpdate
+from ....models.user import User as UserModel
+from ....schemas.task import (
+    Task,
+    TaskBatchCreate,
+    TaskBatchDelete,
+    TaskBatchItemResult,
+    TaskBatchResult,
+    TaskBatchUpdate,
+    TaskCreate,
+    TaskSearchResult,
+    TaskUpdate,
+)
 from ....schemas.comment import Comment, CommentCreate
 from ....schemas.user import UserInDB
 
 router = APIRouter()
 
-def get_task(db: Session, task_id: int, user_id: int):
-    return db.query(TaskModel).join(
-        ProjectModel,
-        ProjectModel.owner_id == user_id
-    ).filter(
-        TaskModel.id == task_id
-    ).first()
+TASK_LIST = TypeAdapter(List[Task])
+
+# Columns clients may order task listings by (always tie-broken on id)
+TASK_SORT_COLUMNS = {
+    "created_at": TaskModel.created_at,
+    "title": TaskModel.title,
+    "id": TaskModel.id,
+}
+
+# Relationship loaders for task listings, per response field. Tasks on a page
+# share few assignees, so selectin fetches each of them once.
+TASK_FIELD_LOADERS = {"assignee": selectinload(TaskModel.assignee)}
+# A comment thread is short and every comment has an author: one statement
+COMMENT_FIELD_LOADERS = {"author": joinedload(CommentModel.user, innerjoin=True)}
 
 @router.get("/", response_model=List[Task])
-def read_tasks(
+async def read_tasks(
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
-    status: Optional[str] = None,
+    cursor: Optional[str] = None,
+    order_by: str = "created_at",
+    status: Optional[TaskStatus] = None,
     project_id: Optional[int] = None,
     assignee_id: Optional[int] = None,
-    db: Session = Depends(get_db),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    db: AsyncSession = Depends(get_async_db),
     current_user: UserInDB = Depends(get_current_user)
 ):
-    query = db.query(TaskModel).join(
-        ProjectModel,
-        ProjectModel.owner_id == current_user.id
-    )
-    
-    if status:
-        query = query.filter(TaskModel.status == status)
-    if project_id is not None:
-        query = query.filter(TaskModel.project_id == project_id)
-    if assignee_id is not None:
-        query = query.filter(TaskModel.assignee_id == assignee_id)
+    fieldset = parse_fields(fields, Task)
+    # Answer unchanged polls before touching the tasks table
+    data_version = await get_data_version(db, current_user.id)
+    etag = list_etag(request, data_version)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return not_modified(etag)
     
-    return query.offset(skip).limit(limit).all()
+    key = list_cache_key(
+        "tasks", current_user.id, data_version,
+        skip=skip, limit=limit, cursor=cursor, order_by=order_by,
+        status=status, project_id=project_id, assignee_id=assignee_id,
+        fields=fieldset and ",".join(fieldset),
+    )
+    page = query_cache.get(key)
+    if page is None:
+        query = scoped_tasks(current_user.id)
+        if fieldset:
+            query = query.options(*fieldset_options(TaskModel, fieldset, TASK_FIELD_LOADERS))
+        else:
+            query = query.options(*TASK_FIELD_LOADERS.values())
+        
+        if status:
+            query = query.filter(TaskModel.status == status)
+        if project_id is not None:
+            query = query.filter(TaskModel.project_id == project_id)
+        if assignee_id is not None:
+            query = query.filter(TaskModel.assignee_id == assignee_id)
+        
+        query = paginate(
+            query,
+            sort_columns=TASK_SORT_COLUMNS,
+            id_column=TaskModel.id,
+            order_by=order_by,
+            cursor=cursor,
+            skip=skip,
+            limit=limit,
+        )
+        result = await db.execute(query)
+        tasks = page_results(result.all(), order_by=order_by, limit=limit, response=response)
+        adapter = sparse_list_adapter(Task, fieldset) if fieldset else TASK_LIST
+        page = store_page(key, adapter.dump_json(adapter.validate_python(tasks)), response)
+    return page_response(page, etag)
 
 @router.post("/", response_model=Task, status_code=status.HTTP_201_CREATED)
-def create_task(
+async def create_task(
     task: TaskCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: UserInDB = Depends(get_current_user)
 ):
     # Verify project exists and is owned by user
-    project = db.query(ProjectModel).filter(
-        ProjectModel.id == task.project_id,
-        ProjectModel.owner_id == current_user.id
-    ).first()
+    project = await get_project(db, task.project_id, current_user.id)
     
     if not project:
         raise HTTPException(status_code=404, detail="Project not found or access denied")
     
     # Verify assignee exists if provided
     if task.assignee_id:
-        assignee = db.query(UserModel).filter(UserModel.id == task.assignee_id).first()
+        assignee = await db.get(UserModel, task.assignee_id)
         if not assignee:
             raise HTTPException(status_code=400, detail="Assignee not found")
     
@@ -72,78 +154,284 @@ def create_task(
         created_by=current_user.id
     )
     db.add(db_task)
-    db.commit()
-    db.refresh(db_task)
+    await bump_data_version(db, current_user.id)
+    await db.commit()
+    event_broker.notify()
+    if db_task.due_date is not None:
+        reminder_scheduler.touch(db_task.id)
+    await db.refresh(db_task)
+    await db.refresh(db_task, ["assignee"])
     return db_task
 
+@router.get("/search", response_model=List[TaskSearchResult])
+async def search_tasks(
+    q: str = Query(..., min_length=1, max_length=200),
+    project_id: Optional[int] = None,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserInDB = Depends(get_current_user)
+):
+    """Best matches first across titles, descriptions and comments."""
+    match = fts_query(q)
+    if match is None:
+        return []
+    query = search_tasks_statement(current_user.id, match)
+    if project_id is not None:
+        query = query.where(TaskModel.project_id == project_id)
+    result = await db.execute(query.offset(skip).limit(limit))
+    return [
+        {"task": task, "snippet": highlight(snippet)}
+        for task, snippet in result.all()
+    ]
+
+# Batch endpoints. Ownership and assignees are checked for the whole batch
+# with one query each, the valid items are written with a single executemany
+# in one transaction, and invalid items are reported back per index. These
+# routes are registered before /{task_id} so "batch" is not read as an id.
+
+def _check_batch_size(count: int):
+    if count > settings.TASK_BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Batch exceeds {settings.TASK_BATCH_MAX_ITEMS} items",
+        )
+
+def _batch_result(results: List[TaskBatchItemResult]) -> TaskBatchResult:
+    failed = sum(1 for result in results if result.status_code >= 400)
+    return TaskBatchResult(
+        succeeded=len(results) - failed, failed=failed, results=results
+    )
+
+@router.post("/batch", response_model=TaskBatchResult)
+async def create_tasks_batch(
+    batch: TaskBatchCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserInDB = Depends(get_current_user)
+):
+    _check_batch_size(len(batch.items))
+    projects = await owned_project_ids(
+        db, (item.project_id for item in batch.items), current_user.id
+    )
+    assignees = await existing_user_ids(db, (item.assignee_id for item in batch.items))
+    
+    results: List[Optional[TaskBatchItemResult]] = [None] * len(batch.items)
+    rows, indexes = [], []
+    for index, item in enumerate(batch.items):
+        if item.project_id not in projects:
+            results[index] = TaskBatchItemResult(
+                index=index, status_code=404, detail="Project not found or access denied"
+            )
+        elif item.assignee_id and item.assignee_id not in assignees:
+            results[index] = TaskBatchItemResult(
+                index=index, status_code=400, detail="Assignee not found"
+            )
+        else:
+            rows.append({**item.model_dump(), "owner_id": current_user.id})
+            indexes.append(index)
+    
+    if rows:
+        # Core insert on the table: the ORM bulk path splices RETURNING rows
+        # back together once per row, which turns quadratic on large batches
+        tasks = TaskModel.__table__
+        task_ids = await db.scalars(
+            insert(tasks).returning(tasks.c.id, sort_by_parameter_order=True),
+            rows,
+        )
+        created = []
+        for index, task_id in zip(indexes, task_ids):
+            results[index] = TaskBatchItemResult(index=index, id=task_id, status_code=201)
+            if batch.items[index].due_date is not None:
+                created.append(task_id)
+        await bump_data_version(db, current_user.id)
+        await db.commit()
+        event_broker.notify()
+        reminder_scheduler.touch(*created)
+    return _batch_result(results)
+
+@router.put("/batch", response_model=TaskBatchResult)
+async def update_tasks_batch(
+    batch: TaskBatchUpdate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserInDB = Depends(get_current_user)
+):
+    _check_batch_size(len(batch.items))
+    tasks = await visible_task_ids(db, (item.id for item in batch.items), current_user.id)
+    assignees = await existing_user_ids(db, (item.assignee_id for item in batch.items))
+    
+    results = []
+    rows = []
+    for index, item in enumerate(batch.items):
+        update_data = item.model_dump(exclude_unset=True)
+        if item.id not in tasks:
+            results.append(TaskBatchItemResult(
+                index=index, id=item.id, status_code=404, detail="Task not found"
+            ))
+        elif item.null_fields():
+            results.append(TaskBatchItemResult(
+                index=index, id=item.id, status_code=400,
+                detail=f"{', '.join(item.null_fields())} cannot be null",
+            ))
+        elif update_data.get("assignee_id") is not None and item.assignee_id not in assignees:
+            results.append(TaskBatchItemResult(
+                index=index, id=item.id, status_code=400, detail="Assignee not found"
+            ))
+        else:
+            rows.append(update_data)
+            results.append(TaskBatchItemResult(index=index, id=item.id, status_code=200))
+    
+    # Items that only carry an id have nothing to write. The rest are grouped
+    # by the set of fields they set, one executemany per group, and bump the
+    # row version like an ORM update would.
+    groups = defaultdict(list)
+    rescheduled = []
+    for row in rows:
+        task_id = row.pop("id")
+        if row.get("due_date") is not None:
+            rescheduled.append(task_id)
+        if row:
+            params = {f"new_{field}": value for field, value in row.items()}
+            groups[tuple(sorted(row))].append({"task_id": task_id, **params})
+    if groups:
+        tasks = TaskModel.__table__
+        for fields, params in groups.items():
+            values = {field: bindparam(f"new_{field}") for field in fields}
+            values["version"] = tasks.c.version + 1
+            await db.execute(
+                update(tasks).where(tasks.c.id == bindparam("task_id")).values(values),
+                params,
+            )
+        await bump_data_version(db, current_user.id)
+        await db.commit()
+        event_broker.notify()
+        reminder_scheduler.touch(*rescheduled)
+    return _batch_result(results)
+
+@router.delete("/batch", response_model=TaskBatchResult)
+async def delete_tasks_batch(
+    batch: TaskBatchDelete,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserInDB = Depends(get_current_user)
+):
+    _check_batch_size(len(batch.ids))
+    tasks = await visible_task_ids(db, batch.ids, current_user.id)
+    
+    results = [
+        TaskBatchItemResult(index=index, id=task_id, status_code=204)
+        if task_id in tasks
+        else TaskBatchItemResult(index=index, id=task_id, status_code=404, detail="Task not found")
+        for index, task_id in enumerate(batch.ids)
+    ]
+    if tasks:
+        # Bulk deletes skip the ORM cascade, so remove comments explicitly
+        await db.execute(delete(CommentModel).where(CommentModel.task_id.in_(tasks)))
+        await db.execute(delete(TaskModel).where(TaskModel.id.in_(tasks)))
+        await bump_data_version(db, current_user.id)
+        await db.commit()
+        event_broker.notify()
+    return _batch_result(results)
+
 @router.get("/{task_id}", response_model=Task)
-def read_task(
+async def read_task(
     task_id: int,
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
     current_user: UserInDB = Depends(get_current_user)
 ):
-    task = get_task(db, task_id, current_user.id)
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        version = await get_task_version(db, task_id, current_user.id)
+        if version is None:
+            raise HTTPException(status_code=404, detail="Task not found")
+        if etag_matches(if_none_match, row_etag(version)):
+            return not_modified(row_etag(version))
+    
+    task = await get_task(db, task_id, current_user.id, joinedload(TaskModel.assignee))
     if task is None:
         raise HTTPException(status_code=404, detail="Task not found")
+    response.headers[ETAG_HEADER] = row_etag(task.version)
     return task
 
 @router.put("/{task_id}", response_model=Task)
-def update_task(
+async def update_task(
     task_id: int,
     task: TaskUpdate,
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
     current_user: UserInDB = Depends(get_current_user)
 ):
-    db_task = get_task(db, task_id, current_user.id)
+    db_task = await get_task(db, task_id, current_user.id)
     if db_task is None:
         raise HTTPException(status_code=404, detail="Task not found")
+    check_if_match(request, row_etag(db_task.version))
+    if task.null_fields():
+        raise HTTPException(
+            status_code=400, detail=f"{', '.join(task.null_fields())} cannot be null"
+        )
     
     update_data = task.model_dump(exclude_unset=True)
     
     # Verify project exists and is owned by user if project_id is being updated
     if 'project_id' in update_data:
-        project = db.query(ProjectModel).filter(
-            ProjectModel.id == update_data['project_id'],
-            ProjectModel.owner_id == current_user.id
-        ).first()
+        project = await get_project(db, update_data['project_id'], current_user.id)
         if not project:
             raise HTTPException(status_code=404, detail="Project not found or access denied")
     
     # Verify assignee exists if assignee_id is being updated
     if 'assignee_id' in update_data and update_data['assignee_id'] is not None:
-        assignee = db.query(UserModel).filter(UserModel.id == update_data['assignee_id']).first()
+        assignee = await db.get(UserModel, update_data['assignee_id'])
         if not assignee:
             raise HTTPException(status_code=400, detail="Assignee not found")
     
     for field, value in update_data.items():
         setattr(db_task, field, value)
     
-    db.commit()
-    db.refresh(db_task)
+    # The UPDATE is conditional on the version loaded above
+    await bump_data_version(db, current_user.id)
+    try:
+        await db.commit()
+    except StaleDataError:
+        await db.rollback()
+        raise stale_write(request)
+    event_broker.notify()
+    if update_data.get("due_date") is not None:
+        reminder_scheduler.touch(task_id)
+    await db.refresh(db_task)
+    await db.refresh(db_task, ["assignee"])
+    response.headers[ETAG_HEADER] = row_etag(db_task.version)
     return db_task
 
 @router.delete("/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_task(
+async def delete_task(
     task_id: int,
-    db: Session = Depends(get_db),
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
     current_user: UserInDB = Depends(get_current_user)
 ):
-    db_task = get_task(db, task_id, current_user.id)
+    db_task = await get_task(db, task_id, current_user.id)
     if db_task is None:
         raise HTTPException(status_code=404, detail="Task not found")
     
-    db.delete(db_task)
-    db.commit()
+    await db.delete(db_task)
+    await bump_data_version(db, current_user.id)
+    try:
+        await db.commit()
+    except StaleDataError:
+        await db.rollback()
+        raise stale_write(request)
+    event_broker.notify()
     return {"ok": True}
 
 @router.post("/{task_id}/comments", response_model=Comment, status_code=status.HTTP_201_CREATED)
-def create_comment(
+async def create_comment(
     task_id: int,
     comment: CommentCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: UserInDB = Depends(get_current_user)
 ):
-    task = get_task(db, task_id, current_user.id)
+    task = await get_task(db, task_id, current_user.id)
     if task is None:
         raise HTTPException(status_code=404, detail="Task not found")
     
@@ -153,20 +441,40 @@ def create_comment(
         user_id=current_user.id
     )
     db.add(db_comment)
-    db.commit()
-    db.refresh(db_comment)
+    # Notifying mentioned users is left to a background job, queued in the
+    # same transaction so it exists exactly when the comment does
+    mentions = parse_mentions(comment.content)
+    if mentions:
+        await db.flush()
+        enqueue(db, MENTION_JOB, {"comment_id": db_comment.id})
+    await db.commit()
+    event_broker.notify()
+    if mentions:
+        job_pool.notify()
+    await db.refresh(db_comment)
+    await db.refresh(db_comment, ["user"])
     return db_comment
 
 @router.get("/{task_id}/comments", response_model=List[Comment])
-def read_task_comments(
+async def read_task_comments(
     task_id: int,
-    db: Session = Depends(get_db),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    db: AsyncSession = Depends(get_async_db),
     current_user: UserInDB = Depends(get_current_user)
 ):
-    task = get_task(db, task_id, current_user.id)
-    if task is None:
+    fieldset = parse_fields(fields, Comment)
+    if await get_task_version(db, task_id, current_user.id) is None:
         raise HTTPException(status_code=404, detail="Task not found")
     
-    return db.query(CommentModel).filter(
-        CommentModel.task_id == task_id
-    ).all()
+    query = task_comments(task_id)
+    if fieldset is None:
+        result = await db.execute(query.options(*COMMENT_FIELD_LOADERS.values()))
+        return result.scalars().all()
+    
+    query = query.options(*fieldset_options(CommentModel, fieldset, COMMENT_FIELD_LOADERS))
+    result = await db.execute(query)
+    adapter = sparse_list_adapter(Comment, fieldset)
+    return Response(
+        content=adapter.dump_json(adapter.validate_python(result.scalars().all())),
+        media_type="application/json",
+    )
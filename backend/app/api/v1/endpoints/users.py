@@ -1,9 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
 
-from ....core.database import get_db
+from ....core.database import get_async_db
+from ....core.hashing import hash_password
 from ....core.security import get_current_user
+from ....models.notification import Notification as NotificationModel
 from ....models.user import User as UserModel
+from ....schemas.notification import Notification
 from ....schemas.user import User, UserUpdate, UserInDB
 
 router = APIRouter()
@@ -15,17 +20,18 @@ async def read_users_me(current_user: UserInDB = Depends(get_current_user)):
 @router.put("/me", response_model=User)
 async def update_user_me(
     user_update: UserUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: UserInDB = Depends(get_current_user)
 ):
-    db_user = db.query(UserModel).filter(UserModel.id == current_user.id).first()
+    result = await db.execute(select(UserModel).filter(UserModel.id == current_user.id))
+    db_user = result.scalars().first()
     if not db_user:
         raise HTTPException(status_code=404, detail="User not found")
     
-    update_data = user_update.dict(exclude_unset=True)
+    update_data = user_update.model_dump(exclude_unset=True)
     
     if "password" in update_data and update_data["password"]:
-        hashed_password = get_password_hash(update_data["password"])
+        hashed_password = await hash_password(update_data["password"])
         update_data["hashed_password"] = hashed_password
         del update_data["password"]
     
@@ -33,6 +39,20 @@ async def update_user_me(
         setattr(db_user, field, value)
     
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
     return db_user
+
+@router.get("/me/notifications", response_model=List[Notification])
+async def read_my_notifications(
+    before: Optional[int] = Query(None, description="Only notifications with a lower id (the last id of the previous page)"),
+    limit: int = Query(50, ge=1, le=200),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserInDB = Depends(get_current_user)
+):
+    """Notifications for the current user, newest first."""
+    query = select(NotificationModel).where(NotificationModel.user_id == current_user.id)
+    if before is not None:
+        query = query.where(NotificationModel.id < before)
+    result = await db.scalars(query.order_by(NotificationModel.id.desc()).limit(limit))
+    return result.all()
@@ -9,10 +9,107 @@ class Settings(BaseSettings):
     SECRET_KEY: str = secrets.token_urlsafe(32)
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 8  # 8 days
     ALGORITHM: str = "HS256"
+    # Authenticated-user snapshots served without a per-request DB lookup
+    PRINCIPAL_CACHE_MAX_SIZE: int = 10_000
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 60
+    
+    # Password hashing
+    BCRYPT_ROUNDS: int = 12
+    # Worker processes for bcrypt (defaults to the number of CPU cores)
+    PASSWORD_HASH_WORKERS: Optional[int] = None
+    # Hash/verify calls allowed to wait for a worker before returning 503
+    PASSWORD_HASH_MAX_PENDING: int = 64
     
     # Database
     DATABASE_URL: str = "sqlite:///./sql_app.db"
+    # Async driver URL used by the API endpoints (e.g. postgresql+asyncpg://...).
+    # Derived from DATABASE_URL when unset.
+    ASYNC_DATABASE_URL: Optional[str] = None
+    # Connection pool (server databases and SQLite files alike)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = False
+    # SQLite connection pragmas
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_CACHE_SIZE_KIB: int = 64 * 1024
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024
+    SQLITE_TEMP_STORE: str = "MEMORY"
+    # Refuse to start on a database that is not at the newest migration
+    # (see app/core/schema.py); tables are never created at start-up
+    SCHEMA_CHECK: bool = True
+    # Per-route latency, SQL and response size metrics, served in the
+    # Prometheus text format at /metrics
+    METRICS_ENABLED: bool = True
+    # Slow-query log (off by default): statements slower than the threshold
+    # are logged with their parameters, the route that ran them and, for a
+    # SLOW_QUERY_EXPLAIN_SAMPLE share of them up to SLOW_QUERY_EXPLAINS_PER_MINUTE,
+    # their query plan. Every statement's time also goes into per-statement
+    # totals (at most SLOW_QUERY_MAX_STATEMENTS distinct ones) served to
+    # superusers at /admin/slow-queries.
+    SLOW_QUERY_LOG: bool = False
+    SLOW_QUERY_THRESHOLD_MS: float = 100.0
+    SLOW_QUERY_EXPLAIN_SAMPLE: float = 1.0
+    SLOW_QUERY_EXPLAINS_PER_MINUTE: int = 10
+    SLOW_QUERY_MAX_STATEMENTS: int = 1000
+
+    # Report the number of SQL statements each request ran in an
+    # X-Query-Count response header (development and the query-count check)
+    QUERY_COUNT_HEADER: bool = False
+    
+    # Cached project/task list pages. QUERY_CACHE_BACKEND is "memory" (per
+    # process) or "sqlite" (a file shared by the workers on one host);
+    # QUERY_CACHE_MAX_ENTRIES=0 disables the cache.
+    QUERY_CACHE_BACKEND: str = "memory"
+    QUERY_CACHE_PATH: str = "./query_cache.db"
+    QUERY_CACHE_MAX_ENTRIES: int = 2048
+    QUERY_CACHE_MAX_ENTRY_BYTES: int = 256 * 1024
+    QUERY_CACHE_TTL_SECONDS: int = 300
     
+    # Largest number of items accepted by the /tasks/batch endpoints
+    TASK_BATCH_MAX_ITEMS: int = 10_000
+
+    # Project NDJSON export/import
+    PROJECT_EXPORT_YIELD_PER: int = 1000
+    PROJECT_IMPORT_CHUNK_SIZE: int = 5000
+    PROJECT_IMPORT_MAX_LINE_BYTES: int = 1024 * 1024
+
+    # Delta sync: changes returned per /sync call, and how long change log
+    # entries are kept before clients that far behind must re-fetch everything
+    SYNC_MAX_CHANGES: int = 1000
+    CHANGE_LOG_RETENTION_DAYS: int = 30
+
+    # /events streams: changes buffered per client before it is told to
+    # resync, idle seconds between keepalives, and how often the change log
+    # is checked for writes made by other worker processes
+    EVENTS_QUEUE_SIZE: int = 256
+    EVENTS_KEEPALIVE_SECONDS: float = 15.0
+    EVENTS_POLL_SECONDS: float = 1.0
+
+    # Background jobs (mention notifications). JOB_WORKERS=0 leaves running
+    # them to another process. Failed jobs are retried after
+    # JOB_RETRY_BASE_SECONDS, doubling up to JOB_RETRY_MAX_SECONDS, until
+    # JOB_MAX_ATTEMPTS; a job still running after JOB_LEASE_SECONDS is
+    # assumed lost with its worker and run again.
+    JOB_WORKERS: int = 2
+    JOB_POLL_SECONDS: float = 1.0
+    JOB_MAX_ATTEMPTS: int = 5
+    JOB_RETRY_BASE_SECONDS: float = 2.0
+    JOB_RETRY_MAX_SECONDS: float = 300.0
+    JOB_LEASE_SECONDS: int = 300
+
+    # Due-date reminders (see app/api/reminders.py): due dates loaded into
+    # the scheduler's heap at a time, the longest it sleeps (bounds how late
+    # it notices due dates written by other processes), and how late a
+    # reminder may be sent before it counts as overdue
+    REMINDERS_ENABLED: bool = True
+    REMINDER_BATCH: int = 500
+    REMINDER_MAX_SLEEP_SECONDS: float = 60.0
+    REMINDER_GRACE_SECONDS: float = 60.0
+
     # CORS
     BACKEND_CORS_ORIGINS: List[str] = ["*"]
     
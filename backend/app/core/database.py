@@ -1,23 +1,400 @@
-from sqlalchemy import create_engine
+import logging
+import random
+import re
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 
 from .config import settings
 
-# Use SQLite for development
-SQLALCHEMY_DATABASE_URL = "sqlite:///./sql_app.db"
-# SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL  # Uncomment for production
+logger = logging.getLogger(__name__)
+
+# Async drivers substituted when ASYNC_DATABASE_URL is not configured
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "mysql": "mysql+aiomysql",
+}
+
+
+class PoolWaitStats:
+    """Time callers spend waiting for a pooled connection."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.total_wait += seconds
+            self.max_wait = max(self.max_wait, seconds)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "checkouts": self.checkouts,
+            "total_wait_seconds": self.total_wait,
+            "max_wait_seconds": self.max_wait,
+            "avg_wait_seconds": self.total_wait / self.checkouts if self.checkouts else 0.0,
+        }
+
+
+pool_wait_stats = PoolWaitStats()
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
+
+class StatementCounter:
+    """SQL statements executed inside one count_statements() block, with the
+    seconds spent running them and waiting for a pooled connection."""
+
+    __slots__ = ("count", "seconds", "pool_wait")
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.pool_wait = 0.0
+
+
+_statement_counter: ContextVar[Optional[StatementCounter]] = ContextVar(
+    "statement_counter", default=None
 )
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
-Base = declarative_base()
 
-def get_db():
-    db = SessionLocal()
+@contextmanager
+def count_statements() -> Iterator[StatementCounter]:
+    """Count the statements this context (e.g. one request) sends to the database."""
+    counter = StatementCounter()
+    token = _statement_counter.set(counter)
     try:
-        yield db
+        yield counter
     finally:
-        db.close()
+        _statement_counter.reset(token)
+        # Nested blocks (the X-Query-Count header inside request metrics)
+        # count towards the enclosing one too
+        outer = _statement_counter.get()
+        if outer is not None:
+            outer.count += counter.count
+            outer.seconds += counter.seconds
+            outer.pool_wait += counter.pool_wait
+
+
+def _count_statement(conn, cursor, statement, parameters, context, executemany) -> None:
+    counter = _statement_counter.get()
+    if counter is not None:
+        counter.count += 1
+        if context is not None:
+            context._counted_start = time.perf_counter()
+
+
+def _time_statement(conn, cursor, statement, parameters, context, executemany) -> None:
+    start = getattr(context, "_counted_start", None)
+    if start is not None:
+        counter = _statement_counter.get()
+        if counter is not None:
+            counter.seconds += time.perf_counter() - start
+
+
+# What is running the statements in this context, e.g. "GET /api/v1/tasks/";
+# set per request and only called when a slow statement is logged
+statement_origin: ContextVar[Optional[Callable[[], str]]] = ContextVar(
+    "statement_origin", default=None
+)
+
+# Expanded IN lists, so "IN (?, ?)" and "IN (?, ?, ?)" count as one statement
+_PARAMETER_LIST = re.compile(r"\(\?(?:, \?)+\)")
+
+_EXPLAINABLE = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE")
+
+
+class StatementStats:
+    __slots__ = ("calls", "total_seconds", "max_seconds", "slow_calls", "last_origin", "last_plan")
+
+    def __init__(self):
+        self.calls = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.slow_calls = 0
+        self.last_origin: Optional[str] = None
+        self.last_plan: Optional[List[str]] = None
+
+
+class SlowQueryLog:
+    """
+    Times every statement, keeps totals per statement text and logs the
+    ones slower than the threshold, sometimes with their query plan.
+    """
+
+    def __init__(self, threshold_seconds: float, explain_sample: float,
+                 explains_per_minute: int, max_statements: int):
+        self.threshold_seconds = threshold_seconds
+        self.explain_sample = explain_sample
+        self.explains_per_minute = explains_per_minute
+        self.max_statements = max_statements
+        self._lock = threading.Lock()
+        self._statements: Dict[str, StatementStats] = {}
+        self._explain_window = 0.0
+        self._explains = 0
+
+    def install(self, db_engine: Engine) -> None:
+        event.listen(db_engine, "before_cursor_execute", self._before)
+        event.listen(db_engine, "after_cursor_execute", self._after)
+
+    def _before(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        if context is not None:
+            context._profiled_start = time.perf_counter()
+
+    def _after(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        start = getattr(context, "_profiled_start", None)
+        if start is None:
+            return
+        seconds = time.perf_counter() - start
+        key = _PARAMETER_LIST.sub("(?, ...)", statement)
+        slow = seconds >= self.threshold_seconds
+        origin = None
+        if slow:
+            describe = statement_origin.get()
+            origin = describe() if describe is not None else "background"
+        with self._lock:
+            stats = self._statements.get(key)
+            if stats is None:
+                if len(self._statements) >= self.max_statements:
+                    # Make room by forgetting the statement with the least time
+                    del self._statements[min(
+                        self._statements, key=lambda k: self._statements[k].total_seconds
+                    )]
+                stats = self._statements[key] = StatementStats()
+            stats.calls += 1
+            stats.total_seconds += seconds
+            stats.max_seconds = max(stats.max_seconds, seconds)
+            if slow:
+                stats.slow_calls += 1
+                stats.last_origin = origin
+            explain = (
+                slow and not executemany
+                and statement.lstrip().upper().startswith(_EXPLAINABLE)
+                and self._take_explain()
+            )
+        if not slow:
+            return
+        plan = self._explain(conn, statement, parameters) if explain else None
+        if plan is not None:
+            with self._lock:
+                stats.last_plan = plan
+        logger.warning(
+            "Slow query (%.1f ms) from %s: %s\nparameters: %.500r%s",
+            seconds * 1000, origin, statement, parameters,
+            "\nplan:\n" + "\n".join(plan) if plan else "",
+        )
+
+    def _take_explain(self) -> bool:
+        if random.random() >= self.explain_sample:
+            return False
+        now = time.monotonic()
+        if now - self._explain_window >= 60:
+            self._explain_window = now
+            self._explains = 0
+        if self._explains >= self.explains_per_minute:
+            return False
+        self._explains += 1
+        return True
+
+    @staticmethod
+    def _explain(conn, statement: str, parameters) -> List[str]:
+        sqlite = conn.dialect.name == "sqlite"
+        # A cursor of its own on the same DBAPI connection, so the plan query
+        # is neither counted nor profiled itself
+        cursor = conn.connection.cursor()
+        try:
+            cursor.execute(("EXPLAIN QUERY PLAN " if sqlite else "EXPLAIN ") + statement, parameters)
+            rows = cursor.fetchall()
+        except Exception as exc:
+            return [f"(EXPLAIN failed: {exc})"]
+        finally:
+            cursor.close()
+        if not sqlite:
+            return [" ".join(str(value) for value in row) for row in rows]
+        # (id, parent, notused, detail): indent each step under its parent
+        depth = {0: -1}
+        plan = []
+        for step_id, parent, _, detail in rows:
+            depth[step_id] = depth.get(parent, -1) + 1
+            plan.append("  " * depth[step_id] + detail)
+        return plan
+
+    def top(self, limit: int) -> List[Dict[str, Any]]:
+        """The statements with the most total time, slowest first."""
+        with self._lock:
+            ranked = sorted(
+                self._statements.items(), key=lambda item: item[1].total_seconds, reverse=True
+            )[:limit]
+            return [
+                {
+                    "statement": statement,
+                    "calls": stats.calls,
+                    "total_ms": stats.total_seconds * 1000,
+                    "mean_ms": stats.total_seconds * 1000 / stats.calls,
+                    "max_ms": stats.max_seconds * 1000,
+                    "slow_calls": stats.slow_calls,
+                    "last_slow_origin": stats.last_origin,
+                    "last_plan": stats.last_plan,
+                }
+                for statement, stats in ranked
+            ]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._statements.clear()
+
+
+slow_query_log = SlowQueryLog(
+    threshold_seconds=settings.SLOW_QUERY_THRESHOLD_MS / 1000,
+    explain_sample=settings.SLOW_QUERY_EXPLAIN_SAMPLE,
+    explains_per_minute=settings.SLOW_QUERY_EXPLAINS_PER_MINUTE,
+    max_statements=settings.SLOW_QUERY_MAX_STATEMENTS,
+)
+
+
+class _TimedCheckoutMixin:
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            waited = time.perf_counter() - start
+            pool_wait_stats.record(waited)
+            counter = _statement_counter.get()
+            if counter is not None:
+                counter.pool_wait += waited
+
+
+class TimedQueuePool(_TimedCheckoutMixin, QueuePool):
+    pass
+
+
+class TimedAsyncAdaptedQueuePool(_TimedCheckoutMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def async_database_url(url: str) -> str:
+    """Swap the driver of ``url`` for its asyncio counterpart."""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if parsed.get_driver_name() in ("aiosqlite", "asyncpg", "aiomysql"):
+        return url
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver known for {backend!r}; set ASYNC_DATABASE_URL")
+    return parsed.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+
+def _engine_options(url: str, async_: bool) -> Dict[str, Any]:
+    parsed = make_url(url)
+    options: Dict[str, Any] = {}
+    if parsed.get_backend_name() == "sqlite":
+        options["connect_args"] = {"check_same_thread": False}
+        if parsed.database in (None, "", ":memory:"):
+            # In-memory databases keep SQLAlchemy's single-connection pool
+            return options
+    options.update(
+        poolclass=TimedAsyncAdaptedQueuePool if async_ else TimedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+    )
+    return options
+
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    try:
+        # WAL lets readers proceed while a writer holds the database
+        cursor.execute(f"PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}")
+        cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+        cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+        # Negative cache_size is in KiB rather than pages
+        cursor.execute(f"PRAGMA cache_size=-{int(settings.SQLITE_CACHE_SIZE_KIB)}")
+        cursor.execute(f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}")
+        cursor.execute(f"PRAGMA temp_store={settings.SQLITE_TEMP_STORE}")
+    finally:
+        cursor.close()
+
+
+def create_db_engine(url: str = settings.DATABASE_URL) -> Engine:
+    db_engine = create_engine(url, **_engine_options(url, async_=False))
+    event.listen(db_engine, "before_cursor_execute", _count_statement)
+    event.listen(db_engine, "after_cursor_execute", _time_statement)
+    if db_engine.dialect.name == "sqlite":
+        event.listen(db_engine, "connect", _apply_sqlite_pragmas)
+    if settings.SLOW_QUERY_LOG:
+        slow_query_log.install(db_engine)
+    return db_engine
+
+
+def create_async_db_engine(url: Optional[str] = None) -> AsyncEngine:
+    url = url or settings.ASYNC_DATABASE_URL or async_database_url(settings.DATABASE_URL)
+    db_engine = create_async_engine(url, **_engine_options(url, async_=True))
+    event.listen(db_engine.sync_engine, "before_cursor_execute", _count_statement)
+    event.listen(db_engine.sync_engine, "after_cursor_execute", _time_statement)
+    if db_engine.dialect.name == "sqlite":
+        event.listen(db_engine.sync_engine, "connect", _apply_sqlite_pragmas)
+    if settings.SLOW_QUERY_LOG:
+        slow_query_log.install(db_engine.sync_engine)
+    return db_engine
+
+
+_engine: Optional[Engine] = None
+_session_local: Optional[sessionmaker] = None
+
+
+def get_engine() -> Engine:
+    """The synchronous engine used by scripts and migrations, created on
+    first use since API workers never need it."""
+    global _engine
+    if _engine is None:
+        _engine = create_db_engine()
+    return _engine
+
+
+def get_sessionmaker() -> sessionmaker:
+    global _session_local
+    if _session_local is None:
+        _session_local = sessionmaker(autocommit=False, autoflush=False, bind=get_engine())
+    return _session_local
+
+
+def __getattr__(name: str) -> Any:
+    # ``engine`` and ``SessionLocal`` stay importable by name
+    if name == "engine":
+        return get_engine()
+    if name == "SessionLocal":
+        return get_sessionmaker()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# Non-blocking engine used by the API. Scripts and migrations use the
+# synchronous engine above.
+async_engine = create_async_db_engine()
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, autoflush=False, expire_on_commit=False
+)
+
+Base = declarative_base()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,74 @@
+"""
+Bcrypt hashing on a dedicated process pool.
+
+Hashing and verification are CPU-bound (~250 ms at the default cost), so
+running them in request threads starves unrelated requests during login
+bursts. Calls are shipped to a pool of worker processes sized to the
+machine, and once PASSWORD_HASH_MAX_PENDING calls are waiting new ones are
+rejected with 503 instead of queueing without bound.
+"""
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Optional, Tuple
+
+from fastapi import HTTPException, status
+
+from app.core import security
+from app.core.config import settings
+
+_executor: Optional[ProcessPoolExecutor] = None
+_pending = 0
+
+
+def get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        # "spawn" avoids forking a process that already runs threads and an
+        # event loop; workers import app.core.security once at start-up.
+        _executor = ProcessPoolExecutor(
+            max_workers=settings.PASSWORD_HASH_WORKERS or os.cpu_count() or 1,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _executor
+
+
+def shutdown_executor() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+def pending() -> int:
+    """Number of hash/verify calls currently submitted or running."""
+    return _pending
+
+
+async def _run(fn: Callable[..., Any], *args: Any) -> Any:
+    global _pending
+    if _pending >= settings.PASSWORD_HASH_MAX_PENDING:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Authentication service is busy, please retry",
+            headers={"Retry-After": "1"},
+        )
+    _pending += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(get_executor(), fn, *args)
+    finally:
+        _pending -= 1
+
+
+async def hash_password(password: str) -> str:
+    return await _run(security.get_password_hash, password)
+
+
+async def verify_and_update_password(
+    plain_password: str, hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    return await _run(
+        security.verify_and_update_password, plain_password, hashed_password
+    )
@@ -0,0 +1,184 @@
+"""
+Asyncio worker pool for the durable jobs in ``app.models.job``.
+
+Code that needs work done after a request calls ``enqueue`` inside its
+transaction and ``job_pool.notify()`` once it has committed. Handlers are
+registered per job kind with ``@job_handler(kind)`` and get a session of
+their own plus the job's payload; whatever they write is committed together
+with the job's removal, so a job's effects land once even if it is retried.
+Workers also poll every JOB_POLL_SECONDS, which picks up jobs queued by
+other processes and retries that have come due.
+"""
+import asyncio
+import logging
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, List, NamedTuple, Optional
+
+from sqlalchemy import delete, literal_column, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, async_engine
+from app.models.job import Job, JobStatus
+
+logger = logging.getLogger(__name__)
+
+JobHandler = Callable[[AsyncSession, Dict[str, Any]], Awaitable[None]]
+
+_handlers: Dict[str, JobHandler] = {}
+
+
+def job_handler(kind: str) -> Callable[[JobHandler], JobHandler]:
+    def register(handler: JobHandler) -> JobHandler:
+        _handlers[kind] = handler
+        return handler
+    return register
+
+
+def enqueue(db: AsyncSession, kind: str, payload: Dict[str, Any]) -> Job:
+    """Add a job to db's transaction; it runs once that commits."""
+    if kind not in _handlers:
+        raise ValueError(f"No handler registered for job kind {kind!r}")
+    job = Job(kind=kind, payload=payload, run_at=datetime.now(timezone.utc))
+    db.add(job)
+    return job
+
+
+def retry_delay(attempts: int) -> float:
+    """Seconds before another try of a job that has failed attempts times."""
+    delay = min(
+        settings.JOB_RETRY_BASE_SECONDS * 2 ** (attempts - 1),
+        settings.JOB_RETRY_MAX_SECONDS,
+    )
+    # Jitter keeps jobs that failed together from retrying together
+    return delay * random.uniform(0.5, 1.0)
+
+
+class ClaimedJob(NamedTuple):
+    id: int
+    kind: str
+    payload: Dict[str, Any]
+    attempts: int
+
+
+class JobWorkerPool:
+    def __init__(self):
+        self._workers: List[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self.succeeded = 0
+        self.retried = 0
+        self.failed = 0
+
+    def start(self, workers: int) -> None:
+        if self._workers or workers <= 0:
+            return
+        self._wakeup = asyncio.Event()
+        self._workers = [asyncio.create_task(self._work()) for _ in range(workers)]
+
+    async def stop(self) -> None:
+        # A job cut short here keeps its lease and is run again later
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._wakeup = None
+
+    def notify(self) -> None:
+        """Have idle workers look for jobs now (call after enqueue commits)."""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _work(self) -> None:
+        while True:
+            try:
+                job = await self._claim()
+            except Exception:
+                logger.exception("Claiming a job failed")
+                job = None
+            if job is None:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), settings.JOB_POLL_SECONDS)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+                continue
+            await self._run(job)
+
+    async def _claim(self) -> Optional[ClaimedJob]:
+        jobs = Job.__table__
+        now = datetime.now(timezone.utc)
+        # A literal, so SQLite can use the partial ix_jobs_run_at
+        runnable = (jobs.c.status != literal_column("'FAILED'"), jobs.c.run_at <= now)
+        while True:
+            # Mostly the queue is empty: find that out without taking the
+            # write lock every poll
+            async with async_engine.connect() as conn:
+                job_id = (await conn.execute(
+                    select(jobs.c.id).where(*runnable).order_by(jobs.c.run_at).limit(1)
+                )).scalar()
+            if job_id is None:
+                return None
+            # Only claimed if still runnable, so two workers can never claim
+            # the same job; a worker that lost the race looks again
+            async with async_engine.begin() as conn:
+                row = (await conn.execute(
+                    update(jobs)
+                    .where(jobs.c.id == job_id, *runnable)
+                    .values(
+                        status=JobStatus.RUNNING,
+                        attempts=jobs.c.attempts + 1,
+                        run_at=now + timedelta(seconds=settings.JOB_LEASE_SECONDS),
+                    )
+                    .returning(jobs.c.id, jobs.c.kind, jobs.c.payload, jobs.c.attempts)
+                )).first()
+            if row is not None:
+                return ClaimedJob(*row)
+
+    async def _run(self, job: ClaimedJob) -> None:
+        try:
+            handler = _handlers.get(job.kind)
+            if handler is None:
+                raise LookupError(f"No handler registered for job kind {job.kind!r}")
+            async with AsyncSessionLocal() as db:
+                await handler(db, job.payload)
+                await db.execute(delete(Job).where(Job.id == job.id))
+                await db.commit()
+            self.succeeded += 1
+        except Exception as exc:
+            await self._retry_or_fail(job, exc)
+
+    async def _retry_or_fail(self, job: ClaimedJob, exc: Exception) -> None:
+        error = f"{type(exc).__name__}: {exc}"
+        if job.attempts >= settings.JOB_MAX_ATTEMPTS:
+            logger.error("Job %s (%s) failed for good: %s", job.id, job.kind, error)
+            values = {"status": JobStatus.FAILED}
+            self.failed += 1
+        else:
+            logger.warning("Job %s (%s) failed, will retry: %s", job.id, job.kind, error)
+            values = {
+                "status": JobStatus.PENDING,
+                "run_at": datetime.now(timezone.utc) + timedelta(seconds=retry_delay(job.attempts)),
+            }
+            self.retried += 1
+        try:
+            async with async_engine.begin() as conn:
+                await conn.execute(
+                    update(Job.__table__)
+                    .where(Job.__table__.c.id == job.id)
+                    .values(last_error=error[:2000], **values)
+                )
+        except Exception:
+            # The lease still runs out, and the job is retried then
+            logger.exception("Recording the failure of job %s failed", job.id)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "workers": len(self._workers),
+            "succeeded": self.succeeded,
+            "retried": self.retried,
+            "failed": self.failed,
+        }
+
+
+job_pool = JobWorkerPool()
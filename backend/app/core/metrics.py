@@ -0,0 +1,196 @@
+"""
+Per-route request metrics in the Prometheus text format.
+
+``MetricsMiddleware`` times every HTTP request and, through
+``count_statements``, the SQL it ran: statements, seconds spent running
+them and seconds spent waiting for a pooled connection, plus the size of the
+response body. Requests are keyed by method, route template (not the raw
+path, so ids do not multiply the series) and status code. ``render`` writes
+them out together with whatever gauges the caller collects.
+
+``StatementOriginMiddleware`` tells the slow-query log which route ran a
+statement.
+"""
+import time
+from bisect import bisect_left
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from app.core.database import count_statements, statement_origin
+
+PROMETHEUS_MEDIA_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Upper bounds in seconds; Prometheus buckets are cumulative, the counts
+# kept here are not until render
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# method, route template, status code
+RouteKey = Tuple[str, str, str]
+
+
+class RouteStats:
+    __slots__ = ("buckets", "count", "seconds", "statements", "sql_seconds",
+                 "pool_wait_seconds", "response_bytes")
+
+    def __init__(self):
+        # One per LATENCY_BUCKETS bound plus +Inf
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.seconds = 0.0
+        self.statements = 0
+        self.sql_seconds = 0.0
+        self.pool_wait_seconds = 0.0
+        self.response_bytes = 0
+
+
+# (name, type, help, RouteStats attribute) for the per-route sums
+_ROUTE_COUNTERS = [
+    ("http_request_sql_statements_total", "counter",
+     "SQL statements run by requests.", "statements"),
+    ("http_request_sql_seconds_total", "counter",
+     "Seconds requests spent running SQL statements.", "sql_seconds"),
+    ("http_request_pool_wait_seconds_total", "counter",
+     "Seconds requests spent waiting for a pooled database connection.", "pool_wait_seconds"),
+    ("http_response_size_bytes_total", "counter",
+     "Response body bytes sent.", "response_bytes"),
+]
+
+
+def _labels(**labels: str) -> str:
+    escaped = (
+        value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        for value in labels.values()
+    )
+    return "{" + ",".join(f'{name}="{value}"' for name, value in zip(labels, escaped)) + "}"
+
+
+def route_template(scope) -> str:
+    """
+    The matched route's path with its parameters put back as ``{name}``;
+    rebuilt from the request path, since routes of an included router only
+    know the path relative to it.
+    """
+    if "endpoint" not in scope:
+        return "unmatched"
+    params = scope.get("path_params")
+    if not params:
+        return scope["path"]
+    names = {str(value): name for name, value in params.items()}
+    return "/".join(
+        "{" + names[segment] + "}" if segment in names else segment
+        for segment in scope["path"].split("/")
+    )
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.routes: Dict[RouteKey, RouteStats] = {}
+
+    def observe(self, key: RouteKey, seconds: float, statements: int, sql_seconds: float,
+                pool_wait_seconds: float, response_bytes: int) -> None:
+        stats = self.routes.get(key)
+        if stats is None:
+            stats = self.routes[key] = RouteStats()
+        stats.buckets[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        stats.count += 1
+        stats.seconds += seconds
+        stats.statements += statements
+        stats.sql_seconds += sql_seconds
+        stats.pool_wait_seconds += pool_wait_seconds
+        stats.response_bytes += response_bytes
+
+    def reset(self) -> None:
+        self.routes.clear()
+
+    def render(self, gauges: Optional[Mapping[str, Mapping[str, Any]]] = None) -> str:
+        """
+        The route metrics, then one gauge per numeric value in ``gauges``
+        (``{"query_cache": {"hits": 3}}`` becomes ``app_query_cache_hits 3``).
+        """
+        lines: List[str] = []
+        routes = sorted(self.routes.items())
+        name = "http_request_duration_seconds"
+        lines.append(f"# HELP {name} Request latency by route.")
+        lines.append(f"# TYPE {name} histogram")
+        for (method, route, status), stats in routes:
+            labels = dict(method=method, route=route, status=status)
+            cumulative = 0
+            for bound, count in zip(LATENCY_BUCKETS, stats.buckets):
+                cumulative += count
+                lines.append(f"{name}_bucket{_labels(**labels, le=repr(bound))} {cumulative}")
+            lines.append(f"{name}_bucket{_labels(**labels, le='+Inf')} {stats.count}")
+            lines.append(f"{name}_sum{_labels(**labels)} {_number(stats.seconds)}")
+            lines.append(f"{name}_count{_labels(**labels)} {stats.count}")
+        for name, kind, help_text, attribute in _ROUTE_COUNTERS:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for (method, route, status), stats in routes:
+                labels = _labels(method=method, route=route, status=status)
+                lines.append(f"{name}{labels} {_number(getattr(stats, attribute))}")
+        for component, values in (gauges or {}).items():
+            for key, value in values.items():
+                if isinstance(value, bool):
+                    value = int(value)
+                if isinstance(value, (int, float)):
+                    name = f"app_{component}_{key}"
+                    lines.append(f"# TYPE {name} gauge")
+                    lines.append(f"{name} {_number(value)}")
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording every HTTP request in ``registry``."""
+
+    def __init__(self, app, registry: MetricsRegistry = metrics):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        status = 500
+        response_bytes = 0
+
+        async def send_and_measure(message):
+            nonlocal status, response_bytes
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                response_bytes += len(message.get("body", b""))
+            await send(message)
+
+        start = time.perf_counter()
+        with count_statements() as counter:
+            try:
+                await self.app(scope, receive, send_and_measure)
+            finally:
+                self.registry.observe(
+                    (scope["method"], route_template(scope), str(status)),
+                    time.perf_counter() - start,
+                    counter.count, counter.seconds, counter.pool_wait, response_bytes,
+                )
+
+
+class StatementOriginMiddleware:
+    """ASGI middleware naming the request's route as the origin of its SQL."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        # Resolved only if a statement turns out slow, after routing
+        token = statement_origin.set(lambda: f"{scope['method']} {route_template(scope)}")
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            statement_origin.reset(token)
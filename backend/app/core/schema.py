@@ -0,0 +1,101 @@
+"""
+Schema version check against the Alembic migrations.
+
+The app does not create tables when it starts: ``alembic upgrade head``
+owns the schema, and ``check_schema`` (run from the app's lifespan) refuses
+a database whose recorded revision is not the newest migration, rather than
+serving one with missing columns, indexes or triggers. The newest revision
+is read straight from the migration files so that every worker start does
+not pay for importing Alembic.
+
+Scripts that build scratch databases with ``create_all`` use
+``create_schema``, which also stamps them with that revision.
+"""
+import ast
+import os
+from typing import Dict, Optional
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection, Engine
+
+import app.models  # noqa: F401  (registers every table on Base.metadata)
+from app.core.database import Base
+
+MIGRATIONS_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "migrations",
+)
+VERSION_TABLE = "alembic_version"
+
+
+class SchemaOutOfDate(RuntimeError):
+    pass
+
+
+def _module_constants(path: str) -> Dict[str, object]:
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), path)
+    constants = {}
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and len(node.targets) == 1 \
+                and isinstance(node.targets[0], ast.Name):
+            try:
+                constants[node.targets[0].id] = ast.literal_eval(node.value)
+            except ValueError:
+                pass
+    return constants
+
+
+def head_revision(migrations_dir: str = MIGRATIONS_DIR) -> str:
+    """The revision no other migration revises."""
+    revisions = set()
+    revised = set()
+    versions = os.path.join(migrations_dir, "versions")
+    for name in os.listdir(versions):
+        if not name.endswith(".py"):
+            continue
+        constants = _module_constants(os.path.join(versions, name))
+        if "revision" not in constants:
+            continue
+        revisions.add(constants["revision"])
+        down = constants.get("down_revision")
+        revised.update(down if isinstance(down, (tuple, list)) else [down])
+    heads = revisions - revised
+    if len(heads) != 1:
+        raise SchemaOutOfDate(f"Expected one migration head, found {sorted(heads)}")
+    return heads.pop()
+
+
+def current_revision(connection: Connection) -> Optional[str]:
+    if not inspect(connection).has_table(VERSION_TABLE):
+        return None
+    rows = connection.execute(text(f"SELECT version_num FROM {VERSION_TABLE}")).scalars().all()
+    return rows[0] if len(rows) == 1 else None
+
+
+def check_schema(connection: Connection) -> None:
+    head = head_revision()
+    current = current_revision(connection)
+    if current == head:
+        return
+    if current is None:
+        raise SchemaOutOfDate(
+            f"Database has no migration revision (expected {head}): run "
+            "'alembic upgrade head', or 'alembic stamp head' if it was built "
+            "with create_all from the current models"
+        )
+    raise SchemaOutOfDate(
+        f"Database is at migration {current}, expected {head}: run 'alembic upgrade head'"
+    )
+
+
+def create_schema(engine: Engine) -> None:
+    """Create the tables from the models and, if the database has no
+    revision yet, stamp it with the newest one."""
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        if current_revision(conn) is None:
+            from alembic.runtime.migration import MigrationContext
+            from alembic.script import ScriptDirectory
+
+            MigrationContext.configure(conn).stamp(ScriptDirectory(MIGRATIONS_DIR), "head")
@@ -1,25 +1,56 @@
 from datetime import datetime, timedelta, timezone
-from typing import Optional, Dict, Any
-from jose import JWTError, jwt
-from passlib.context import CryptContext
+from functools import lru_cache
+from typing import TYPE_CHECKING, Optional, Dict, Any, Tuple
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy import event, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
 
+from app.core.cache import TTLCache
 from app.core.config import settings
+from app.core.database import get_async_db
 from app.models.user import User
-from app.core.database import get_db
-from sqlalchemy.orm import Session
+from app.schemas.user import UserInDB
+
+if TYPE_CHECKING:
+    from passlib.context import CryptContext
+
+# passlib and jose (which pulls in cryptography) are imported on first use:
+# API workers only hash in the hashing process pool, and need neither to
+# start serving
+@lru_cache(maxsize=None)
+def get_pwd_context() -> "CryptContext":
+    from passlib.context import CryptContext
+
+    return CryptContext(
+        schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.BCRYPT_ROUNDS
+    )
+
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login")
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/v1/auth/login")
+# Authenticated principals keyed by token subject (email). Entries are
+# immutable UserInDB snapshots, so they are safe to share across requests.
+principal_cache = TTLCache(
+    maxsize=settings.PRINCIPAL_CACHE_MAX_SIZE,
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_pwd_context().verify(plain_password, hashed_password)
+
+def verify_and_update_password(
+    plain_password: str, hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    """Verify a password and return a replacement hash if the cost changed."""
+    return get_pwd_context().verify_and_update(plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    return get_pwd_context().hash(password)
 
 def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
+    from jose import jwt
+
     to_encode = data.copy()
     if expires_delta:
         expire = datetime.now(timezone.utc) + expires_delta
@@ -32,6 +63,8 @@ def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta]
     return encoded_jwt
 
 def decode_token(token: str) -> Optional[Dict[str, Any]]:
+    from jose import JWTError, jwt
+
     try:
         payload = jwt.decode(
             token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
@@ -40,26 +73,56 @@ def decode_token(token: str) -> Optional[Dict[str, Any]]:
     except JWTError:
         return None
 
+def invalidate_principal(email: str) -> None:
+    principal_cache.delete(email)
+
+_CHANGED_PRINCIPALS = "changed_principals"
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _collect_changed_principal(mapper, connection, target: User) -> None:
+    # Any flushed change to a user (profile update, deactivation, password
+    # change, email change) drops both the old and the new cache entry, but
+    # only once it has committed: evicted at flush time, a concurrent request
+    # could read the old row before the COMMIT and cache it again for the
+    # whole TTL.
+    history = inspect(target).attrs.email.history
+    changed = inspect(target).session.info.setdefault(_CHANGED_PRINCIPALS, set())
+    changed.update(email for email in (*history.deleted, target.email) if email)
+
+@event.listens_for(Session, "after_commit")
+def _evict_changed_principals(session: Session) -> None:
+    for email in session.info.pop(_CHANGED_PRINCIPALS, ()):
+        invalidate_principal(email)
+
+@event.listens_for(Session, "after_rollback")
+def _forget_changed_principals(session: Session) -> None:
+    session.info.pop(_CHANGED_PRINCIPALS, None)
+
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
-) -> User:
+    db: AsyncSession = Depends(get_async_db)
+) -> UserInDB:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    try:
-        payload = decode_token(token)
-        if payload is None:
-            raise credentials_exception
-        email: str = payload.get("sub")
-        if email is None:
-            raise credentials_exception
-    except JWTError:
+    payload = decode_token(token)
+    if payload is None:
+        raise credentials_exception
+    email: Optional[str] = payload.get("sub")
+    if email is None:
         raise credentials_exception
-    
-    user = db.query(User).filter(User.email == email).first()
-    if user is None:
+
+    user = principal_cache.get(email)
+    if user is not None:
+        return user
+
+    result = await db.execute(select(User).filter(User.email == email))
+    db_user = result.scalars().first()
+    if db_user is None:
         raise credentials_exception
+    user = UserInDB.model_validate(db_user)
+    principal_cache.set(email, user)
     return user
@@ -1,17 +1,53 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 
 from .core.config import settings
-from .core.database import Base, engine
-from .api.v1.endpoints import users, projects, tasks, auth
+from .api.etags import ETAG_HEADER
+from .api.events import event_broker
+from .api.pagination import NEXT_CURSOR_HEADER
+from .api.query_cache import query_cache
+from .api.reminders import reminder_scheduler
+from .api.sync import SYNC_HORIZON_HEADER, SYNC_VERSION_HEADER
+from .core import hashing
+from .core.database import async_engine, count_statements, pool_wait_stats
+from .core.hashing import shutdown_executor
+from .core.jobs import job_pool
+from .core.metrics import (
+    PROMETHEUS_MEDIA_TYPE,
+    MetricsMiddleware,
+    StatementOriginMiddleware,
+    metrics,
+)
+from .core.schema import check_schema
+from .core.security import principal_cache
+from .api.v1.endpoints import users, projects, tasks, auth, admin, sync, events
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Migrations create the schema; a worker only checks it is current
+    if settings.SCHEMA_CHECK:
+        async with async_engine.connect() as conn:
+            await conn.run_sync(check_schema)
+    job_pool.start(settings.JOB_WORKERS)
+    if settings.REMINDERS_ENABLED:
+        reminder_scheduler.start()
+    yield
+    await reminder_scheduler.stop()
+    await job_pool.stop()
+    # Open event streams would otherwise hold the server up until they time out
+    await event_broker.close()
+    shutdown_executor()
+    # Pooled aiosqlite connections belong to this event loop
+    await async_engine.dispose()
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.VERSION,
-    description="A task management system API"
+    description="A task management system API",
+    lifespan=lifespan,
 )
 
 # Set up CORS
@@ -21,13 +57,47 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, ETAG_HEADER, SYNC_HORIZON_HEADER, SYNC_VERSION_HEADER],
 )
 
+if settings.QUERY_COUNT_HEADER:
+    @app.middleware("http")
+    async def add_query_count_header(request: Request, call_next):
+        with count_statements() as counter:
+            response = await call_next(request)
+        response.headers["X-Query-Count"] = str(counter.count)
+        return response
+
+if settings.SLOW_QUERY_LOG:
+    app.add_middleware(StatementOriginMiddleware)
+
+if settings.METRICS_ENABLED:
+    # Added last, so it is outermost and times the other middleware too
+    app.add_middleware(MetricsMiddleware)
+
+    @app.get("/metrics", include_in_schema=False)
+    async def read_metrics():
+        return PlainTextResponse(
+            metrics.render({
+                "db_pool": pool_wait_stats.stats(),
+                "query_cache": query_cache.stats(),
+                "principal_cache": principal_cache.stats(),
+                "password_hashing": {"pending": hashing.pending()},
+                "event_broker": event_broker.stats(),
+                "job_pool": job_pool.stats(),
+                "reminders": reminder_scheduler.stats(),
+            }),
+            media_type=PROMETHEUS_MEDIA_TYPE,
+        )
+
 # Include API routers
 app.include_router(auth.router, prefix="/api/v1/auth", tags=["auth"])
 app.include_router(users.router, prefix="/api/v1/users", tags=["users"])
 app.include_router(projects.router, prefix="/api/v1/projects", tags=["projects"])
 app.include_router(tasks.router, prefix="/api/v1/tasks", tags=["tasks"])
+app.include_router(sync.router, prefix="/api/v1/sync", tags=["sync"])
+app.include_router(events.router, prefix="/api/v1/events", tags=["events"])
+app.include_router(admin.router, prefix="/api/v1/admin", tags=["admin"])
 
 @app.get("/", tags=["root"])
 async def root():
@@ -2,5 +2,16 @@ from .user import User
 from .project import Project
 from .task import Task, TaskStatus, TaskPriority
 from .comment import Comment
+from .stats import ProjectTaskCount
+from .sync import ChangeLog, ChangeLogHorizon
+from .job import Job, JobStatus
+from .notification import Notification
+from .reminder import ReminderWatermark
+# Registers the create_all hook for the FTS5 task_search index
+from . import search  # noqa: F401
 
-__all__ = ["User", "Project", "Task", "TaskStatus", "TaskPriority", "Comment"]
+__all__ = [
+    "User", "Project", "Task", "TaskStatus", "TaskPriority", "Comment",
+    "ProjectTaskCount", "ChangeLog", "ChangeLogHorizon", "Job", "JobStatus",
+    "Notification", "ReminderWatermark",
+]
@@ -1,11 +1,16 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, Index
+from sqlalchemy.orm import relationship, synonym
 from sqlalchemy.sql import func
 
 from ..core.database import Base
 
 class Comment(Base):
     __tablename__ = "comments"
+    __table_args__ = (
+        # read_task_comments: a task's thread in posting order
+        Index("ix_comments_task_id_created_at", "task_id", "created_at"),
+        Index("ix_comments_user_id", "user_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     content = Column(Text, nullable=False)
@@ -15,5 +20,7 @@ class Comment(Base):
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     # Relationships
-    task = relationship("Task", back_populates="comments")
-    user = relationship("User", back_populates="comments")
+    task = relationship("Task", back_populates="comments", lazy="raise_on_sql")
+    user = relationship("User", back_populates="comments", lazy="raise_on_sql")
+    # API name for the commenting user
+    author = synonym("user")
@@ -0,0 +1,42 @@
+"""
+Durable background jobs, run by the worker pool in ``app.core.jobs``.
+
+A job is added in the same transaction as the write that calls for it, so it
+exists exactly when that write committed. Workers claim the job with the
+earliest ``run_at``; claiming moves ``run_at`` forward by the lease, so a job
+whose worker died is picked up again once the lease runs out. A job that
+succeeds is deleted in the same transaction as its handler's writes. One that
+fails goes back to pending with a later ``run_at``, or to failed (kept for
+inspection) when it has used up its attempts.
+"""
+import enum
+
+from sqlalchemy import JSON, Column, DateTime, Enum, Index, Integer, String, Text, text
+from sqlalchemy.sql import func
+
+from ..core.database import Base
+
+
+class JobStatus(str, enum.Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    FAILED = "failed"
+
+
+class Job(Base):
+    __tablename__ = "jobs"
+    __table_args__ = (
+        # Claiming: the next runnable job. Failed jobs are left out, so the
+        # index only holds the queue itself
+        Index("ix_jobs_run_at", "run_at", sqlite_where=text("status != 'FAILED'")),
+    )
+
+    id = Column(Integer, primary_key=True)
+    kind = Column(String, nullable=False)
+    payload = Column(JSON, nullable=False)
+    status = Column(Enum(JobStatus), default=JobStatus.PENDING, nullable=False)
+    attempts = Column(Integer, default=0, nullable=False)
+    # Pending: when the job may run. Running: when its lease expires
+    run_at = Column(DateTime(timezone=True), nullable=False)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
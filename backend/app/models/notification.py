@@ -0,0 +1,57 @@
+from sqlalchemy import (
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    UniqueConstraint,
+    event,
+    text,
+)
+from sqlalchemy.sql import func
+
+from ..core.database import Base
+
+
+class Notification(Base):
+    __tablename__ = "notifications"
+    __table_args__ = (
+        # A user's notifications, newest first
+        Index("ix_notifications_user_id_id", "user_id", "id"),
+        # One notification per recipient and comment; also serves the
+        # cleanup trigger below
+        UniqueConstraint("comment_id", "user_id", "kind", name="uq_notifications_comment_user"),
+        # Cleanup when a task goes
+        Index("ix_notifications_task_id", "task_id"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    # Recipient
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    # "mention", "due" or "overdue"
+    kind = Column(String, nullable=False)
+    # Who caused it (a mention's author); none for reminders
+    actor_id = Column(Integer, ForeignKey("users.id"), nullable=True)
+    task_id = Column(Integer, nullable=False)
+    comment_id = Column(Integer, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+# Notifications go with their comment or task, whichever path deletes it (ORM
+# cascade, batch task delete, import rollback)
+NOTIFICATION_TRIGGERS = {
+    "notifications_comment_delete":
+        "AFTER DELETE ON comments BEGIN "
+        "DELETE FROM notifications WHERE comment_id = OLD.id; END",
+    "notifications_task_delete":
+        "AFTER DELETE ON tasks BEGIN "
+        "DELETE FROM notifications WHERE task_id = OLD.id; END",
+}
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _create_notification_triggers(target, connection, **kw):
+    if connection.dialect.name == "sqlite":
+        for name, body in NOTIFICATION_TRIGGERS.items():
+            connection.execute(text(f"CREATE TRIGGER IF NOT EXISTS {name} {body}"))
@@ -0,0 +1,17 @@
+from sqlalchemy import CheckConstraint, Column, DateTime, Integer
+
+from ..core.database import Base
+
+
+class ReminderWatermark(Base):
+    """How far due-date reminders have gone out (see app.api.reminders)."""
+
+    __tablename__ = "reminder_watermark"
+    __table_args__ = (CheckConstraint("id = 1", name="ck_reminder_watermark_single_row"),)
+
+    id = Column(Integer, primary_key=True)
+    # Reminders go out in (due_date, task id) order; this is the last one sent
+    due_date = Column(DateTime(timezone=True), nullable=False)
+    task_id = Column(Integer, nullable=False)
+    # Bumped on every advance, which is a compare-and-set on it
+    version = Column(Integer, nullable=False, default=0)
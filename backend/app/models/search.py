@@ -0,0 +1,108 @@
+"""
+SQLite FTS5 index over task titles, descriptions and comments.
+
+``task_search`` holds one row per task (rowid = tasks.id) and is kept in sync
+by triggers on ``tasks`` and ``comments``. It is not part of
+``Base.metadata``: migrations 0004 and 0011 create it on existing databases,
+the ``after_create`` hook below does the same for databases built with
+``create_all``, and ``rebuild_search_index.py`` repopulates it.
+
+A comment trigger re-reads the task's whole thread, so bulk writers (project
+import) would pay for every thread quadratically. They list the tasks they
+write or delete comments for in ``task_search_deferred`` instead, which the
+triggers skip, and index each of those tasks once before committing (see
+``app.api.search``). The table is only ever filled inside a transaction.
+"""
+from sqlalchemy import event, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.sql import column, table
+
+from .comment import Comment
+
+task_search = table(
+    "task_search",
+    column("rowid"),
+    column("title"),
+    column("description"),
+    column("comments"),
+)
+
+task_search_deferred = table("task_search_deferred", column("task_id"))
+
+# All of a task's comments, one per line
+_TASK_COMMENTS = (
+    "(SELECT group_concat(content, char(10)) FROM comments WHERE task_id = {task_id})"
+)
+
+_NOT_DEFERRED = (
+    "WHEN NOT EXISTS (SELECT 1 FROM task_search_deferred WHERE task_id = {task_id}) "
+)
+
+SEARCH_INDEX_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS task_search USING fts5("
+    "title, description, comments, "
+    "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')",
+
+    "CREATE TABLE IF NOT EXISTS task_search_deferred (task_id INTEGER PRIMARY KEY)",
+
+    "CREATE TRIGGER IF NOT EXISTS task_search_task_insert AFTER INSERT ON tasks BEGIN "
+    "INSERT INTO task_search (rowid, title, description, comments) "
+    "VALUES (NEW.id, NEW.title, NEW.description, NULL); END",
+
+    "CREATE TRIGGER IF NOT EXISTS task_search_task_update "
+    "AFTER UPDATE OF title, description ON tasks BEGIN "
+    "UPDATE task_search SET title = NEW.title, description = NEW.description "
+    "WHERE rowid = NEW.id; END",
+
+    "CREATE TRIGGER IF NOT EXISTS task_search_task_delete AFTER DELETE ON tasks BEGIN "
+    "DELETE FROM task_search WHERE rowid = OLD.id; END",
+
+    "CREATE TRIGGER IF NOT EXISTS task_search_comment_insert AFTER INSERT ON comments "
+    f"{_NOT_DEFERRED.format(task_id='NEW.task_id')}BEGIN "
+    f"UPDATE task_search SET comments = {_TASK_COMMENTS.format(task_id='NEW.task_id')} "
+    "WHERE rowid = NEW.task_id; END",
+
+    "CREATE TRIGGER IF NOT EXISTS task_search_comment_update "
+    "AFTER UPDATE OF content, task_id ON comments BEGIN "
+    f"UPDATE task_search SET comments = {_TASK_COMMENTS.format(task_id='OLD.task_id')} "
+    "WHERE rowid = OLD.task_id; "
+    f"UPDATE task_search SET comments = {_TASK_COMMENTS.format(task_id='NEW.task_id')} "
+    "WHERE rowid = NEW.task_id; END",
+
+    "CREATE TRIGGER IF NOT EXISTS task_search_comment_delete AFTER DELETE ON comments "
+    f"{_NOT_DEFERRED.format(task_id='OLD.task_id')}BEGIN "
+    f"UPDATE task_search SET comments = {_TASK_COMMENTS.format(task_id='OLD.task_id')} "
+    "WHERE rowid = OLD.task_id; END",
+]
+
+SEARCH_INDEX_REBUILD = [
+    "DELETE FROM task_search",
+    "INSERT INTO task_search (rowid, title, description, comments) "
+    f"SELECT id, title, description, {_TASK_COMMENTS.format(task_id='tasks.id')} FROM tasks",
+    "INSERT INTO task_search (task_search) VALUES ('optimize')",
+]
+
+REINDEX_DEFERRED_COMMENTS = [
+    f"UPDATE task_search SET comments = {_TASK_COMMENTS.format(task_id='task_search.rowid')} "
+    "WHERE rowid IN (SELECT task_id FROM task_search_deferred)",
+    "DELETE FROM task_search_deferred",
+]
+
+
+def create_search_index(connection: Connection) -> None:
+    for statement in SEARCH_INDEX_DDL:
+        connection.execute(text(statement))
+
+
+def rebuild_search_index(connection: Connection) -> int:
+    """Repopulate task_search from tasks and comments; returns the row count."""
+    for statement in SEARCH_INDEX_REBUILD:
+        connection.execute(text(statement))
+    return connection.execute(text("SELECT count(*) FROM task_search")).scalar_one()
+
+
+@event.listens_for(Comment.__table__, "after_create")
+def _create_search_index(target, connection, **kw):
+    # comments is created after tasks, so both trigger targets exist by now
+    if connection.dialect.name == "sqlite":
+        create_search_index(connection)
@@ -0,0 +1,132 @@
+"""
+Per-project task counters behind the dashboard stats endpoints.
+
+``project_task_counts`` holds one row per (project, status, priority) with
+the number of tasks in that bucket. SQLite triggers on ``tasks`` keep it up
+to date in the same transaction as the write that changes a task, whichever
+path the write takes (ORM, batch endpoints, import). Migration 0005 creates
+the triggers on existing databases, the ``after_create`` hook below does the
+same for databases built with ``create_all``, and
+``reconcile_project_stats.py`` recomputes the counters and reports drift.
+"""
+from typing import List, NamedTuple
+
+from sqlalchemy import (
+    Column,
+    Enum,
+    ForeignKey,
+    Integer,
+    delete,
+    event,
+    func,
+    select,
+    text,
+    tuple_,
+)
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.engine import Connection
+
+from ..core.database import Base
+from .task import Task, TaskPriority, TaskStatus
+
+
+class ProjectTaskCount(Base):
+    __tablename__ = "project_task_counts"
+
+    project_id = Column(Integer, ForeignKey("projects.id"), primary_key=True)
+    status = Column(Enum(TaskStatus), primary_key=True)
+    priority = Column(Enum(TaskPriority), primary_key=True)
+    task_count = Column(Integer, nullable=False, default=0)
+
+
+_COUNT_UP = (
+    "INSERT INTO project_task_counts (project_id, status, priority, task_count) "
+    "VALUES (NEW.project_id, NEW.status, NEW.priority, 1) "
+    "ON CONFLICT (project_id, status, priority) "
+    "DO UPDATE SET task_count = task_count + 1; "
+)
+_COUNT_DOWN = (
+    "UPDATE project_task_counts SET task_count = task_count - 1 "
+    "WHERE project_id = OLD.project_id AND status = OLD.status "
+    "AND priority = OLD.priority; "
+)
+
+STATS_TRIGGERS = {
+    "project_task_counts_insert":
+        f"AFTER INSERT ON tasks BEGIN {_COUNT_UP}END",
+    "project_task_counts_update":
+        "AFTER UPDATE OF project_id, status, priority ON tasks "
+        "WHEN OLD.project_id IS NOT NEW.project_id OR OLD.status IS NOT NEW.status "
+        f"OR OLD.priority IS NOT NEW.priority BEGIN {_COUNT_DOWN}{_COUNT_UP}END",
+    "project_task_counts_delete":
+        f"AFTER DELETE ON tasks BEGIN {_COUNT_DOWN}END",
+    "project_task_counts_project_delete":
+        "AFTER DELETE ON projects BEGIN "
+        "DELETE FROM project_task_counts WHERE project_id = OLD.id; END",
+}
+
+
+def create_stats_triggers(connection: Connection) -> None:
+    for name, body in STATS_TRIGGERS.items():
+        connection.execute(text(f"CREATE TRIGGER IF NOT EXISTS {name} {body}"))
+
+
+class CountDrift(NamedTuple):
+    project_id: int
+    status: TaskStatus
+    priority: TaskPriority
+    stored: int
+    actual: int
+
+
+def reconcile_project_task_counts(connection: Connection) -> List[CountDrift]:
+    """
+    Recompute every counter with one GROUP BY over tasks, rewrite the ones
+    that disagree and return them. Run it inside a transaction.
+    """
+    counts = ProjectTaskCount.__table__
+    key = (counts.c.project_id, counts.c.status, counts.c.priority)
+    actual = {
+        (project_id, status, priority): task_count
+        for project_id, status, priority, task_count in connection.execute(
+            select(Task.project_id, Task.status, Task.priority, func.count())
+            .group_by(Task.project_id, Task.status, Task.priority)
+        )
+    }
+    stored = {
+        (project_id, status, priority): task_count
+        for project_id, status, priority, task_count in connection.execute(
+            select(*key, counts.c.task_count)
+        )
+    }
+
+    drift = [
+        CountDrift(*bucket, stored.get(bucket, 0), actual.get(bucket, 0))
+        for bucket in sorted(stored.keys() | actual.keys(), key=str)
+        if stored.get(bucket, 0) != actual.get(bucket, 0)
+    ]
+    stale = [(d.project_id, d.status, d.priority) for d in drift if not d.actual]
+    if stale:
+        connection.execute(delete(counts).where(tuple_(*key).in_(stale)))
+    fixed = [d for d in drift if d.actual]
+    if fixed:
+        upsert = insert(counts)
+        connection.execute(
+            upsert.on_conflict_do_update(
+                index_elements=list(key),
+                set_={"task_count": upsert.excluded.task_count},
+            ),
+            [
+                {"project_id": d.project_id, "status": d.status,
+                 "priority": d.priority, "task_count": d.actual}
+                for d in fixed
+            ],
+        )
+    return drift
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _create_stats_triggers(target, connection, **kw):
+    # After the whole metadata, so tasks, projects and the counters all exist
+    if connection.dialect.name == "sqlite":
+        create_stats_triggers(connection)
@@ -0,0 +1,167 @@
+"""
+Append-only change log behind ``GET /api/v1/sync``.
+
+Every insert, update and delete of a project, task or comment appends a row
+to ``change_log`` through SQLite triggers, in the same transaction as the
+write and whichever path makes it (ORM, batch endpoints, import). ``version``
+is an AUTOINCREMENT key, so it only ever grows and is never reused, even
+after compaction. Rows carry the project the entity belongs to and its owner,
+who is the one who may see the change.
+
+``compact_change_log`` keeps the table small: it drops entries superseded by
+a later one for the same entity and owner (lossless for any reader) and
+entries older than the retention period. Ids are reused after a delete, so
+one owner's entries never supersede another's. The highest version dropped
+for age is kept in ``change_log_horizon``; readers whose ``since`` is older
+than that must re-fetch everything.
+"""
+from datetime import datetime, timedelta, timezone
+from typing import NamedTuple
+
+from sqlalchemy import (
+    Boolean,
+    CheckConstraint,
+    Column,
+    DateTime,
+    Index,
+    Integer,
+    String,
+    event,
+    select,
+    text,
+)
+from sqlalchemy.engine import Connection
+from sqlalchemy.sql import func
+
+from ..core.database import Base
+
+
+class ChangeLog(Base):
+    __tablename__ = "change_log"
+    __table_args__ = (
+        # /sync: a user's changes after a version
+        Index("ix_change_log_owner_id_version", "owner_id", "version"),
+        # Compaction: later entries for the same entity
+        Index("ix_change_log_entity", "entity", "entity_id", "version"),
+        {"sqlite_autoincrement": True},
+    )
+
+    version = Column(Integer, primary_key=True)
+    owner_id = Column(Integer, nullable=False)
+    # The project itself for project entries. A task moved to another project
+    # is logged under the new one.
+    project_id = Column(Integer)
+    # "project", "task" or "comment"
+    entity = Column(String, nullable=False)
+    entity_id = Column(Integer, nullable=False)
+    deleted = Column(Boolean, nullable=False, default=False)
+    changed_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
+class ChangeLogHorizon(Base):
+    __tablename__ = "change_log_horizon"
+    __table_args__ = (CheckConstraint("id = 1", name="ck_change_log_horizon_single_row"),)
+
+    id = Column(Integer, primary_key=True)
+    # Highest version removed by retention; older `since` values are stale
+    version = Column(Integer, nullable=False, default=0)
+
+
+def _log(entity: str, row: str, deleted: int, owner_query: str) -> str:
+    return (
+        "INSERT INTO change_log (owner_id, project_id, entity, entity_id, deleted) "
+        f"SELECT projects.owner_id, projects.id, '{entity}', {row}.id, {deleted} {owner_query}; "
+    )
+
+
+def _log_project(row: str, deleted: int) -> str:
+    return (
+        "INSERT INTO change_log (owner_id, project_id, entity, entity_id, deleted) "
+        f"VALUES ({row}.owner_id, {row}.id, 'project', {row}.id, {deleted}); "
+    )
+
+
+# Tasks and comments are logged under their project and its owner
+_TASK_OWNER = "FROM projects WHERE id = {row}.project_id"
+_COMMENT_OWNER = (
+    "FROM tasks JOIN projects ON projects.id = tasks.project_id WHERE tasks.id = {row}.task_id"
+)
+
+CHANGE_LOG_TRIGGERS = {
+    "change_log_project_insert":
+        f"AFTER INSERT ON projects BEGIN {_log_project('NEW', 0)}END",
+    "change_log_project_update":
+        f"AFTER UPDATE ON projects BEGIN {_log_project('NEW', 0)}END",
+    "change_log_project_delete":
+        f"AFTER DELETE ON projects BEGIN {_log_project('OLD', 1)}END",
+    "change_log_task_insert":
+        "AFTER INSERT ON tasks BEGIN "
+        f"{_log('task', 'NEW', 0, _TASK_OWNER.format(row='NEW'))}END",
+    # Tasks only move between projects of the same owner
+    "change_log_task_update":
+        "AFTER UPDATE ON tasks BEGIN "
+        f"{_log('task', 'NEW', 0, _TASK_OWNER.format(row='NEW'))}END",
+    "change_log_task_delete":
+        "AFTER DELETE ON tasks BEGIN "
+        f"{_log('task', 'OLD', 1, _TASK_OWNER.format(row='OLD'))}END",
+    "change_log_comment_insert":
+        "AFTER INSERT ON comments BEGIN "
+        f"{_log('comment', 'NEW', 0, _COMMENT_OWNER.format(row='NEW'))}END",
+    "change_log_comment_update":
+        "AFTER UPDATE ON comments BEGIN "
+        f"{_log('comment', 'NEW', 0, _COMMENT_OWNER.format(row='NEW'))}END",
+    "change_log_comment_delete":
+        "AFTER DELETE ON comments BEGIN "
+        f"{_log('comment', 'OLD', 1, _COMMENT_OWNER.format(row='OLD'))}END",
+}
+
+
+def create_change_log_triggers(connection: Connection) -> None:
+    for name, body in CHANGE_LOG_TRIGGERS.items():
+        connection.execute(text(f"CREATE TRIGGER IF NOT EXISTS {name} {body}"))
+
+
+class CompactionResult(NamedTuple):
+    superseded: int
+    expired: int
+    horizon: int
+
+
+def get_horizon(connection: Connection) -> int:
+    return connection.execute(
+        select(func.coalesce(func.max(ChangeLogHorizon.version), 0))
+    ).scalar_one()
+
+
+def compact_change_log(connection: Connection, retention: timedelta) -> CompactionResult:
+    """Drop superseded and expired change log entries; run it in a transaction."""
+    log = ChangeLog.__table__
+    superseded = connection.execute(text(
+        "DELETE FROM change_log WHERE EXISTS ("
+        "SELECT 1 FROM change_log AS later WHERE later.entity = change_log.entity "
+        "AND later.entity_id = change_log.entity_id AND later.owner_id = change_log.owner_id "
+        "AND later.version > change_log.version)"
+    )).rowcount
+
+    cutoff = datetime.now(timezone.utc) - retention
+    last_expired = connection.execute(
+        select(func.max(log.c.version)).where(log.c.changed_at < cutoff)
+    ).scalar_one()
+    expired = 0
+    horizon = get_horizon(connection)
+    if last_expired is not None:
+        expired = connection.execute(
+            log.delete().where(log.c.version <= last_expired)
+        ).rowcount
+        horizon = max(horizon, last_expired)
+        connection.execute(text(
+            "INSERT INTO change_log_horizon (id, version) VALUES (1, :version) "
+            "ON CONFLICT (id) DO UPDATE SET version = excluded.version"
+        ), {"version": horizon})
+    return CompactionResult(superseded, expired, horizon)
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _create_change_log_triggers(target, connection, **kw):
+    if connection.dialect.name == "sqlite":
+        create_change_log_triggers(connection)
@@ -1,5 +1,5 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum, Index, text
+from sqlalchemy.orm import relationship, synonym
 from sqlalchemy.sql import func
 import enum
 
@@ -17,6 +17,22 @@ class TaskPriority(str, enum.Enum):
 
 class Task(Base):
     __tablename__ = "tasks"
+    __table_args__ = (
+        # Ordered / keyset pagination of a project's tasks
+        Index("ix_tasks_project_id_created_at_id", "project_id", "created_at", "id"),
+        # read_tasks status filter within a project, same ordering
+        Index("ix_tasks_project_id_status", "project_id", "status", "created_at", "id"),
+        # Overdue counts for the project stats endpoints. Partial, so the
+        # planner only considers it for queries that filter on due_date
+        Index(
+            "ix_tasks_project_id_due_date", "project_id", "due_date",
+            sqlite_where=text("due_date IS NOT NULL"),
+        ),
+        # Due-date reminders: tasks in (due_date, id) order from a point on
+        Index("ix_tasks_due_date", "due_date", "id", sqlite_where=text("due_date IS NOT NULL")),
+        Index("ix_tasks_assignee_id", "assignee_id", "created_at", "id"),
+        Index("ix_tasks_owner_id", "owner_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, index=True, nullable=False)
@@ -26,10 +42,23 @@ class Task(Base):
     due_date = Column(DateTime(timezone=True), nullable=True)
     project_id = Column(Integer, ForeignKey("projects.id"), nullable=False)
     owner_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    assignee_id = Column(Integer, ForeignKey("users.id"), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    # Row version: detail ETags and If-Match checks
+    version = Column(Integer, nullable=False, server_default="1")
+
+    # API name for the creating user
+    created_by = synonym("owner_id")
+
+    __mapper_args__ = {"version_id_col": version}
 
     # Relationships
-    project = relationship("Project", back_populates="tasks")
-    owner = relationship("User", back_populates="tasks")
+    # Many-to-one sides refuse lazy loads: with the async session they can
+    # only be loaded through an explicit loader option
+    project = relationship("Project", back_populates="tasks", lazy="raise_on_sql")
+    owner = relationship(
+        "User", back_populates="tasks", foreign_keys=[owner_id], lazy="raise_on_sql"
+    )
+    assignee = relationship("User", foreign_keys=[assignee_id], lazy="raise_on_sql")
     comments = relationship("Comment", back_populates="task", cascade="all, delete-orphan")
@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, Column, Integer, String, DateTime
+from sqlalchemy import Boolean, Column, Integer, String, DateTime, event, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -15,8 +15,34 @@ class User(Base):
     is_superuser = Column(Boolean(), default=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    # Bumped on every write to the user's projects or tasks, and when someone
+    # assigned one of their tasks changes their profile; list ETags
+    data_version = Column(Integer, nullable=False, server_default="0")
 
     # Relationships
     projects = relationship("Project", back_populates="owner")
-    tasks = relationship("Task", back_populates="owner")
+    tasks = relationship("Task", back_populates="owner", foreign_keys="Task.owner_id")
     comments = relationship("Comment", back_populates="user")
+
+
+# Tasks embed their assignee, so a profile change must also invalidate the
+# lists (ETags and cached pages) of everyone who has assigned the user a task
+# and the row version (detail ETags) of those tasks, whichever path makes the
+# change. Bumping the version also logs the tasks for /sync
+USER_TRIGGERS = {
+    "users_assignee_profile":
+        "AFTER UPDATE OF email, full_name, is_active ON users "
+        "WHEN OLD.email IS NOT NEW.email OR OLD.full_name IS NOT NEW.full_name "
+        "OR OLD.is_active IS NOT NEW.is_active BEGIN "
+        "UPDATE users SET data_version = data_version + 1 WHERE id IN ("
+        "SELECT projects.owner_id FROM tasks JOIN projects ON projects.id = tasks.project_id "
+        "WHERE tasks.assignee_id = NEW.id); "
+        "UPDATE tasks SET version = version + 1 WHERE assignee_id = NEW.id; END",
+}
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _create_user_triggers(target, connection, **kw):
+    if connection.dialect.name == "sqlite":
+        for name, body in USER_TRIGGERS.items():
+            connection.execute(text(f"CREATE TRIGGER IF NOT EXISTS {name} {body}"))
@@ -1,15 +1,23 @@
-from pydantic import BaseModel
-from typing import Optional, Any, Dict, List, Generic, TypeVar, Type
-from datetime import datetime
+from pydantic import AfterValidator, BaseModel
+from typing import Annotated, Optional, Any, Dict, List, Generic, TypeVar, Type
+from datetime import datetime, timezone
 
 # Generic Type Variable for Pydantic models
 ModelType = TypeVar("ModelType", bound=Any)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 
+def to_naive_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+# Due dates are stored and compared as naive UTC; an offset in the input is
+# converted rather than dropped, and naive input is taken to be UTC already
+UTCDateTime = Annotated[datetime, AfterValidator(to_naive_utc)]
+
 class BaseSchema(BaseModel):
     class Config:
-        orm_mode = True
         from_attributes = True
 
 class Message(BaseModel):
@@ -1,10 +1,7 @@
 from __future__ import annotations
 from pydantic import BaseModel, Field, ConfigDict
 from datetime import datetime
-from typing import Optional, Any, Dict, TypeVar, Type
-
-# For forward references
-ModelT = TypeVar('ModelT', bound=BaseModel)
+from .user import User
 
 class CommentBase(BaseModel):
     content: str = Field(..., min_length=1)
@@ -24,27 +21,10 @@ class CommentInDBBase(CommentBase):
     model_config = ConfigDict(from_attributes=True)
 
 class Comment(CommentInDBBase):
-    # Using string literal for forward reference
-    author: 'dict'  # Will be converted to User in the validator
-    
-    @classmethod
-    def model_validate(
-        cls: Type[ModelT],
-        obj: Any,
-        *,
-        strict: bool | None = None,
-        from_attributes: bool | None = None,
-        context: Dict[str, Any] | None = None
-    ) -> ModelT:
-        # Convert author dict to User model if needed
-        if isinstance(obj, dict) and 'author' in obj and isinstance(obj['author'], dict):
-            from .user import User
-            obj['author'] = User.model_validate(obj['author'])
-        return super().model_validate(obj, strict=strict, from_attributes=from_attributes, context=context)
+    author: User
     
     model_config = ConfigDict(
         from_attributes=True,
-        arbitrary_types_allowed=True,
         json_schema_extra={
             "example": {
                 "id": 1,
@@ -0,0 +1,14 @@
+from pydantic import BaseModel, ConfigDict
+from datetime import datetime
+from typing import Optional
+
+class Notification(BaseModel):
+    id: int
+    # "mention", "due" or "overdue"
+    kind: str
+    actor_id: Optional[int] = None
+    task_id: int
+    comment_id: Optional[int] = None
+    created_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
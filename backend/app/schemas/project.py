@@ -1,7 +1,7 @@
 from pydantic import BaseModel, Field
-from typing import Optional, List
+from typing import Dict, Optional, List
 from datetime import datetime
-from ..models.task import TaskStatus
+from ..models.task import TaskPriority, TaskStatus
 
 class ProjectBase(BaseModel):
     name: str = Field(..., max_length=100)
@@ -30,3 +30,11 @@ class ProjectWithTasks(ProjectInDBBase):
 
 class ProjectInDB(ProjectInDBBase):
     pass
+
+class ProjectStats(BaseModel):
+    project_id: int
+    total: int = 0
+    # Not done and past their due date
+    overdue: int = 0
+    by_status: Dict[TaskStatus, int]
+    by_priority: Dict[TaskPriority, int]
@@ -0,0 +1,21 @@
+from pydantic import BaseModel
+from typing import List
+
+from .comment import Comment
+from .project import Project
+from .task import Task
+
+class SyncDeleted(BaseModel):
+    projects: List[int] = []
+    tasks: List[int] = []
+    comments: List[int] = []
+
+class SyncResult(BaseModel):
+    # Pass as `since` on the next call
+    version: int
+    # More changes are waiting; call again straight away
+    has_more: bool
+    projects: List[Project] = []
+    tasks: List[Task] = []
+    comments: List[Comment] = []
+    deleted: SyncDeleted = SyncDeleted()
@@ -1,16 +1,17 @@
 from __future__ import annotations
 from pydantic import BaseModel, Field, ConfigDict
-from typing import Optional, List
+from typing import ClassVar, Optional, List, Tuple
 from datetime import datetime
-from ..models.task import TaskStatus
+from ..models.task import TaskStatus, TaskPriority
+from .base import UTCDateTime
 from .user import User
 
 class TaskBase(BaseModel):
     title: str = Field(..., max_length=255)
     description: Optional[str] = None
     status: TaskStatus = TaskStatus.TODO
-    priority: Optional[int] = Field(None, ge=1, le=5)
-    due_date: Optional[datetime] = None
+    priority: TaskPriority = TaskPriority.MEDIUM
+    due_date: Optional[UTCDateTime] = None
     project_id: int
     assignee_id: Optional[int] = None
 
@@ -21,10 +22,20 @@ class TaskUpdate(BaseModel):
     title: Optional[str] = Field(None, max_length=255)
     description: Optional[str] = None
     status: Optional[TaskStatus] = None
-    priority: Optional[int] = Field(None, ge=1, le=5)
-    due_date: Optional[datetime] = None
+    priority: Optional[TaskPriority] = None
+    due_date: Optional[UTCDateTime] = None
     assignee_id: Optional[int] = None
 
+    # May be left out of an update, but not set to null
+    NOT_NULL: ClassVar[Tuple[str, ...]] = ("title", "status", "priority")
+
+    def null_fields(self) -> List[str]:
+        """Non-nullable fields the request explicitly set to null."""
+        return [
+            field for field in self.NOT_NULL
+            if field in self.model_fields_set and getattr(self, field) is None
+        ]
+
 class TaskInDBBase(TaskBase):
     id: int
     created_by: int
@@ -37,5 +48,33 @@ class TaskInDBBase(TaskBase):
 class Task(TaskInDBBase):
     assignee: Optional[User] = None
 
+class TaskSearchResult(BaseModel):
+    task: Task
+    # HTML-escaped excerpt with matches wrapped in <mark>
+    snippet: str
+
+class TaskBatchUpdateItem(TaskUpdate):
+    id: int
+
+class TaskBatchCreate(BaseModel):
+    items: List[TaskCreate]
+
+class TaskBatchUpdate(BaseModel):
+    items: List[TaskBatchUpdateItem]
+
+class TaskBatchDelete(BaseModel):
+    ids: List[int]
+
+class TaskBatchItemResult(BaseModel):
+    index: int
+    id: Optional[int] = None
+    status_code: int
+    detail: Optional[str] = None
+
+class TaskBatchResult(BaseModel):
+    succeeded: int
+    failed: int
+    results: List[TaskBatchItemResult]
+
 # Temporarily removed TaskWithComments to resolve circular import
 # Will be re-implemented after fixing the schema dependencies
@@ -0,0 +1,46 @@
+from pydantic import BaseModel, Field, TypeAdapter
+from typing import Annotated, Optional, Union, Literal
+from datetime import datetime
+from ..models.task import TaskStatus, TaskPriority
+from .base import UTCDateTime
+from .project import Project
+
+# One line of a project export. The project line comes first, and each task
+# line is followed by the comments on that task; ids are those of the source
+# database and are only used to tie comments to their task. Assignee and
+# author ids are exported for reference; an import clears assignees and
+# attributes every comment to the importing user.
+
+class ProjectLine(BaseModel):
+    type: Literal["project"] = "project"
+    name: str = Field(..., max_length=100)
+    description: Optional[str] = None
+
+class TaskLine(BaseModel):
+    type: Literal["task"] = "task"
+    id: int
+    title: str = Field(..., max_length=255)
+    description: Optional[str] = None
+    status: TaskStatus = TaskStatus.TODO
+    priority: TaskPriority = TaskPriority.MEDIUM
+    due_date: Optional[UTCDateTime] = None
+    assignee_id: Optional[int] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+class CommentLine(BaseModel):
+    type: Literal["comment"] = "comment"
+    id: int
+    task_id: int
+    user_id: int
+    content: str = Field(..., min_length=1)
+    created_at: Optional[datetime] = None
+
+ExportLine = TypeAdapter(
+    Annotated[Union[ProjectLine, TaskLine, CommentLine], Field(discriminator="type")]
+)
+
+class ProjectImportResult(BaseModel):
+    project: Project
+    tasks: int
+    comments: int
@@ -15,6 +15,9 @@ class UserUpdate(BaseModel):
     password: Optional[str] = Field(None, min_length=8)
 
 class UserInDBBase(UserBase):
+    # Addresses are validated on the way in. Re-checking every nested
+    # assignee/author was most of the cost of serializing a task page.
+    email: str = Field(..., json_schema_extra={"format": "email"})
     id: int
     is_active: bool
     created_at: datetime
@@ -27,6 +30,7 @@ class User(UserInDBBase):
 
 class UserInDB(UserInDBBase):
     hashed_password: str
+    is_superuser: bool = False
 
 class Token(BaseModel):
     access_token: str
@@ -0,0 +1,344 @@
+"""Latency and throughput benchmark for the main API scenarios.
+
+Seeds a throwaway SQLite database, then runs each scenario with
+``--concurrency`` clients until ``--requests`` requests have completed,
+either in-process through httpx's ASGI transport (the default) or against a
+uvicorn worker started on the same database (``--server``). Scenarios:
+
+* ``login``: password login (bcrypt bound, so it runs a tenth of the requests);
+* ``list_tasks``: task lists, alternately unfiltered, filtered by project and
+  status, and paged through with the X-Next-Cursor cursor;
+* ``write_burst``: creating tasks and updating the ones just created;
+* ``comment_thread``: posting to and reading back long comment threads.
+
+Each scenario reports throughput and p50/p95/p99 latency; ``--output``
+writes them as JSON. ``--baseline`` compares against an earlier JSON run and
+exits non-zero if any scenario's p95 rose, or its throughput fell, by more
+than ``--max-regression``. The list cache is off unless ``--cache`` is given,
+so list requests reach the database. Run from the ``backend`` directory:
+
+    python benchmarks/api_latency.py [--server] [--concurrency 20] [--requests 1000]
+        [--scenarios login list_tasks ...] [--output run.json]
+        [--baseline base.json] [--max-regression 0.2]
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+SECRET_KEY = "api-latency-benchmark"
+PASSWORD = "benchmark"
+USERS = 10
+TASKS_PER_USER = 500
+THREAD_COMMENTS = 200
+PAGE_SIZE = 50
+
+
+def setup_database():
+    """USERS users, each with three projects, tasks and one long comment thread.
+
+    Returns a bearer token, a project id and the thread's task id per user.
+    """
+    from datetime import timedelta
+
+    from app.core.database import engine
+    from app.core.schema import create_schema
+    from app.core.security import create_access_token, get_password_hash
+    from app.models import Comment, Project, Task, TaskStatus, User
+
+    create_schema(engine)
+    password = get_password_hash(PASSWORD)
+    statuses = [status.name for status in TaskStatus]
+    with engine.begin() as conn:
+        conn.execute(User.__table__.insert(), [
+            {"id": user, "email": f"user{user}@example.com", "hashed_password": password,
+             "is_active": True, "is_superuser": False}
+            for user in range(1, USERS + 1)
+        ])
+        conn.execute(Project.__table__.insert(), [
+            {"id": (user - 1) * 3 + i, "name": f"Project {i}", "owner_id": user}
+            for user in range(1, USERS + 1) for i in range(1, 4)
+        ])
+        conn.execute(Task.__table__.insert(), [
+            {"id": (user - 1) * TASKS_PER_USER + i, "title": f"Task {i}",
+             "status": statuses[i % len(statuses)], "priority": "MEDIUM",
+             "project_id": (user - 1) * 3 + 1 + i % 3, "owner_id": user}
+            for user in range(1, USERS + 1) for i in range(1, TASKS_PER_USER + 1)
+        ])
+        # Each user's first task carries the thread
+        conn.execute(Comment.__table__.insert(), [
+            {"content": f"Comment {i}", "task_id": (user - 1) * TASKS_PER_USER + 1,
+             "user_id": user}
+            for user in range(1, USERS + 1) for i in range(THREAD_COMMENTS)
+        ])
+    engine.dispose()
+    return [
+        {
+            "id": user,
+            "headers": {"Authorization": "Bearer " + create_access_token(
+                {"sub": f"user{user}@example.com"}, timedelta(hours=1)
+            )},
+            "project_id": (user - 1) * 3 + 1,
+            "thread_task_id": (user - 1) * TASKS_PER_USER + 1,
+        }
+        for user in range(1, USERS + 1)
+    ]
+
+
+async def login(client, user, i):
+    return await client.post(
+        "/api/v1/auth/login",
+        data={"username": f"user{user['id']}@example.com", "password": PASSWORD},
+    )
+
+
+async def list_tasks(client, user, i):
+    kind = i % 3
+    if kind == 0:
+        params = {"limit": PAGE_SIZE}
+    elif kind == 1:
+        params = {"limit": PAGE_SIZE, "project_id": user["project_id"], "status": "todo"}
+    else:
+        # The page after the one the last cursor request ended on
+        params = {"limit": PAGE_SIZE, "order_by": "title"}
+        if user.get("cursor"):
+            params["cursor"] = user["cursor"]
+    response = await client.get("/api/v1/tasks/", params=params, headers=user["headers"])
+    if kind == 2:
+        user["cursor"] = response.headers.get("x-next-cursor")
+    return response
+
+
+async def write_burst(client, user, i):
+    if i % 2 == 0 or not user["created"]:
+        response = await client.post(
+            "/api/v1/tasks/",
+            json={"title": f"Burst {i}", "project_id": user["project_id"]},
+            headers=user["headers"],
+        )
+        if response.status_code == 201:
+            user["created"].append(response.json()["id"])
+        return response
+    return await client.put(
+        f"/api/v1/tasks/{user['created'][-1]}",
+        json={"status": "in_progress", "description": f"Update {i}"},
+        headers=user["headers"],
+    )
+
+
+async def comment_thread(client, user, i):
+    path = f"/api/v1/tasks/{user['thread_task_id']}/comments"
+    if i % 2 == 0:
+        return await client.post(path, json={"content": f"Reply {i}"}, headers=user["headers"])
+    return await client.get(path, params={"limit": PAGE_SIZE}, headers=user["headers"])
+
+
+# name -> (request function, share of --requests it runs)
+SCENARIOS = {
+    "login": (login, 0.1),
+    "list_tasks": (list_tasks, 1.0),
+    "write_burst": (write_burst, 1.0),
+    "comment_thread": (comment_thread, 1.0),
+}
+
+
+def percentile(latencies, p):
+    """Nearest-rank percentile of a sorted list."""
+    return latencies[max(math.ceil(len(latencies) * p / 100) - 1, 0)]
+
+
+async def run_scenario(client, users, request, concurrency, total):
+    latencies = []
+    errors = 0
+    issued = 0
+
+    async def worker(n):
+        nonlocal errors, issued
+        # Clients beyond USERS share a user, but each keeps its own cursor
+        # and created tasks so concurrent updates never collide
+        user = {**users[n % len(users)], "created": []}
+        while issued < total:
+            i = issued
+            issued += 1
+            start = time.perf_counter()
+            try:
+                response = await request(client, user, i)
+                failed = response.status_code >= 400
+            except Exception:
+                failed = True
+            latencies.append(time.perf_counter() - start)
+            errors += failed
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(n) for n in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "concurrency": concurrency,
+        "seconds": round(elapsed, 3),
+        "rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "max_ms": round(latencies[-1] * 1000, 2),
+    }
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(workdir, port):
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port),
+         "--workers", "1", "--log-level", "warning", "--backlog", "4096"],
+        cwd=workdir, env={**os.environ, "PYTHONPATH": BACKEND_DIR},
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return server
+        except OSError:
+            time.sleep(0.1)
+    server.kill()
+    raise SystemExit("uvicorn did not start")
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run(args, users, base_url):
+    import httpx
+
+    if base_url is None:
+        from app.main import app
+
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench")
+    else:
+        limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+        client = httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60)
+    results = {}
+    async with client:
+        # Warm up connection pools and import-time caches
+        await run_scenario(client, users, list_tasks, min(args.concurrency, 10), 50)
+        for name in args.scenarios:
+            request, share = SCENARIOS[name]
+            total = max(int(args.requests * share), args.concurrency)
+            results[name] = result = await run_scenario(client, users, request, args.concurrency, total)
+            print(
+                f"{name:<16} requests={result['requests']:>6}  errors={result['errors']:>4}  "
+                f"rps={result['rps']:>8.1f}  p50={result['p50_ms']:>8.1f}ms  "
+                f"p95={result['p95_ms']:>8.1f}ms  p99={result['p99_ms']:>8.1f}ms"
+            )
+    return results
+
+
+def regressions(results, baseline, max_regression):
+    """Lines describing each scenario that got worse than baseline allows."""
+    found = []
+    for name, result in results.items():
+        base = baseline["scenarios"].get(name)
+        if base is None:
+            continue
+        if result["p95_ms"] > base["p95_ms"] * (1 + max_regression):
+            found.append(f"{name}: p95 {base['p95_ms']:.1f}ms -> {result['p95_ms']:.1f}ms")
+        if result["rps"] < base["rps"] / (1 + max_regression):
+            found.append(f"{name}: rps {base['rps']:.1f} -> {result['rps']:.1f}")
+    return found
+
+
+def main(args):
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    output = os.path.abspath(args.output) if args.output else None
+
+    workdir = tempfile.mkdtemp()
+    # The app resolves ./sql_app.db relative to the working directory
+    os.chdir(workdir)
+    os.environ["SECRET_KEY"] = SECRET_KEY
+    if not args.cache:
+        os.environ["QUERY_CACHE_MAX_ENTRIES"] = "0"
+    users = setup_database()
+
+    server = None
+    base_url = None
+    if args.server:
+        port = free_port()
+        server = start_server(workdir, port)
+        base_url = f"http://127.0.0.1:{port}"
+    try:
+        results = asyncio.run(run(args, users, base_url))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(30)
+
+    report = {
+        "meta": {
+            "target": "uvicorn" if args.server else "asgi",
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "started_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "cache": args.cache,
+        },
+        "scenarios": results,
+    }
+    if output:
+        with open(output, "w") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+
+    failed = any(result["errors"] for result in results.values())
+    if baseline is not None:
+        if baseline["meta"]["target"] != report["meta"]["target"]:
+            print(f"note: baseline ran against {baseline['meta']['target']}, "
+                  f"this run against {report['meta']['target']}")
+        found = regressions(results, baseline, args.max_regression)
+        for line in found:
+            print("REGRESSION", line)
+        print(f"\n{len(found)} regressions against {args.baseline} "
+              f"(threshold {args.max_regression:.0%})")
+        failed = failed or bool(found)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--server", action="store_true",
+                        help="benchmark a uvicorn worker instead of the app in-process")
+    parser.add_argument("--cache", action="store_true", help="leave the list cache on")
+    parser.add_argument("--output", help="write the results here as JSON")
+    parser.add_argument("--baseline", help="JSON from an earlier run to compare against")
+    parser.add_argument("--max-regression", type=float, default=0.2,
+                        help="allowed p95 increase / throughput drop as a fraction")
+    sys.exit(main(parser.parse_args()))
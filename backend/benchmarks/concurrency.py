@@ -0,0 +1,124 @@
+"""Concurrency benchmark for the read endpoints.
+
+Drives the FastAPI app in-process through httpx's ASGI transport against a
+throwaway SQLite database and reports requests/sec at several levels of
+in-flight clients.  With ``--conditional`` clients poll the way the frontend
+does, revalidating with If-None-Match so unchanged lists come back as 304.
+Run from the ``backend`` directory:
+
+    python benchmarks/concurrency.py [--levels 50 200 1000] [--requests 2000] [--conditional]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+ENDPOINTS = ["/api/v1/users/me", "/api/v1/projects/"]
+
+
+def setup_database():
+    """Create a scratch database with one user owning a handful of projects."""
+    from app.core.database import SessionLocal, engine
+    from app.core.schema import create_schema
+    from app.core.security import get_password_hash
+    from app.models import User, Project
+
+    create_schema(engine)
+    db = SessionLocal()
+    try:
+        user = User(
+            email="bench@example.com",
+            hashed_password=get_password_hash("benchmark"),
+            full_name="Benchmark User",
+            is_active=True,
+        )
+        db.add(user)
+        db.commit()
+        db.add_all([
+            Project(name=f"Project {i}", description="benchmark", owner_id=user.id)
+            for i in range(20)
+        ])
+        db.commit()
+    finally:
+        db.close()
+
+
+async def run_level(client, headers, in_flight, total, etags=None):
+    remaining = total
+    latencies = []
+
+    async def worker():
+        nonlocal remaining
+        i = 0
+        while remaining > 0:
+            remaining -= 1
+            url = ENDPOINTS[i % len(ENDPOINTS)]
+            i += 1
+            request_headers = headers
+            if etags is not None and url in etags:
+                request_headers = {**headers, "If-None-Match": etags[url]}
+            start = time.perf_counter()
+            response = await client.get(url, headers=request_headers)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code != 304:
+                response.raise_for_status()
+            if etags is not None and "etag" in response.headers:
+                etags[url] = response.headers["etag"]
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(in_flight)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "in_flight": in_flight,
+        "requests": len(latencies),
+        "rps": len(latencies) / elapsed,
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+    }
+
+
+async def main(levels, total, conditional):
+    import httpx
+    from app.main import app
+
+    setup_database()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        response = await client.post(
+            "/api/v1/auth/login",
+            data={"username": "bench@example.com", "password": "benchmark"},
+        )
+        response.raise_for_status()
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+        # Warm up connection pools and import-time caches
+        etags = {} if conditional else None
+        await run_level(client, headers, 10, 100, etags)
+        for in_flight in levels:
+            result = await run_level(client, headers, in_flight, max(total, in_flight), etags)
+            print(
+                f"in_flight={result['in_flight']:>5}  requests={result['requests']:>6}  "
+                f"rps={result['rps']:>8.1f}  p50={result['p50_ms']:>8.1f}ms  "
+                f"p99={result['p99_ms']:>8.1f}ms"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--levels", type=int, nargs="+", default=[50, 200, 1000])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--conditional", action="store_true",
+                        help="revalidate with If-None-Match instead of refetching")
+    args = parser.parse_args()
+
+    # The app resolves its SQLite files relative to the working directory, so
+    # running inside a scratch directory keeps the benchmark off sql_app.db.
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        asyncio.run(main(args.levels, args.requests, args.conditional))
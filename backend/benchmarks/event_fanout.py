@@ -0,0 +1,216 @@
+"""Load test for ``GET /api/v1/events`` with thousands of idle subscribers.
+
+Starts one uvicorn worker on a throwaway SQLite database, opens
+``--subscribers`` server-sent event streams spread over ``--owners`` users
+(raw sockets, so the client side stays cheap), and reports:
+
+* the worker's resident memory before and after, per open stream;
+* the worker's CPU use while every stream sits idle;
+* for ``--writes`` task updates made through the API, the time from sending
+  the update until the last of that owner's streams has the event.
+
+Run from the ``backend`` directory:
+
+    python benchmarks/event_fanout.py [--subscribers 5000] [--owners 1] [--writes 20]
+"""
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+SECRET_KEY = "event-fanout-benchmark"
+
+
+def setup_database(owners):
+    """One project with one task per owner; returns a bearer token per owner."""
+    from datetime import timedelta
+
+    from app.core.database import engine
+    from app.core.schema import create_schema
+    from app.core.security import create_access_token
+    from app.models import Project, Task, User
+
+    create_schema(engine)
+    with engine.begin() as conn:
+        conn.execute(User.__table__.insert(), [
+            {"id": i, "email": f"user{i}@example.com", "hashed_password": "-",
+             "is_active": True, "is_superuser": False}
+            for i in range(1, owners + 1)
+        ])
+        conn.execute(Project.__table__.insert(), [
+            {"id": i, "name": f"Project {i}", "owner_id": i} for i in range(1, owners + 1)
+        ])
+        conn.execute(Task.__table__.insert(), [
+            {"id": i, "title": f"Task {i}", "status": "TODO", "priority": "MEDIUM",
+             "project_id": i, "owner_id": i}
+            for i in range(1, owners + 1)
+        ])
+    engine.dispose()
+    return {
+        i: create_access_token({"sub": f"user{i}@example.com"}, timedelta(hours=1))
+        for i in range(1, owners + 1)
+    }
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def proc_rss_kib(pid):
+    with open(f"/proc/{pid}/status") as status:
+        for line in status:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    return 0
+
+
+def proc_cpu_seconds(pid):
+    with open(f"/proc/{pid}/stat") as stat:
+        fields = stat.read().rsplit(")", 1)[1].split()
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+
+def start_server(workdir, port):
+    env = {
+        **os.environ,
+        "PYTHONPATH": BACKEND_DIR,
+        "SECRET_KEY": SECRET_KEY,
+        "EVENTS_KEEPALIVE_SECONDS": "15",
+    }
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port),
+         "--workers", "1", "--log-level", "warning", "--backlog", "4096"],
+        cwd=workdir, env=env,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return server
+        except OSError:
+            time.sleep(0.1)
+    server.kill()
+    raise SystemExit("uvicorn did not start")
+
+
+class Subscriber:
+    def __init__(self, owner_id):
+        self.owner_id = owner_id
+        self.received = {}
+        self.ready = asyncio.Event()
+
+    async def run(self, port, token):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(
+            f"GET /api/v1/events HTTP/1.1\r\nHost: localhost\r\n"
+            f"Authorization: Bearer {token}\r\nAccept: text/event-stream\r\n\r\n".encode()
+        )
+        await writer.drain()
+        event_id = None
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    return
+                if line.startswith(b"event: ready"):
+                    self.ready.set()
+                elif line.startswith(b"id: "):
+                    event_id = int(line[4:])
+                elif line.startswith(b"event: change"):
+                    self.received[event_id] = time.perf_counter()
+        finally:
+            writer.close()
+
+
+async def run(args, port, tokens, server_pid):
+    import httpx
+
+    subscribers = [Subscriber(1 + i % args.owners) for i in range(args.subscribers)]
+    tasks = []
+    base_rss = proc_rss_kib(server_pid)
+    start = time.perf_counter()
+    # Connect in waves so the listen backlog never overflows
+    for offset in range(0, len(subscribers), 500):
+        wave = subscribers[offset:offset + 500]
+        tasks += [asyncio.create_task(sub.run(port, tokens[sub.owner_id])) for sub in wave]
+        await asyncio.wait_for(asyncio.gather(*(sub.ready.wait() for sub in wave)), 60)
+    print(f"{len(subscribers)} streams open in {time.perf_counter() - start:.1f}s")
+    rss = proc_rss_kib(server_pid)
+    print(
+        f"worker RSS {base_rss / 1024:.0f} -> {rss / 1024:.0f} MiB, "
+        f"{(rss - base_rss) / len(subscribers):.1f} KiB per stream"
+    )
+
+    cpu = proc_cpu_seconds(server_pid)
+    await asyncio.sleep(args.idle)
+    idle_cpu = (proc_cpu_seconds(server_pid) - cpu) / args.idle
+    print(f"idle worker CPU {idle_cpu * 100:.1f}% over {args.idle:.0f}s")
+
+    latencies = []
+    cpu = proc_cpu_seconds(server_pid)
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}") as client:
+        for i in range(args.writes):
+            owner_id = 1 + i % args.owners
+            audience = [sub for sub in subscribers if sub.owner_id == owner_id]
+            before = [len(sub.received) for sub in audience]
+            sent = time.perf_counter()
+            response = await client.put(
+                f"/api/v1/tasks/{owner_id}",
+                json={"title": f"Task {owner_id} rev {i}"},
+                headers={"Authorization": f"Bearer {tokens[owner_id]}"},
+            )
+            response.raise_for_status()
+            while any(len(sub.received) == count for sub, count in zip(audience, before)):
+                await asyncio.sleep(0.001)
+            last = max(max(sub.received.values()) for sub in audience)
+            latencies.append((last - sent) * 1000)
+    write_cpu = (proc_cpu_seconds(server_pid) - cpu) / args.writes
+    print(
+        f"fan-out to {args.subscribers // args.owners} streams per write: "
+        f"p50 {statistics.median(latencies):.1f} ms, max {max(latencies):.1f} ms, "
+        f"worker CPU {write_cpu * 1000:.0f} ms per write ({args.writes} writes)"
+    )
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def main(args):
+    import resource
+
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+    if hard < args.subscribers * 2 + 100:
+        raise SystemExit(f"open file limit {hard} is too low for {args.subscribers} streams")
+
+    workdir = tempfile.mkdtemp()
+    # The app resolves ./sql_app.db relative to the working directory
+    os.chdir(workdir)
+    os.environ["SECRET_KEY"] = SECRET_KEY
+    tokens = setup_database(args.owners)
+    port = free_port()
+    server = start_server(workdir, port)
+    try:
+        asyncio.run(run(args, port, tokens, server.pid))
+    finally:
+        server.terminate()
+        server.wait(30)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--subscribers", type=int, default=5000)
+    parser.add_argument("--owners", type=int, default=1)
+    parser.add_argument("--writes", type=int, default=20)
+    parser.add_argument("--idle", type=float, default=5.0)
+    main(parser.parse_args())
@@ -0,0 +1,71 @@
+"""Cost of the request metrics middleware.
+
+Runs ``api_latency.py`` in-process with METRICS_ENABLED off and on, in
+alternating rounds so drift in machine load hits both alike, and reports
+each scenario's median throughput and p50/p99 latency per setting and the
+difference. Exits non-zero if metrics cost more than ``--max-overhead`` of
+throughput in any scenario. Run from the ``backend`` directory:
+
+    python benchmarks/metrics_overhead.py [--rounds 3] [--requests 2000] [--max-overhead 0.05]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+SCENARIOS = ["list_tasks", "write_burst", "comment_thread"]
+
+
+def run_once(enabled, args):
+    with tempfile.NamedTemporaryFile(suffix=".json") as output:
+        subprocess.run(
+            [sys.executable, os.path.join(BENCHMARKS_DIR, "api_latency.py"),
+             "--scenarios", *SCENARIOS, "--requests", str(args.requests),
+             "--concurrency", str(args.concurrency), "--output", output.name],
+            env={**os.environ, "METRICS_ENABLED": "true" if enabled else "false"},
+            check=True, stdout=subprocess.DEVNULL,
+        )
+        return json.load(output)["scenarios"]
+
+
+def main(args):
+    runs = {False: [], True: []}
+    for round_ in range(args.rounds):
+        for enabled in (False, True):
+            runs[enabled].append(run_once(enabled, args))
+        print(f"round {round_ + 1}/{args.rounds} done", flush=True)
+
+    worst = 0.0
+    for scenario in SCENARIOS:
+        medians = {
+            enabled: {
+                key: statistics.median(run[scenario][key] for run in runs[enabled])
+                for key in ("rps", "p50_ms", "p99_ms")
+            }
+            for enabled in runs
+        }
+        off, on = medians[False], medians[True]
+        overhead = 1 - on["rps"] / off["rps"]
+        worst = max(worst, overhead)
+        print(
+            f"{scenario:<16} off: rps={off['rps']:>7.1f} p50={off['p50_ms']:>7.1f}ms "
+            f"p99={off['p99_ms']:>7.1f}ms  on: rps={on['rps']:>7.1f} "
+            f"p50={on['p50_ms']:>7.1f}ms p99={on['p99_ms']:>7.1f}ms  "
+            f"throughput cost {overhead:+.1%}"
+        )
+    return 1 if worst > args.max_overhead else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--max-overhead", type=float, default=0.05,
+                        help="largest acceptable throughput loss as a fraction")
+    sys.exit(main(parser.parse_args()))
@@ -0,0 +1,109 @@
+"""Offset vs keyset pagination benchmark.
+
+Seeds a scratch SQLite database with one large project and measures how long
+it takes to fetch a deep page of its tasks with ``skip`` versus ``cursor``,
+using the same statement builder as ``read_tasks``.  Run from ``backend``:
+
+    python benchmarks/pagination.py [--tasks 200000] [--page 1000] [--limit 100]
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+
+def seed(engine, tasks):
+    from app.models import Project, Task, TaskPriority, TaskStatus, User
+
+    start = datetime(2024, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(User.__table__.insert(), [{
+            "id": 1, "email": "bench@example.com", "hashed_password": "x",
+            "is_active": True, "is_superuser": False,
+        }])
+        conn.execute(Project.__table__.insert(), [{"id": 1, "name": "Big", "owner_id": 1}])
+        batch = []
+        for i in range(tasks):
+            batch.append({
+                "title": f"Task {i}",
+                "status": TaskStatus.TODO.name,
+                "priority": TaskPriority.MEDIUM.name,
+                "project_id": 1,
+                "owner_id": 1,
+                # Several tasks per second, as real imports produce
+                "created_at": start + timedelta(seconds=i // 4),
+            })
+            if len(batch) == 10_000:
+                conn.execute(Task.__table__.insert(), batch)
+                batch.clear()
+        if batch:
+            conn.execute(Task.__table__.insert(), batch)
+
+
+def timed(session, stmt, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        rows = session.execute(stmt).all()
+        samples.append(time.perf_counter() - start)
+        session.expunge_all()
+    return statistics.median(samples) * 1000, rows
+
+
+def main(args):
+    from sqlalchemy import create_engine, select
+    from sqlalchemy.orm import Session
+
+    from app.api.pagination import encode_cursor, paginate
+    from app.api.v1.endpoints.tasks import TASK_SORT_COLUMNS
+    from app.core.database import Base
+    from app.models import Task
+
+    engine = create_engine(f"sqlite:///{os.path.join(os.getcwd(), 'bench.db')}")
+    Base.metadata.create_all(bind=engine)
+    print(f"seeding {args.tasks} tasks...")
+    seed(engine, args.tasks)
+
+    base = select(Task).where(Task.project_id == 1)
+    skip = (args.page - 1) * args.limit
+
+    def build(**kwargs):
+        return paginate(
+            base, sort_columns=TASK_SORT_COLUMNS, id_column=Task.id,
+            order_by=args.order_by, limit=args.limit, **kwargs,
+        )
+
+    with Session(engine) as session:
+        # The cursor a client would hold after reading page - 1 pages
+        previous = session.execute(build(cursor=None, skip=skip - 1)).first()
+        cursor = encode_cursor(args.order_by, previous.sort_key, previous[0].id)
+        session.expunge_all()
+
+        first_ms, _ = timed(session, build(cursor=None, skip=0), args.repeat)
+        offset_ms, offset_rows = timed(session, build(cursor=None, skip=skip), args.repeat)
+        keyset_ms, keyset_rows = timed(session, build(cursor=cursor, skip=0), args.repeat)
+
+    assert [r[0].id for r in offset_rows] == [r[0].id for r in keyset_rows]
+    print(f"page 1            : {first_ms:8.2f} ms")
+    print(f"page {args.page} offset  : {offset_ms:8.2f} ms")
+    print(f"page {args.page} keyset  : {keyset_ms:8.2f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=200_000)
+    parser.add_argument("--page", type=int, default=1000)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--order-by", default="created_at")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        main(args)
@@ -0,0 +1,102 @@
+"""Project NDJSON export/import benchmark.
+
+Seeds a scratch SQLite database with one project holding ``--tasks`` tasks
+(and a comment on every tenth task), exports it to a file through
+``app.api.transfer.stream_project_export``, imports that file back in 64 KiB
+chunks through ``import_project_lines``, and reports throughput together
+with the process's peak RSS after each phase.  RSS includes SQLite's page
+cache and memory map, which grow up to SQLITE_CACHE_SIZE_KIB and
+SQLITE_MMAP_SIZE; set both low to see the cost of the transfer itself.  Run
+from the ``backend`` directory:
+
+    python benchmarks/project_transfer.py [--tasks 1000000]
+"""
+import argparse
+import asyncio
+import os
+import resource
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+CHUNK_BYTES = 64 * 1024
+
+
+def peak_rss_mib():
+    # ru_maxrss is in KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def seed(engine, tasks):
+    from app.models import Comment, Project, Task, User
+
+    with engine.begin() as conn:
+        conn.execute(User.__table__.insert(), [
+            {"id": 1, "email": "bench@example.com", "hashed_password": "x",
+             "is_active": True, "is_superuser": False}
+        ])
+        conn.execute(Project.__table__.insert(), [
+            {"id": 1, "name": "Benchmark", "owner_id": 1}
+        ])
+    for start in range(0, tasks, 10_000):
+        stop = min(start + 10_000, tasks)
+        with engine.begin() as conn:
+            conn.execute(Task.__table__.insert(), [
+                {"id": i, "title": f"Task {i}", "description": "benchmark task",
+                 "status": "TODO", "priority": "MEDIUM", "project_id": 1,
+                 "owner_id": 1, "assignee_id": 1}
+                for i in range(start + 1, stop + 1)
+            ])
+            conn.execute(Comment.__table__.insert(), [
+                {"content": f"Comment on {i}", "task_id": i, "user_id": 1}
+                for i in range(start + 1, stop + 1, 10)
+            ])
+
+
+async def file_chunks(path):
+    with open(path, "rb") as source:
+        while chunk := source.read(CHUNK_BYTES):
+            yield chunk
+
+
+async def main(args):
+    from app.api.transfer import import_project_lines, stream_project_export
+    from app.core.database import AsyncSessionLocal, Base, engine
+    from app.models import Project
+
+    Base.metadata.create_all(bind=engine)
+    seed(engine, args.tasks)
+    print(f"seeded {args.tasks} tasks        peak_rss={peak_rss_mib():>7.1f} MiB")
+
+    path = os.path.abspath("export.ndjson")
+    async with AsyncSessionLocal() as db:
+        project = await db.get(Project, 1)
+    start = time.perf_counter()
+    with open(path, "wb") as target:
+        async for chunk in stream_project_export(project):
+            target.write(chunk)
+    elapsed = time.perf_counter() - start
+    size = os.path.getsize(path) / 2**20
+    print(f"export  {elapsed:>7.2f}s  tasks/s={args.tasks / elapsed:>8.0f}  "
+          f"file={size:.1f} MiB  peak_rss={peak_rss_mib():>7.1f} MiB")
+
+    start = time.perf_counter()
+    async with AsyncSessionLocal() as db:
+        result = await import_project_lines(db, 1, file_chunks(path))
+    elapsed = time.perf_counter() - start
+    print(f"import  {elapsed:>7.2f}s  tasks/s={result.tasks / elapsed:>8.0f}  "
+          f"comments={result.comments}  peak_rss={peak_rss_mib():>7.1f} MiB")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    # Keep the benchmark off the checked-in sql_app.db
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        asyncio.run(main(args))
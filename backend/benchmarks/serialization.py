@@ -0,0 +1,118 @@
+"""Response serialization micro-benchmark.
+
+Builds ``--rows`` Task (with assignee) and Comment (with author) ORM objects
+in memory and reports the median microseconds per row to turn a page of them
+into response bytes along each path a list endpoint could take:
+
+* ``jsonable_encoder``: validate, dump to Python, ``jsonable_encoder`` and
+  ``json.dumps`` (what a plain ``JSONResponse`` does with the dump);
+* ``orjson``: validate, dump to JSON-compatible Python, ``orjson.dumps``
+  (``ORJSONResponse``; skipped when orjson is not installed);
+* ``dump_json``: validate and ``TypeAdapter.dump_json`` in pydantic-core,
+  which is what FastAPI does for a ``response_model`` route with the default
+  response class and what the cached list endpoints do.
+
+Run from the ``backend`` directory:
+
+    python benchmarks/serialization.py [--rows 1000] [--repeat 50]
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def build_rows(count):
+    from app.models import Comment, Task, TaskPriority, TaskStatus, User
+
+    now = datetime.now(timezone.utc)
+    users = [
+        User(id=i, email=f"user{i}@example.com", full_name=f"User {i}",
+             is_active=True, created_at=now)
+        for i in range(1, 21)
+    ]
+    tasks = [
+        Task(
+            id=i, title=f"Task {i}", description="benchmark task " * 8,
+            status=list(TaskStatus)[i % 3], priority=TaskPriority.MEDIUM,
+            due_date=now + timedelta(days=i % 30), project_id=1, owner_id=1,
+            assignee_id=users[i % 20].id, assignee=users[i % 20],
+            created_at=now, updated_at=now,
+        )
+        for i in range(1, count + 1)
+    ]
+    comments = [
+        Comment(id=i, content=f"Comment {i} " * 4, task_id=1,
+                user_id=users[i % 20].id, user=users[i % 20], created_at=now)
+        for i in range(1, count + 1)
+    ]
+    return tasks, comments
+
+
+def serializers(adapter):
+    from fastapi.encoders import jsonable_encoder
+
+    def with_jsonable_encoder(rows):
+        data = adapter.dump_python(adapter.validate_python(rows))
+        return json.dumps(jsonable_encoder(data), separators=(",", ":")).encode()
+
+    def with_orjson(rows):
+        data = adapter.dump_python(adapter.validate_python(rows), mode="json")
+        return orjson.dumps(data)
+
+    def with_dump_json(rows):
+        return adapter.dump_json(adapter.validate_python(rows))
+
+    paths = {"jsonable_encoder": with_jsonable_encoder, "dump_json": with_dump_json}
+    if orjson is not None:
+        paths["orjson"] = with_orjson
+    return paths
+
+
+def per_row_us(serialize, rows, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        serialize(rows)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) / len(rows) * 1e6
+
+
+def main(args):
+    from typing import List
+
+    from pydantic import TypeAdapter
+
+    from app.schemas.comment import Comment
+    from app.schemas.task import Task
+
+    tasks, comments = build_rows(args.rows)
+    if orjson is None:
+        print("orjson is not installed; skipping that path")
+    for name, adapter, rows in (
+        ("Task", TypeAdapter(List[Task]), tasks),
+        ("Comment", TypeAdapter(List[Comment]), comments),
+    ):
+        paths = serializers(adapter)
+        sizes = {len(serialize(rows)) for serialize in paths.values()}
+        print(f"{name}: {args.rows} rows, {min(sizes) / 1024:.0f} KiB")
+        for label, serialize in paths.items():
+            print(f"  {label:<17} {per_row_us(serialize, rows, args.repeat):7.2f} us/row")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=50)
+    main(parser.parse_args())
@@ -0,0 +1,190 @@
+"""Worker start-up time: from process spawn to the first response.
+
+Builds a scratch database, then per run starts ``--workers`` single-worker
+uvicorn processes at once (as an autoscaler adding workers would) and times
+each from spawn to its first successful ``GET /``, and then the first
+authenticated request that reads the database. Every run also times a bare
+interpreter start and ``import app.main`` in a fresh interpreter, to split
+the total into interpreter, import and serving start-up. Reports the median
+and worst of each over ``--runs``; ``--output`` writes them as JSON. Run
+from the ``backend`` directory:
+
+    python benchmarks/startup_time.py [--runs 5] [--workers 1] [--output startup.json]
+"""
+import argparse
+import http.client
+import json
+import os
+import platform
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+SECRET_KEY = "startup-benchmark"
+TIMEOUT_SECONDS = 60
+
+IMPORT_SCRIPT = (
+    "import time; start = time.perf_counter(); import app.main; "
+    "print(time.perf_counter() - start)"
+)
+
+
+def setup_database():
+    """One user; returns a bearer token for them."""
+    from datetime import timedelta
+
+    from app.core.database import engine
+    from app.core.schema import create_schema
+    from app.core.security import create_access_token
+    from app.models import User
+
+    create_schema(engine)
+    with engine.begin() as conn:
+        conn.execute(User.__table__.insert(), [
+            {"id": 1, "email": "user1@example.com", "hashed_password": "-",
+             "is_active": True, "is_superuser": False}
+        ])
+    engine.dispose()
+    return create_access_token({"sub": "user1@example.com"}, timedelta(hours=1))
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def get(port, path, headers=None):
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+    try:
+        conn.request("GET", path, headers=headers or {})
+        response = conn.getresponse()
+        response.read()
+        return response.status
+    finally:
+        conn.close()
+
+
+def interpreter_seconds(env):
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", "pass"], env=env, check=True)
+    return time.perf_counter() - start
+
+
+def import_seconds(env):
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORT_SCRIPT], env=env, check=True,
+        capture_output=True, text=True,
+    ).stdout
+    return float(output.strip().splitlines()[-1])
+
+
+def start_workers(count, env):
+    """Start ``count`` uvicorn workers; returns (process, port, spawn time) each."""
+    workers = []
+    for _ in range(count):
+        port = free_port()
+        workers.append((subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port),
+             "--workers", "1", "--log-level", "warning"],
+            env=env,
+        ), port, time.perf_counter()))
+    return workers
+
+
+def first_responses(workers, token):
+    """Seconds from spawn to each worker's first ``GET /``, and the latency
+    of the first authenticated request after it."""
+    pending = {port: (process, spawned) for process, port, spawned in workers}
+    results = []
+    deadline = time.perf_counter() + TIMEOUT_SECONDS
+    while pending:
+        if time.perf_counter() > deadline:
+            raise SystemExit(f"{len(pending)} workers did not answer within {TIMEOUT_SECONDS}s")
+        for port, (process, spawned) in list(pending.items()):
+            if process.poll() is not None:
+                raise SystemExit(f"worker on port {port} exited with {process.returncode}")
+            try:
+                status = get(port, "/")
+            except OSError:
+                continue
+            ready = time.perf_counter()
+            if status != 200:
+                raise SystemExit(f"worker on port {port} answered GET / with {status}")
+            start = time.perf_counter()
+            status = get(port, "/api/v1/users/me", {"Authorization": f"Bearer {token}"})
+            if status != 200:
+                raise SystemExit(f"worker on port {port} answered /users/me with {status}")
+            results.append((ready - spawned, time.perf_counter() - start))
+            del pending[port]
+        time.sleep(0.005)
+    return results
+
+
+def stop_workers(workers):
+    for process, _, _ in workers:
+        process.terminate()
+    for process, _, _ in workers:
+        process.wait(30)
+
+
+def summary(seconds):
+    return {
+        "median_ms": round(statistics.median(seconds) * 1000, 1),
+        "max_ms": round(max(seconds) * 1000, 1),
+    }
+
+
+def main(args):
+    output = os.path.abspath(args.output) if args.output else None
+    workdir = tempfile.mkdtemp()
+    # The app resolves ./sql_app.db relative to the working directory
+    os.chdir(workdir)
+    os.environ["SECRET_KEY"] = SECRET_KEY
+    token = setup_database()
+    env = {**os.environ, "PYTHONPATH": BACKEND_DIR}
+
+    samples = {"interpreter": [], "import": [], "first_response": [], "first_db_request": []}
+    for run in range(args.runs):
+        samples["interpreter"].append(interpreter_seconds(env))
+        samples["import"].append(import_seconds(env))
+        workers = start_workers(args.workers, env)
+        try:
+            for ready, first_request in first_responses(workers, token):
+                samples["first_response"].append(ready)
+                samples["first_db_request"].append(first_request)
+        finally:
+            stop_workers(workers)
+        print(f"run {run + 1}/{args.runs} done", flush=True)
+
+    results = {name: summary(values) for name, values in samples.items()}
+    for name, result in results.items():
+        print(f"{name:<18} median={result['median_ms']:>8.1f}ms  max={result['max_ms']:>8.1f}ms")
+
+    if output:
+        with open(output, "w") as f:
+            json.dump({
+                "meta": {
+                    "python": platform.python_version(),
+                    "runs": args.runs,
+                    "workers": args.workers,
+                },
+                "results": results,
+            }, f, indent=2)
+            f.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=1,
+                        help="workers started at once per run")
+    parser.add_argument("--output", help="write the results here as JSON")
+    sys.exit(main(parser.parse_args()))
@@ -0,0 +1,114 @@
+"""Batch task API throughput benchmark.
+
+Creates, updates and deletes tasks through the ``/api/v1/tasks/batch``
+endpoints in-process against a throwaway SQLite database and reports
+tasks/second for each, next to the per-task ``POST /api/v1/tasks/`` path for
+comparison.  Run from the ``backend`` directory:
+
+    python benchmarks/task_batch.py [--tasks 10000] [--batch-size 1000] [--single 500]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+
+def setup_database():
+    """Create a scratch database with one user owning a few projects."""
+    from app.core.database import SessionLocal, engine
+    from app.core.schema import create_schema
+    from app.core.security import get_password_hash
+    from app.models import User, Project
+
+    create_schema(engine)
+    db = SessionLocal()
+    try:
+        user = User(
+            email="bench@example.com",
+            hashed_password=get_password_hash("benchmark"),
+            full_name="Benchmark User",
+            is_active=True,
+        )
+        db.add(user)
+        db.commit()
+        projects = [Project(name=f"Project {i}", owner_id=user.id) for i in range(10)]
+        db.add_all(projects)
+        db.commit()
+        return user.id, [project.id for project in projects]
+    finally:
+        db.close()
+
+
+def report(label, count, elapsed):
+    print(f"{label:<14} tasks={count:>7}  elapsed={elapsed:>7.3f}s  tasks/s={count / elapsed:>9.0f}")
+
+
+async def send_batches(client, headers, method, key, items, batch_size):
+    start = time.perf_counter()
+    ids = []
+    for offset in range(0, len(items), batch_size):
+        response = await client.request(
+            method, "/api/v1/tasks/batch", headers=headers,
+            json={key: items[offset:offset + batch_size]},
+        )
+        response.raise_for_status()
+        body = response.json()
+        assert body["failed"] == 0, body
+        ids.extend(result["id"] for result in body["results"])
+    return ids, time.perf_counter() - start
+
+
+async def main(args):
+    import httpx
+    from app.main import app
+
+    user_id, project_ids = setup_database()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        response = await client.post(
+            "/api/v1/auth/login",
+            data={"username": "bench@example.com", "password": "benchmark"},
+        )
+        response.raise_for_status()
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+        start = time.perf_counter()
+        for i in range(args.single):
+            response = await client.post("/api/v1/tasks/", headers=headers, json={
+                "title": f"Single {i}", "project_id": project_ids[i % len(project_ids)],
+            })
+            response.raise_for_status()
+        report("single POST", args.single, time.perf_counter() - start)
+
+        items = [
+            {"title": f"Task {i}", "project_id": project_ids[i % len(project_ids)],
+             "assignee_id": user_id if i % 2 else None}
+            for i in range(args.tasks)
+        ]
+        ids, elapsed = await send_batches(client, headers, "POST", "items", items, args.batch_size)
+        report("batch create", len(ids), elapsed)
+
+        updates = [{"id": task_id, "status": "in_progress"} for task_id in ids]
+        _, elapsed = await send_batches(client, headers, "PUT", "items", updates, args.batch_size)
+        report("batch update", len(updates), elapsed)
+
+        _, elapsed = await send_batches(client, headers, "DELETE", "ids", ids, args.batch_size)
+        report("batch delete", len(ids), elapsed)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=10_000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--single", type=int, default=500)
+    args = parser.parse_args()
+
+    # Keep the benchmark off the checked-in sql_app.db
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        asyncio.run(main(args))
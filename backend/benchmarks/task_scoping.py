@@ -0,0 +1,115 @@
+"""Ownership-scoped task query benchmark.
+
+Seeds a scratch SQLite database where one user owns 100 projects holding
+100k tasks in total, then compares the old ``join(Project, owner_id == ...)``
+statement (no join condition on Task.project_id, i.e. tasks x projects) with
+the queries from ``app.api.scoping``.  Run from the ``backend`` directory:
+
+    python benchmarks/task_scoping.py [--projects 100] [--tasks 100000]
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+USER_ID = 1
+
+
+def seed(engine, projects, tasks):
+    from app.models import Project, Task, User
+
+    with engine.begin() as conn:
+        conn.execute(User.__table__.insert(), [
+            {"id": uid, "email": f"user{uid}@example.com", "hashed_password": "x",
+             "is_active": True, "is_superuser": False}
+            for uid in (1, 2)
+        ])
+        conn.execute(Project.__table__.insert(), [
+            {"id": pid, "name": f"Project {pid}", "owner_id": USER_ID}
+            for pid in range(1, projects + 1)
+        ])
+        rows = [
+            {"title": f"Task {i}", "status": "TODO", "priority": "MEDIUM",
+             "project_id": 1 + i % projects, "owner_id": USER_ID,
+             "assignee_id": 1 + i % 2}
+            for i in range(tasks)
+        ]
+        for start in range(0, len(rows), 10_000):
+            conn.execute(Task.__table__.insert(), rows[start:start + 10_000])
+
+
+def timed(session, stmt, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        rows = session.execute(stmt).scalars().all()
+        samples.append(time.perf_counter() - start)
+        session.expunge_all()
+    return statistics.median(samples) * 1000, rows
+
+
+def main(args):
+    from sqlalchemy import create_engine, func, select
+    from sqlalchemy.orm import Session
+
+    from app.api.scoping import scoped_tasks
+    from app.core.database import Base
+    from app.models import Project, Task
+
+    engine = create_engine(f"sqlite:///{os.path.join(os.getcwd(), 'bench.db')}")
+    Base.metadata.create_all(bind=engine)
+    print(f"seeding {args.projects} projects x {args.tasks} tasks...")
+    seed(engine, args.projects, args.tasks)
+
+    def legacy():
+        return select(Task).join(Project, Project.owner_id == USER_ID)
+
+    task_id = args.tasks // 2
+    scenarios = [
+        ("get task by id",
+         legacy().where(Task.id == task_id),
+         scoped_tasks(USER_ID).where(Task.id == task_id)),
+        # read_tasks orders by (created_at, id) for stable pagination
+        ("list, first 100",
+         legacy().order_by(Task.created_at, Task.id).limit(100),
+         scoped_tasks(USER_ID).order_by(Task.created_at, Task.id).limit(100)),
+        ("list, project filter",
+         legacy().where(Task.project_id == 7).order_by(Task.created_at, Task.id).limit(100),
+         scoped_tasks(USER_ID).where(Task.project_id == 7)
+         .order_by(Task.created_at, Task.id).limit(100)),
+    ]
+
+    with Session(engine) as session:
+        legacy_rows = session.execute(
+            select(func.count()).select_from(legacy().subquery())
+        ).scalar_one()
+        scoped_rows = session.execute(
+            select(func.count()).select_from(scoped_tasks(USER_ID).subquery())
+        ).scalar_one()
+        print(f"rows visible to the owner: legacy={legacy_rows}  scoped={scoped_rows}")
+
+        for name, old, new in scenarios:
+            old_ms, old_rows = timed(session, old, args.repeat)
+            new_ms, new_rows = timed(session, new, args.repeat)
+            old_unique = len({t.id for t in old_rows})
+            print(
+                f"{name:<22} legacy {old_ms:8.2f} ms ({len(old_rows)} rows, "
+                f"{old_unique} distinct)   scoped {new_ms:8.2f} ms ({len(new_rows)} rows)"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--projects", type=int, default=100)
+    parser.add_argument("--tasks", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        main(args)
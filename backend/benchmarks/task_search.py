@@ -0,0 +1,112 @@
+"""Task search benchmark: FTS5 index vs. a LIKE scan.
+
+Seeds a scratch SQLite database (created through ``create_all``, so the
+``task_search`` triggers are in place) with one user's tasks and comments
+drawn from a fixed pseudo-word vocabulary, then times the statement behind
+``GET /api/v1/tasks/search`` against the ``title/description LIKE '%term%'``
+query it replaces.  Run from the ``backend`` directory:
+
+    python benchmarks/task_search.py [--tasks 100000] [--repeat 5]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+USER_ID = 1
+PROJECTS = 50
+
+
+def vocabulary(rng, size=5000):
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    return sorted({"".join(rng.choice(letters) for _ in range(rng.randint(4, 9)))
+                   for _ in range(size)})
+
+
+def seed(engine, tasks, rng, words):
+    from app.models import Comment, Project, Task, User
+
+    def sentence(n):
+        return " ".join(rng.choice(words) for _ in range(n))
+
+    with engine.begin() as conn:
+        conn.execute(User.__table__.insert(), [
+            {"id": USER_ID, "email": "bench@example.com", "hashed_password": "x",
+             "is_active": True, "is_superuser": False}
+        ])
+        conn.execute(Project.__table__.insert(), [
+            {"id": pid, "name": f"Project {pid}", "owner_id": USER_ID}
+            for pid in range(1, PROJECTS + 1)
+        ])
+    start = time.perf_counter()
+    for offset in range(0, tasks, 10_000):
+        stop = min(offset + 10_000, tasks)
+        with engine.begin() as conn:
+            conn.execute(Task.__table__.insert(), [
+                {"id": i, "title": sentence(5), "description": sentence(20),
+                 "status": "TODO", "priority": "MEDIUM",
+                 "project_id": 1 + i % PROJECTS, "owner_id": USER_ID}
+                for i in range(offset + 1, stop + 1)
+            ])
+            conn.execute(Comment.__table__.insert(), [
+                {"content": sentence(12), "task_id": i, "user_id": USER_ID}
+                for i in range(offset + 1, stop + 1, 3)
+            ])
+    return time.perf_counter() - start
+
+
+def timed(session, stmt, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        rows = session.execute(stmt).all()
+        samples.append(time.perf_counter() - start)
+        session.expunge_all()
+    return statistics.median(samples) * 1000, len(rows)
+
+
+def main(args):
+    from sqlalchemy import create_engine, or_
+    from sqlalchemy.orm import Session
+
+    from app.api.scoping import scoped_tasks
+    from app.api.search import fts_query, search_tasks_statement
+    from app.core.database import Base
+    from app.models import Task
+
+    rng = random.Random(42)
+    words = vocabulary(rng)
+    engine = create_engine(f"sqlite:///{os.path.join(os.getcwd(), 'bench.db')}")
+    Base.metadata.create_all(bind=engine)
+    elapsed = seed(engine, args.tasks, rng, words)
+    print(f"seeded {args.tasks} tasks in {elapsed:.1f}s (index maintained by triggers)")
+
+    terms = [rng.choice(words) for _ in range(3)] + [rng.choice(words)[:3]]
+    with Session(engine) as session:
+        for term in terms:
+            like = f"%{term}%"
+            legacy = scoped_tasks(USER_ID).where(
+                or_(Task.title.like(like), Task.description.like(like))
+            ).limit(20)
+            search = search_tasks_statement(USER_ID, fts_query(term)).limit(20)
+            like_ms, like_rows = timed(session, legacy, args.repeat)
+            fts_ms, fts_rows = timed(session, search, args.repeat)
+            print(f"q={term!r:<12} LIKE {like_ms:8.2f} ms ({like_rows} rows)   "
+                  f"FTS5 ranked {fts_ms:8.2f} ms ({fts_rows} rows)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        main(args)
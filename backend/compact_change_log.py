@@ -0,0 +1,33 @@
+"""
+Compact the delta sync change log.
+
+Drops entries superseded by a later change to the same entity, then entries
+older than CHANGE_LOG_RETENTION_DAYS (clients that last synced before those
+must re-fetch everything). Run it periodically, e.g. daily from cron:
+
+    python compact_change_log.py
+"""
+import os
+import sys
+from datetime import timedelta
+
+# Add the backend directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.core.config import settings
+from app.core.database import engine
+from app.models.sync import compact_change_log
+
+
+def main():
+    retention = timedelta(days=settings.CHANGE_LOG_RETENTION_DAYS)
+    with engine.begin() as conn:
+        result = compact_change_log(conn, retention)
+    print(
+        f"Removed {result.superseded} superseded and {result.expired} expired entries; "
+        f"clients must have synced past version {result.horizon}."
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,141 +1,289 @@
+"""
+Create the tables and fill them with generated test data.
+
+The defaults give a small demo database. The size options scale it up to
+production-like volumes: every count is a mean, and with --skew above 0 the
+per-user, per-project and per-task counts follow a long-tailed (log-normal)
+distribution around it, so some projects are far bigger than others. The
+same --seed always produces the same data.
+
+Rows go in through Core bulk inserts, committed every --batch-size rows,
+with the secondary indexes and triggers on the big tables dropped for the
+load. Afterwards the indexes and triggers come back and the tables the
+triggers maintain (project counters, search index, change log) are filled
+set-wise. Every user shares one pre-hashed password.
+
+Usage (from the backend directory; DATABASE_URL picks the database):
+    python init_db.py [--users 2] [--projects-per-user 2] [--tasks-per-project 3]
+        [--comments-per-task 1] [--skew 0.0] [--seed 1] [--batch-size 100000]
+
+For example, about 10M tasks:
+    python init_db.py --users 20000 --projects-per-user 5 --tasks-per-project 100 \\
+        --comments-per-task 0.5 --skew 1.0
+"""
+import argparse
 import sys
 import os
+import random
+import time
 from datetime import datetime, timedelta
 
 # Add the backend directory to the Python path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from app.core.database import SessionLocal, engine, Base
+from sqlalchemy import select, text
+
+from app.core.database import engine
+from app.core.schema import create_schema
 from app.models import User, Project, Task, TaskStatus, TaskPriority, Comment
+from app.models.search import rebuild_search_index
 from app.core.security import get_password_hash
 
-def init_db():
-    # Create all database tables
-    Base.metadata.create_all(bind=engine)
-    
-    db = SessionLocal()
-    
-    try:
+PASSWORD = "password123"
+ADMIN_EMAIL = "admin@example.com"
+ADMIN_PASSWORD = "admin123"
+
+# Tables loaded with their secondary indexes and triggers dropped
+BULK_TABLES = [Project.__table__, Task.__table__, Comment.__table__]
+
+STATUS_WEIGHTS = {TaskStatus.TODO: 4, TaskStatus.IN_PROGRESS: 2, TaskStatus.DONE: 4}
+PRIORITY_WEIGHTS = {TaskPriority.LOW: 3, TaskPriority.MEDIUM: 5, TaskPriority.HIGH: 2}
+# Share of tasks with a due date, and with an assignee
+DUE_DATE_SHARE = 0.6
+ASSIGNED_SHARE = 0.5
+
+PROJECT_NAMES = ["Personal Tasks", "Work Projects", "Team Project", "Website", "Mobile App",
+                 "Infrastructure", "Marketing", "Research", "Hiring", "Operations"]
+VERBS = ["Set up", "Implement", "Write", "Review", "Fix", "Refactor", "Test", "Deploy",
+         "Document", "Design", "Plan", "Migrate", "Benchmark", "Clean up", "Update"]
+NOUNS = ["development environment", "user authentication", "API documentation",
+         "login page", "database schema", "CI pipeline", "search", "notifications",
+         "billing", "onboarding flow", "dashboard", "export", "release notes",
+         "error handling", "caching layer", "permissions", "mobile layout"]
+COMMENTS = ["This task is completed!", "I'm working on this now",
+            "Let me know if you need any help", "Blocked on review.",
+            "Can we push the due date?", "Looks good to me.", "Updated the description.",
+            "Moving this to next sprint.", "Found a regression, reopening."]
+
+
+class Generator:
+    """Rows for each table, streamed parent by parent with consecutive ids."""
+
+    def __init__(self, args, now: datetime):
+        self.args = args
+        self.now = now
+        self.rng = random.Random(args.seed)
+        # Weighted picks as lookups in a list with each value repeated by
+        # its weight; random.choices costs more than the rest of a row
+        self.statuses = [s for s, weight in STATUS_WEIGHTS.items() for _ in range(weight)]
+        self.priorities = [p for p, weight in PRIORITY_WEIGHTS.items() for _ in range(weight)]
+        self.task_id = 0
+        self.comment_id = 0
+
+    def count(self, mean: float) -> int:
+        """A child count with the given mean, long-tailed as --skew asks."""
+        if self.args.skew > 0:
+            sigma = self.args.skew
+            mean *= self.rng.lognormvariate(-sigma * sigma / 2, sigma)
+        # Round up or down at random so small means keep their average
+        return int(mean + self.rng.random())
+
+    def pick(self, values):
+        return values[int(self.rng.random() * len(values))]
+
+    def ago(self, days: float) -> datetime:
+        return self.now - timedelta(seconds=self.rng.random() * days * 86400)
+
+    def users(self, hashed_password: str, admin_password: str):
+        for user_id in range(1, self.args.users + 1):
+            yield {
+                "id": user_id, "email": f"user{user_id}@example.com",
+                "hashed_password": hashed_password, "full_name": f"Test User {user_id}",
+                "is_active": True, "is_superuser": False,
+                "created_at": self.ago(730),
+            }
+        yield {
+            "id": self.args.users + 1, "email": ADMIN_EMAIL,
+            "hashed_password": admin_password, "full_name": "Admin User",
+            "is_active": True, "is_superuser": True,
+            "created_at": self.ago(730),
+        }
+
+    def projects(self):
+        """(table, row) pairs for every project and, after each, its tasks and comments."""
+        args = self.args
+        project_id = 0
+        for owner_id in range(1, args.users + 1):
+            # Everyone gets at least one project, so any account can log in
+            # to something
+            projects = self.count(args.projects_per_user)
+            for n in range(max(projects, 1) if args.projects_per_user > 0 else 0):
+                project_id += 1
+                created_at = self.ago(365)
+                yield Project.__table__, {
+                    "id": project_id, "name": PROJECT_NAMES[n % len(PROJECT_NAMES)],
+                    "description": f"Generated project {project_id}",
+                    "owner_id": owner_id, "created_at": created_at,
+                }
+                for _ in range(self.count(args.tasks_per_project)):
+                    yield from self.task(project_id, owner_id, created_at)
+
+    def task(self, project_id: int, owner_id: int, project_created_at: datetime):
+        args, rng, pick = self.args, self.rng, self.pick
+        self.task_id += 1
+        task_id = self.task_id
+        created_at = project_created_at + (self.now - project_created_at) * rng.random()
+        due_date = None
+        if rng.random() < DUE_DATE_SHARE:
+            due_date = self.now + timedelta(days=rng.uniform(-90, 90))
+        assignee_id = None
+        if rng.random() < ASSIGNED_SHARE:
+            assignee_id = rng.randint(1, args.users)
+        yield Task.__table__, {
+            "id": task_id,
+            "title": f"{pick(VERBS)} {pick(NOUNS)}",
+            "description": f"Generated task {task_id}",
+            "status": pick(self.statuses),
+            "priority": pick(self.priorities),
+            "due_date": due_date,
+            "project_id": project_id, "owner_id": owner_id, "assignee_id": assignee_id,
+            "created_at": created_at,
+        }
+        for _ in range(self.count(args.comments_per_task)):
+            self.comment_id += 1
+            yield Comment.__table__, {
+                "id": self.comment_id,
+                "content": pick(COMMENTS),
+                "task_id": task_id,
+                # Mostly the people on the task, sometimes anyone
+                "user_id": pick((owner_id, assignee_id or owner_id, rng.randint(1, args.users))),
+                "created_at": created_at + (self.now - created_at) * rng.random(),
+            }
+
+
+def drop_triggers_and_indexes(conn):
+    """Drop what slows bulk inserts into BULK_TABLES; returns the trigger DDL."""
+    names = [table.name for table in BULK_TABLES]
+    triggers = conn.execute(
+        text(
+            "SELECT name, sql FROM sqlite_master WHERE type = 'trigger' "
+            f"AND tbl_name IN ({', '.join(repr(name) for name in names)})"
+        )
+    ).all()
+    for name, _ in triggers:
+        conn.execute(text(f"DROP TRIGGER {name}"))
+    for table in BULK_TABLES:
+        for index in table.indexes:
+            index.drop(conn, checkfirst=True)
+    return [sql for _, sql in triggers]
+
+
+def restore_triggers_and_indexes(conn, triggers):
+    for table in BULK_TABLES:
+        for index in table.indexes:
+            index.create(conn, checkfirst=True)
+    for sql in triggers:
+        conn.execute(text(sql))
+
+
+def fill_derived_tables(conn):
+    """What the dropped triggers would have written, in one statement each."""
+    conn.execute(text(
+        "INSERT INTO project_task_counts (project_id, status, priority, task_count) "
+        "SELECT project_id, status, priority, count(*) FROM tasks "
+        "GROUP BY project_id, status, priority"
+    ))
+    conn.execute(text(
+        "INSERT INTO change_log (owner_id, project_id, entity, entity_id, deleted) "
+        "SELECT owner_id, id, 'project', id, 0 FROM projects ORDER BY id"
+    ))
+    conn.execute(text(
+        "INSERT INTO change_log (owner_id, project_id, entity, entity_id, deleted) "
+        "SELECT projects.owner_id, projects.id, 'task', tasks.id, 0 "
+        "FROM tasks JOIN projects ON projects.id = tasks.project_id ORDER BY tasks.id"
+    ))
+    conn.execute(text(
+        "INSERT INTO change_log (owner_id, project_id, entity, entity_id, deleted) "
+        "SELECT projects.owner_id, projects.id, 'comment', comments.id, 0 "
+        "FROM comments JOIN tasks ON tasks.id = comments.task_id "
+        "JOIN projects ON projects.id = tasks.project_id ORDER BY comments.id"
+    ))
+    rebuild_search_index(conn)
+
+
+def init_db(args):
+    # Create any missing tables; a new database is stamped with the newest
+    # migration so the app accepts it
+    create_schema(engine)
+
+    with engine.connect() as conn:
         # Check if users already exist
-        if db.query(User).first() is not None:
+        if conn.execute(select(User.id).limit(1)).first() is not None:
             print("Database already initialized. Skipping...")
             return
-        
-        # Create test users
-        user1 = User(
-            email="user1@example.com",
-            hashed_password=get_password_hash("password123"),
-            full_name="Test User 1",
-            is_active=True
-        )
-        
-        user2 = User(
-            email="user2@example.com",
-            hashed_password=get_password_hash("password123"),
-            full_name="Test User 2",
-            is_active=True
-        )
-        
-        admin = User(
-            email="admin@example.com",
-            hashed_password=get_password_hash("admin123"),
-            full_name="Admin User",
-            is_active=True,
-            is_superuser=True
-        )
-        
-        db.add_all([user1, user2, admin])
-        db.commit()
-        
-        # Create projects
-        project1 = Project(
-            name="Personal Tasks",
-            description="My personal tasks and todos",
-            owner_id=user1.id
-        )
-        
-        project2 = Project(
-            name="Work Projects",
-            description="Work-related tasks and projects",
-            owner_id=user1.id
-        )
-        
-        project3 = Project(
-            name="Team Project",
-            description="Collaborative team project",
-            owner_id=user2.id
-        )
-        
-        db.add_all([project1, project2, project3])
-        db.commit()
-        
-        # Create tasks
-        task1 = Task(
-            title="Set up development environment",
-            description="Install and configure all necessary tools",
-            status=TaskStatus.DONE,
-            priority=TaskPriority.HIGH,
-            due_date=datetime.utcnow() - timedelta(days=1),
-            project_id=project1.id,
-            owner_id=user1.id
-        )
-        
-        task2 = Task(
-            title="Implement user authentication",
-            description="Create login and registration endpoints",
-            status=TaskStatus.IN_PROGRESS,
-            priority=TaskPriority.HIGH,
-            due_date=datetime.utcnow() + timedelta(days=2),
-            project_id=project2.id,
-            owner_id=user1.id
-        )
-        
-        task3 = Task(
-            title="Write API documentation",
-            description="Document all API endpoints",
-            status=TaskStatus.TODO,
-            priority=TaskPriority.MEDIUM,
-            due_date=datetime.utcnow() + timedelta(days=5),
-            project_id=project3.id,
-            owner_id=user2.id
-        )
-        
-        db.add_all([task1, task2, task3])
-        db.commit()
-        
-        # Create comments
-        comment1 = Comment(
-            content="This task is completed!",
-            task_id=task1.id,
-            user_id=user1.id
-        )
-        
-        comment2 = Comment(
-            content="I'm working on this now",
-            task_id=task2.id,
-            user_id=user1.id
-        )
-        
-        comment3 = Comment(
-            content="Let me know if you need any help",
-            task_id=task2.id,
-            user_id=user2.id
-        )
-        
-        db.add_all([comment1, comment2, comment3])
-        db.commit()
-        
-        print("Database initialized with test data!")
-        print(f"Test user 1: {user1.email} / password123")
-        print(f"Test user 2: {user2.email} / password123")
-        print(f"Admin user: {admin.email} / admin123")
-        
-    except Exception as e:
-        print(f"Error initializing database: {e}")
-        db.rollback()
-    finally:
-        db.close()
+        if engine.dialect.name == "sqlite":
+            # A crash mid-load leaves a scratch database to delete, not a
+            # corrupt production one
+            conn.exec_driver_sql("PRAGMA synchronous=OFF")
+
+        started = time.monotonic()
+        generator = Generator(args, datetime.utcnow())
+        # One bcrypt hash per password, however many users share it
+        conn.execute(User.__table__.insert(), list(generator.users(
+            get_password_hash(PASSWORD), get_password_hash(ADMIN_PASSWORD)
+        )))
+        conn.commit()
+
+        triggers = drop_triggers_and_indexes(conn) if engine.dialect.name == "sqlite" else None
+        conn.commit()
+
+        buffers = {table: [] for table in BULK_TABLES}
+        loaded = dict.fromkeys(BULK_TABLES, 0)
+
+        def flush():
+            # Parents first, so every batch only refers to rows already in
+            for table in BULK_TABLES:
+                if buffers[table]:
+                    conn.execute(table.insert(), buffers[table])
+                    loaded[table] += len(buffers[table])
+                    buffers[table] = []
+            conn.commit()
+            print("  " + ", ".join(f"{loaded[t]} {t.name}" for t in BULK_TABLES), flush=True)
+
+        pending = 0
+        for table, row in generator.projects():
+            buffers[table].append(row)
+            pending += 1
+            if pending >= args.batch_size:
+                flush()
+                pending = 0
+        flush()
+
+        if triggers is not None:
+            print("Rebuilding indexes, triggers and derived tables...")
+            restore_triggers_and_indexes(conn, triggers)
+            fill_derived_tables(conn)
+            conn.commit()
+
+    print(
+        f"Database initialized with {args.users + 1} users, "
+        + ", ".join(f"{loaded[t]} {t.name}" for t in BULK_TABLES)
+        + f" in {time.monotonic() - started:.1f}s"
+    )
+    print(f"Test users: user1@example.com ... user{args.users}@example.com / {PASSWORD}")
+    print(f"Admin user: {ADMIN_EMAIL} / {ADMIN_PASSWORD}")
+
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", type=int, default=2)
+    parser.add_argument("--projects-per-user", type=float, default=2)
+    parser.add_argument("--tasks-per-project", type=float, default=3)
+    parser.add_argument("--comments-per-task", type=float, default=1)
+    parser.add_argument("--skew", type=float, default=0.0,
+                        help="spread of the per-parent counts (log-normal sigma); 0 for exact means")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--batch-size", type=int, default=100_000,
+                        help="rows per insert batch and transaction")
     print("Initializing database...")
-    init_db()
+    init_db(parser.parse_args())
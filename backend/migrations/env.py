@@ -11,12 +11,17 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 # Import the Base from your models
 from app.core.database import Base
+import app.models  # noqa: F401  (registers every table on Base.metadata)
 from app.core.config import settings
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
 config = context.config
 
+# Migrate the database the app uses; the ini file's URL is only a fallback
+# for tools that read it directly. ConfigParser treats "%" as interpolation.
+config.set_main_option("sqlalchemy.url", settings.DATABASE_URL.replace("%", "%%"))
+
 # Interpret the config file for Python logging.
 # This line sets up loggers basically.
 if config.config_file_name is not None:
@@ -25,6 +30,14 @@ if config.config_file_name is not None:
 # Set the target_metadata to use for migrations
 target_metadata = Base.metadata
 
+
+def include_name(name, type_, parent_names):
+    # The FTS5 task_search index and its shadow tables live outside the
+    # metadata (see app/models/search.py and migration 0004)
+    if type_ == "table" and name.startswith("task_search"):
+        return False
+    return True
+
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode.
 
@@ -40,6 +53,7 @@ def run_migrations_offline() -> None:
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
         render_as_batch=True,  # Add this for SQLite support
+        include_name=include_name,
     )
 
     with context.begin_transaction():
@@ -62,6 +76,7 @@ def run_migrations_online() -> None:
             connection=connection,
             target_metadata=target_metadata,
             render_as_batch=True,  # Add this for SQLite support
+            include_name=include_name,
         )
 
         with context.begin_transaction():
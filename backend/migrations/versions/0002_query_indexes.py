@@ -0,0 +1,53 @@
+"""task assignee and indexes for endpoint query shapes
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 09:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+
+INDEXES = [
+    # read_tasks: project / status / assignee filters, ordered by (created_at, id)
+    ('ix_tasks_project_id_created_at_id', 'tasks', ['project_id', 'created_at', 'id']),
+    ('ix_tasks_project_id_status', 'tasks', ['project_id', 'status', 'created_at', 'id']),
+    ('ix_tasks_assignee_id', 'tasks', ['assignee_id', 'created_at', 'id']),
+    ('ix_tasks_owner_id', 'tasks', ['owner_id']),
+    # read_projects: a user's projects, ordered by (created_at, id)
+    ('ix_projects_owner_id_created_at_id', 'projects', ['owner_id', 'created_at', 'id']),
+    # read_task_comments
+    ('ix_comments_task_id_created_at', 'comments', ['task_id', 'created_at']),
+    ('ix_comments_user_id', 'comments', ['user_id']),
+]
+
+
+def upgrade() -> None:
+    # Tolerate databases already brought up to date by create_all
+    inspector = sa.inspect(op.get_bind())
+    task_columns = {c['name'] for c in inspector.get_columns('tasks')}
+    if 'assignee_id' not in task_columns:
+        with op.batch_alter_table('tasks') as batch_op:
+            batch_op.add_column(sa.Column('assignee_id', sa.Integer(), nullable=True))
+            batch_op.create_foreign_key('fk_tasks_assignee_id_users', 'users', ['assignee_id'], ['id'])
+
+    for name, table, columns in INDEXES:
+        if name not in {i['name'] for i in inspector.get_indexes(table)}:
+            op.create_index(name, table, columns)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
+
+    with op.batch_alter_table('tasks') as batch_op:
+        batch_op.drop_constraint('fk_tasks_assignee_id_users', type_='foreignkey')
+        batch_op.drop_column('assignee_id')
@@ -0,0 +1,40 @@
+"""row versions and per-user data version for ETags
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+
+COLUMNS = [
+    ('projects', 'version', '1'),
+    ('tasks', 'version', '1'),
+    ('users', 'data_version', '0'),
+]
+
+
+def upgrade() -> None:
+    # Tolerate databases already brought up to date by create_all
+    inspector = sa.inspect(op.get_bind())
+    for table, column, default in COLUMNS:
+        if column not in {c['name'] for c in inspector.get_columns(table)}:
+            op.add_column(
+                table,
+                sa.Column(column, sa.Integer(), nullable=False, server_default=default),
+            )
+
+
+def downgrade() -> None:
+    for table, column, _ in reversed(COLUMNS):
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column(column)
@@ -0,0 +1,75 @@
+"""FTS5 task search index
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+
+TASK_COMMENTS = (
+    "(SELECT group_concat(content, char(10)) FROM comments WHERE task_id = {task_id})"
+)
+
+TRIGGERS = {
+    'task_search_task_insert':
+        "AFTER INSERT ON tasks BEGIN "
+        "INSERT INTO task_search (rowid, title, description, comments) "
+        "VALUES (NEW.id, NEW.title, NEW.description, NULL); END",
+    'task_search_task_update':
+        "AFTER UPDATE OF title, description ON tasks BEGIN "
+        "UPDATE task_search SET title = NEW.title, description = NEW.description "
+        "WHERE rowid = NEW.id; END",
+    'task_search_task_delete':
+        "AFTER DELETE ON tasks BEGIN "
+        "DELETE FROM task_search WHERE rowid = OLD.id; END",
+    'task_search_comment_insert':
+        "AFTER INSERT ON comments BEGIN "
+        f"UPDATE task_search SET comments = {TASK_COMMENTS.format(task_id='NEW.task_id')} "
+        "WHERE rowid = NEW.task_id; END",
+    'task_search_comment_update':
+        "AFTER UPDATE OF content, task_id ON comments BEGIN "
+        f"UPDATE task_search SET comments = {TASK_COMMENTS.format(task_id='OLD.task_id')} "
+        "WHERE rowid = OLD.task_id; "
+        f"UPDATE task_search SET comments = {TASK_COMMENTS.format(task_id='NEW.task_id')} "
+        "WHERE rowid = NEW.task_id; END",
+    'task_search_comment_delete':
+        "AFTER DELETE ON comments BEGIN "
+        f"UPDATE task_search SET comments = {TASK_COMMENTS.format(task_id='OLD.task_id')} "
+        "WHERE rowid = OLD.task_id; END",
+}
+
+
+def upgrade() -> None:
+    # FTS5 is SQLite only; other backends simply have no search index
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    op.execute(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS task_search USING fts5("
+        "title, description, comments, "
+        "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
+    )
+    for name, body in TRIGGERS.items():
+        op.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {body}")
+    # Index what is already there (also rebuilds a create_all-made index)
+    op.execute("DELETE FROM task_search")
+    op.execute(
+        "INSERT INTO task_search (rowid, title, description, comments) "
+        f"SELECT id, title, description, {TASK_COMMENTS.format(task_id='tasks.id')} FROM tasks"
+    )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    for name in TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {name}")
+    op.execute("DROP TABLE IF EXISTS task_search")
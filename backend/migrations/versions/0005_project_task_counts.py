@@ -0,0 +1,87 @@
+"""project task counters for dashboard stats
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+
+TASK_STATUS = sa.Enum('TODO', 'IN_PROGRESS', 'DONE', name='taskstatus')
+TASK_PRIORITY = sa.Enum('LOW', 'MEDIUM', 'HIGH', name='taskpriority')
+
+COUNT_UP = (
+    "INSERT INTO project_task_counts (project_id, status, priority, task_count) "
+    "VALUES (NEW.project_id, NEW.status, NEW.priority, 1) "
+    "ON CONFLICT (project_id, status, priority) "
+    "DO UPDATE SET task_count = task_count + 1; "
+)
+COUNT_DOWN = (
+    "UPDATE project_task_counts SET task_count = task_count - 1 "
+    "WHERE project_id = OLD.project_id AND status = OLD.status "
+    "AND priority = OLD.priority; "
+)
+
+TRIGGERS = {
+    'project_task_counts_insert':
+        f"AFTER INSERT ON tasks BEGIN {COUNT_UP}END",
+    'project_task_counts_update':
+        "AFTER UPDATE OF project_id, status, priority ON tasks "
+        "WHEN OLD.project_id IS NOT NEW.project_id OR OLD.status IS NOT NEW.status "
+        f"OR OLD.priority IS NOT NEW.priority BEGIN {COUNT_DOWN}{COUNT_UP}END",
+    'project_task_counts_delete':
+        f"AFTER DELETE ON tasks BEGIN {COUNT_DOWN}END",
+    'project_task_counts_project_delete':
+        "AFTER DELETE ON projects BEGIN "
+        "DELETE FROM project_task_counts WHERE project_id = OLD.id; END",
+}
+
+
+def upgrade() -> None:
+    # Tolerate databases already brought up to date by create_all
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table('project_task_counts'):
+        op.create_table(
+            'project_task_counts',
+            sa.Column('project_id', sa.Integer(), nullable=False),
+            sa.Column('status', TASK_STATUS, nullable=False),
+            sa.Column('priority', TASK_PRIORITY, nullable=False),
+            sa.Column('task_count', sa.Integer(), nullable=False),
+            sa.ForeignKeyConstraint(['project_id'], ['projects.id']),
+            sa.PrimaryKeyConstraint('project_id', 'status', 'priority'),
+        )
+    if 'ix_tasks_project_id_due_date' not in {i['name'] for i in inspector.get_indexes('tasks')}:
+        op.create_index(
+            'ix_tasks_project_id_due_date', 'tasks', ['project_id', 'due_date'],
+            sqlite_where=sa.text('due_date IS NOT NULL'),
+        )
+
+    # The counters are maintained by SQLite triggers; elsewhere they stay
+    # empty until reconcile_project_stats.py is run
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    for name, body in TRIGGERS.items():
+        op.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {body}")
+    op.execute("DELETE FROM project_task_counts")
+    op.execute(
+        "INSERT INTO project_task_counts (project_id, status, priority, task_count) "
+        "SELECT project_id, status, priority, count(*) FROM tasks "
+        "GROUP BY project_id, status, priority"
+    )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == 'sqlite':
+        for name in TRIGGERS:
+            op.execute(f"DROP TRIGGER IF EXISTS {name}")
+    op.drop_index('ix_tasks_project_id_due_date', table_name='tasks')
+    op.drop_table('project_task_counts')
@@ -0,0 +1,121 @@
+"""change log for delta sync
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+
+def log(entity, row, deleted, owner_query):
+    return (
+        "INSERT INTO change_log (owner_id, entity, entity_id, deleted) "
+        f"SELECT projects.owner_id, '{entity}', {row}.id, {deleted} {owner_query}; "
+    )
+
+
+def log_project(row, deleted):
+    return (
+        "INSERT INTO change_log (owner_id, entity, entity_id, deleted) "
+        f"VALUES ({row}.owner_id, 'project', {row}.id, {deleted}); "
+    )
+
+
+TASK_OWNER = "FROM projects WHERE id = {row}.project_id"
+COMMENT_OWNER = (
+    "FROM tasks JOIN projects ON projects.id = tasks.project_id WHERE tasks.id = {row}.task_id"
+)
+
+TRIGGERS = {
+    'change_log_project_insert':
+        f"AFTER INSERT ON projects BEGIN {log_project('NEW', 0)}END",
+    'change_log_project_update':
+        f"AFTER UPDATE ON projects BEGIN {log_project('NEW', 0)}END",
+    'change_log_project_delete':
+        f"AFTER DELETE ON projects BEGIN {log_project('OLD', 1)}END",
+    'change_log_task_insert':
+        f"AFTER INSERT ON tasks BEGIN {log('task', 'NEW', 0, TASK_OWNER.format(row='NEW'))}END",
+    'change_log_task_update':
+        f"AFTER UPDATE ON tasks BEGIN {log('task', 'NEW', 0, TASK_OWNER.format(row='NEW'))}END",
+    'change_log_task_delete':
+        f"AFTER DELETE ON tasks BEGIN {log('task', 'OLD', 1, TASK_OWNER.format(row='OLD'))}END",
+    'change_log_comment_insert':
+        "AFTER INSERT ON comments BEGIN "
+        f"{log('comment', 'NEW', 0, COMMENT_OWNER.format(row='NEW'))}END",
+    'change_log_comment_update':
+        "AFTER UPDATE ON comments BEGIN "
+        f"{log('comment', 'NEW', 0, COMMENT_OWNER.format(row='NEW'))}END",
+    'change_log_comment_delete':
+        "AFTER DELETE ON comments BEGIN "
+        f"{log('comment', 'OLD', 1, COMMENT_OWNER.format(row='OLD'))}END",
+}
+
+
+def upgrade() -> None:
+    # Tolerate databases already brought up to date by create_all
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table('change_log'):
+        op.create_table(
+            'change_log',
+            sa.Column('version', sa.Integer(), nullable=False),
+            sa.Column('owner_id', sa.Integer(), nullable=False),
+            sa.Column('entity', sa.String(), nullable=False),
+            sa.Column('entity_id', sa.Integer(), nullable=False),
+            sa.Column('deleted', sa.Boolean(), nullable=False),
+            sa.Column('changed_at', sa.DateTime(timezone=True),
+                      server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+            sa.PrimaryKeyConstraint('version'),
+            sqlite_autoincrement=True,
+        )
+        op.create_index('ix_change_log_owner_id_version', 'change_log', ['owner_id', 'version'])
+        op.create_index('ix_change_log_entity', 'change_log', ['entity', 'entity_id', 'version'])
+    if not inspector.has_table('change_log_horizon'):
+        op.create_table(
+            'change_log_horizon',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('version', sa.Integer(), nullable=False),
+            sa.CheckConstraint('id = 1', name='ck_change_log_horizon_single_row'),
+            sa.PrimaryKeyConstraint('id'),
+        )
+
+    # The log is written by SQLite triggers
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    for name, body in TRIGGERS.items():
+        op.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {body}")
+    # Log what is already there, so since=0 returns the full current state
+    op.execute("DELETE FROM change_log")
+    op.execute(
+        "INSERT INTO change_log (owner_id, entity, entity_id, deleted) "
+        "SELECT owner_id, 'project', id, 0 FROM projects ORDER BY id"
+    )
+    op.execute(
+        "INSERT INTO change_log (owner_id, entity, entity_id, deleted) "
+        "SELECT projects.owner_id, 'task', tasks.id, 0 FROM tasks "
+        "JOIN projects ON projects.id = tasks.project_id ORDER BY tasks.id"
+    )
+    op.execute(
+        "INSERT INTO change_log (owner_id, entity, entity_id, deleted) "
+        "SELECT projects.owner_id, 'comment', comments.id, 0 FROM comments "
+        "JOIN tasks ON tasks.id = comments.task_id "
+        "JOIN projects ON projects.id = tasks.project_id ORDER BY comments.id"
+    )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == 'sqlite':
+        for name in TRIGGERS:
+            op.execute(f"DROP TRIGGER IF EXISTS {name}")
+    op.drop_table('change_log_horizon')
+    op.drop_index('ix_change_log_entity', table_name='change_log')
+    op.drop_index('ix_change_log_owner_id_version', table_name='change_log')
+    op.drop_table('change_log')
@@ -0,0 +1,125 @@
+"""change log project id for the event stream
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 20:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0007'
+down_revision = '0006'
+branch_labels = None
+depends_on = None
+
+
+def log(entity, row, deleted, owner_query, with_project):
+    if with_project:
+        return (
+            "INSERT INTO change_log (owner_id, project_id, entity, entity_id, deleted) "
+            f"SELECT projects.owner_id, projects.id, '{entity}', {row}.id, {deleted} {owner_query}; "
+        )
+    return (
+        "INSERT INTO change_log (owner_id, entity, entity_id, deleted) "
+        f"SELECT projects.owner_id, '{entity}', {row}.id, {deleted} {owner_query}; "
+    )
+
+
+def log_project(row, deleted, with_project):
+    if with_project:
+        return (
+            "INSERT INTO change_log (owner_id, project_id, entity, entity_id, deleted) "
+            f"VALUES ({row}.owner_id, {row}.id, 'project', {row}.id, {deleted}); "
+        )
+    return (
+        "INSERT INTO change_log (owner_id, entity, entity_id, deleted) "
+        f"VALUES ({row}.owner_id, 'project', {row}.id, {deleted}); "
+    )
+
+
+TASK_OWNER = "FROM projects WHERE id = {row}.project_id"
+COMMENT_OWNER = (
+    "FROM tasks JOIN projects ON projects.id = tasks.project_id WHERE tasks.id = {row}.task_id"
+)
+
+
+def triggers(with_project):
+    return {
+        'change_log_project_insert':
+            f"AFTER INSERT ON projects BEGIN {log_project('NEW', 0, with_project)}END",
+        'change_log_project_update':
+            f"AFTER UPDATE ON projects BEGIN {log_project('NEW', 0, with_project)}END",
+        'change_log_project_delete':
+            f"AFTER DELETE ON projects BEGIN {log_project('OLD', 1, with_project)}END",
+        'change_log_task_insert':
+            "AFTER INSERT ON tasks BEGIN "
+            f"{log('task', 'NEW', 0, TASK_OWNER.format(row='NEW'), with_project)}END",
+        'change_log_task_update':
+            "AFTER UPDATE ON tasks BEGIN "
+            f"{log('task', 'NEW', 0, TASK_OWNER.format(row='NEW'), with_project)}END",
+        'change_log_task_delete':
+            "AFTER DELETE ON tasks BEGIN "
+            f"{log('task', 'OLD', 1, TASK_OWNER.format(row='OLD'), with_project)}END",
+        'change_log_comment_insert':
+            "AFTER INSERT ON comments BEGIN "
+            f"{log('comment', 'NEW', 0, COMMENT_OWNER.format(row='NEW'), with_project)}END",
+        'change_log_comment_update':
+            "AFTER UPDATE ON comments BEGIN "
+            f"{log('comment', 'NEW', 0, COMMENT_OWNER.format(row='NEW'), with_project)}END",
+        'change_log_comment_delete':
+            "AFTER DELETE ON comments BEGIN "
+            f"{log('comment', 'OLD', 1, COMMENT_OWNER.format(row='OLD'), with_project)}END",
+    }
+
+
+def drop_triggers():
+    for name in triggers(with_project=True):
+        op.execute(f"DROP TRIGGER IF EXISTS {name}")
+
+
+def create_triggers(with_project):
+    for name, body in triggers(with_project).items():
+        op.execute(f"CREATE TRIGGER {name} {body}")
+
+
+def upgrade() -> None:
+    # Tolerate databases already brought up to date by create_all
+    columns = {column['name'] for column in sa.inspect(op.get_bind()).get_columns('change_log')}
+    if 'project_id' not in columns:
+        op.add_column('change_log', sa.Column('project_id', sa.Integer(), nullable=True))
+
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    drop_triggers()
+    create_triggers(with_project=True)
+    # Entries of deleted tasks and comments keep a NULL project
+    op.execute(
+        "UPDATE change_log SET project_id = entity_id "
+        "WHERE entity = 'project' AND project_id IS NULL"
+    )
+    op.execute(
+        "UPDATE change_log SET project_id = "
+        "(SELECT project_id FROM tasks WHERE tasks.id = change_log.entity_id) "
+        "WHERE entity = 'task' AND project_id IS NULL"
+    )
+    op.execute(
+        "UPDATE change_log SET project_id = "
+        "(SELECT tasks.project_id FROM comments JOIN tasks ON tasks.id = comments.task_id "
+        "WHERE comments.id = change_log.entity_id) "
+        "WHERE entity = 'comment' AND project_id IS NULL"
+    )
+
+
+def downgrade() -> None:
+    sqlite = op.get_bind().dialect.name == 'sqlite'
+    # The batch rebuild renames change_log, which the triggers refer to
+    if sqlite:
+        drop_triggers()
+    # Reflection does not carry AUTOINCREMENT over to the rebuilt table
+    with op.batch_alter_table('change_log', table_kwargs={'sqlite_autoincrement': True}) as batch_op:
+        batch_op.drop_column('project_id')
+    if sqlite:
+        create_triggers(with_project=False)
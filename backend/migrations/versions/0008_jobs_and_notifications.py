@@ -0,0 +1,79 @@
+"""background jobs and notifications
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18 21:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0008'
+down_revision = '0007'
+branch_labels = None
+depends_on = None
+
+
+JOB_STATUS = sa.Enum('PENDING', 'RUNNING', 'FAILED', name='jobstatus')
+
+TRIGGERS = {
+    'notifications_comment_delete':
+        "AFTER DELETE ON comments BEGIN "
+        "DELETE FROM notifications WHERE comment_id = OLD.id; END",
+}
+
+
+def upgrade() -> None:
+    # Tolerate databases already brought up to date by create_all
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table('jobs'):
+        op.create_table(
+            'jobs',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('kind', sa.String(), nullable=False),
+            sa.Column('payload', sa.JSON(), nullable=False),
+            sa.Column('status', JOB_STATUS, nullable=False),
+            sa.Column('attempts', sa.Integer(), nullable=False),
+            sa.Column('run_at', sa.DateTime(timezone=True), nullable=False),
+            sa.Column('last_error', sa.Text(), nullable=True),
+            sa.Column('created_at', sa.DateTime(timezone=True),
+                      server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+            sa.PrimaryKeyConstraint('id'),
+        )
+        op.create_index(
+            'ix_jobs_run_at', 'jobs', ['run_at'],
+            sqlite_where=sa.text("status != 'FAILED'"),
+        )
+    if not inspector.has_table('notifications'):
+        op.create_table(
+            'notifications',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('user_id', sa.Integer(), nullable=False),
+            sa.Column('kind', sa.String(), nullable=False),
+            sa.Column('actor_id', sa.Integer(), nullable=False),
+            sa.Column('task_id', sa.Integer(), nullable=False),
+            sa.Column('comment_id', sa.Integer(), nullable=False),
+            sa.Column('created_at', sa.DateTime(timezone=True),
+                      server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+            sa.ForeignKeyConstraint(['actor_id'], ['users.id']),
+            sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('comment_id', 'user_id', 'kind', name='uq_notifications_comment_user'),
+        )
+        op.create_index('ix_notifications_user_id_id', 'notifications', ['user_id', 'id'])
+
+    if op.get_bind().dialect.name == 'sqlite':
+        for name, body in TRIGGERS.items():
+            op.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {body}")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == 'sqlite':
+        for name in TRIGGERS:
+            op.execute(f"DROP TRIGGER IF EXISTS {name}")
+    op.drop_index('ix_notifications_user_id_id', table_name='notifications')
+    op.drop_table('notifications')
+    op.drop_index('ix_jobs_run_at', table_name='jobs')
+    op.drop_table('jobs')
@@ -0,0 +1,80 @@
+"""due-date reminders
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18 22:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0009'
+down_revision = '0008'
+branch_labels = None
+depends_on = None
+
+
+COMMENT_TRIGGER = (
+    'notifications_comment_delete',
+    "AFTER DELETE ON comments BEGIN "
+    "DELETE FROM notifications WHERE comment_id = OLD.id; END",
+)
+TASK_TRIGGER = (
+    'notifications_task_delete',
+    "AFTER DELETE ON tasks BEGIN "
+    "DELETE FROM notifications WHERE task_id = OLD.id; END",
+)
+
+
+def upgrade() -> None:
+    # Tolerate databases already brought up to date by create_all
+    inspector = sa.inspect(op.get_bind())
+    sqlite = op.get_bind().dialect.name == 'sqlite'
+    if not inspector.has_table('reminder_watermark'):
+        op.create_table(
+            'reminder_watermark',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('due_date', sa.DateTime(timezone=True), nullable=False),
+            sa.Column('task_id', sa.Integer(), nullable=False),
+            sa.Column('version', sa.Integer(), nullable=False),
+            sa.CheckConstraint('id = 1', name='ck_reminder_watermark_single_row'),
+            sa.PrimaryKeyConstraint('id'),
+        )
+    if 'ix_tasks_due_date' not in {i['name'] for i in inspector.get_indexes('tasks')}:
+        op.create_index(
+            'ix_tasks_due_date', 'tasks', ['due_date', 'id'],
+            sqlite_where=sa.text('due_date IS NOT NULL'),
+        )
+
+    # Reminders have no comment and no actor
+    columns = {column['name']: column for column in inspector.get_columns('notifications')}
+    if not columns['comment_id']['nullable']:
+        # The batch rebuild renames notifications, which the trigger refers to
+        if sqlite:
+            op.execute(f"DROP TRIGGER IF EXISTS {COMMENT_TRIGGER[0]}")
+        with op.batch_alter_table('notifications') as batch_op:
+            batch_op.alter_column('comment_id', existing_type=sa.Integer(), nullable=True)
+            batch_op.alter_column('actor_id', existing_type=sa.Integer(), nullable=True)
+    if 'ix_notifications_task_id' not in {i['name'] for i in inspector.get_indexes('notifications')}:
+        op.create_index('ix_notifications_task_id', 'notifications', ['task_id'])
+    if sqlite:
+        for name, body in (COMMENT_TRIGGER, TASK_TRIGGER):
+            op.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {body}")
+
+
+def downgrade() -> None:
+    sqlite = op.get_bind().dialect.name == 'sqlite'
+    if sqlite:
+        op.execute(f"DROP TRIGGER IF EXISTS {TASK_TRIGGER[0]}")
+        op.execute(f"DROP TRIGGER IF EXISTS {COMMENT_TRIGGER[0]}")
+    op.drop_index('ix_notifications_task_id', table_name='notifications')
+    op.execute("DELETE FROM notifications WHERE comment_id IS NULL OR actor_id IS NULL")
+    with op.batch_alter_table('notifications') as batch_op:
+        batch_op.alter_column('comment_id', existing_type=sa.Integer(), nullable=False)
+        batch_op.alter_column('actor_id', existing_type=sa.Integer(), nullable=False)
+    if sqlite:
+        op.execute(f"CREATE TRIGGER IF NOT EXISTS {COMMENT_TRIGGER[0]} {COMMENT_TRIGGER[1]}")
+    op.drop_index('ix_tasks_due_date', table_name='tasks')
+    op.drop_table('reminder_watermark')
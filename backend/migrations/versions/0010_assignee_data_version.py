@@ -0,0 +1,37 @@
+"""assignee profile changes bump data_version and task versions
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0010'
+down_revision = '0009'
+branch_labels = None
+depends_on = None
+
+
+TRIGGER = (
+    'users_assignee_profile',
+    "AFTER UPDATE OF email, full_name, is_active ON users "
+    "WHEN OLD.email IS NOT NEW.email OR OLD.full_name IS NOT NEW.full_name "
+    "OR OLD.is_active IS NOT NEW.is_active BEGIN "
+    "UPDATE users SET data_version = data_version + 1 WHERE id IN ("
+    "SELECT projects.owner_id FROM tasks JOIN projects ON projects.id = tasks.project_id "
+    "WHERE tasks.assignee_id = NEW.id); "
+    "UPDATE tasks SET version = version + 1 WHERE assignee_id = NEW.id; END",
+)
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == 'sqlite':
+        op.execute(f"CREATE TRIGGER IF NOT EXISTS {TRIGGER[0]} {TRIGGER[1]}")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == 'sqlite':
+        op.execute(f"DROP TRIGGER IF EXISTS {TRIGGER[0]}")
@@ -0,0 +1,57 @@
+"""comment search triggers skip deferred tasks
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-20 10:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0011'
+down_revision = '0010'
+branch_labels = None
+depends_on = None
+
+
+TASK_COMMENTS = (
+    "(SELECT group_concat(content, char(10)) FROM comments WHERE task_id = {task_id})"
+)
+NOT_DEFERRED = (
+    "WHEN NOT EXISTS (SELECT 1 FROM task_search_deferred WHERE task_id = {task_id}) "
+)
+
+
+def _comment_triggers(when: str) -> dict:
+    return {
+        'task_search_comment_insert':
+            f"AFTER INSERT ON comments {when.format(task_id='NEW.task_id')}BEGIN "
+            f"UPDATE task_search SET comments = {TASK_COMMENTS.format(task_id='NEW.task_id')} "
+            "WHERE rowid = NEW.task_id; END",
+        'task_search_comment_delete':
+            f"AFTER DELETE ON comments {when.format(task_id='OLD.task_id')}BEGIN "
+            f"UPDATE task_search SET comments = {TASK_COMMENTS.format(task_id='OLD.task_id')} "
+            "WHERE rowid = OLD.task_id; END",
+    }
+
+
+def _replace_triggers(triggers: dict) -> None:
+    for name, body in triggers.items():
+        op.execute(f"DROP TRIGGER IF EXISTS {name}")
+        op.execute(f"CREATE TRIGGER {name} {body}")
+
+
+def upgrade() -> None:
+    # The search index only exists on SQLite
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    op.execute("CREATE TABLE IF NOT EXISTS task_search_deferred (task_id INTEGER PRIMARY KEY)")
+    _replace_triggers(_comment_triggers(NOT_DEFERRED))
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    _replace_triggers(_comment_triggers(""))
+    op.execute("DROP TABLE IF EXISTS task_search_deferred")
@@ -0,0 +1,30 @@
+"""
+Create (if missing) and repopulate the FTS5 task search index.
+
+Run after restoring or bulk-loading a database outside the API, or on a
+database whose index predates migration 0004:
+
+    python rebuild_search_index.py
+"""
+import os
+import sys
+
+# Add the backend directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.core.database import engine
+from app.models.search import create_search_index, rebuild_search_index
+
+
+def main():
+    if engine.dialect.name != "sqlite":
+        print("The task search index needs SQLite FTS5; nothing to do.")
+        return
+    with engine.begin() as conn:
+        create_search_index(conn)
+        count = rebuild_search_index(conn)
+    print(f"Indexed {count} tasks.")
+
+
+if __name__ == "__main__":
+    main()
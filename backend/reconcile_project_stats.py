@@ -0,0 +1,36 @@
+"""
+Recompute the project task counters and report any drift.
+
+The counters are kept in step with tasks by triggers, so drift means rows
+were written with the triggers missing (a database restored from before
+migration 0005, or one edited by hand). Exits with status 1 if any counter
+had to be corrected, so it can run as a scheduled check:
+
+    python reconcile_project_stats.py
+"""
+import os
+import sys
+
+# Add the backend directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.core.database import engine
+from app.models.stats import create_stats_triggers, reconcile_project_task_counts
+
+
+def main() -> int:
+    with engine.begin() as conn:
+        if engine.dialect.name == "sqlite":
+            create_stats_triggers(conn)
+        drift = reconcile_project_task_counts(conn)
+    for d in drift:
+        print(
+            f"project {d.project_id} {d.status.value}/{d.priority.value}: "
+            f"stored {d.stored}, actual {d.actual}"
+        )
+    print(f"{len(drift)} counters corrected.")
+    return 1 if drift else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,112 @@
+"""
+Shared fixtures.
+
+The settings are pointed at a scratch database before anything imports the
+app. It is migrated to head once per session, and every test starts from a
+fresh copy of that with empty in-process caches. Run from the ``backend``
+directory:
+
+    pytest
+"""
+import os
+import shutil
+import sys
+import tempfile
+from datetime import timedelta
+from typing import Callable, Dict, List
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+WORKDIR = tempfile.mkdtemp()
+DATABASE = os.path.join(WORKDIR, "sql_app.db")
+TEMPLATE = os.path.join(WORKDIR, "template.db")
+
+os.environ.update({
+    "DATABASE_URL": f"sqlite:///{DATABASE}",
+    "SECRET_KEY": "test-secret",
+    "BCRYPT_ROUNDS": "4",
+    "QUERY_COUNT_HEADER": "true",
+    # Nothing in the background touches the database behind a test's back
+    "JOB_WORKERS": "0",
+    "REMINDERS_ENABLED": "false",
+})
+
+
+@pytest.fixture(scope="session")
+def template_database() -> str:
+    from alembic import command
+    from alembic.config import Config
+
+    # No ini file, so the migrations leave logging alone; env.py takes the
+    # URL from the settings
+    config = Config()
+    config.set_main_option("script_location", os.path.join(BACKEND_DIR, "migrations"))
+    command.upgrade(config, "head")
+    shutil.copy(DATABASE, TEMPLATE)
+    return TEMPLATE
+
+
+@pytest.fixture(autouse=True)
+def database(template_database):
+    from app.api.query_cache import query_cache
+    from app.core.database import get_engine
+    from app.core.security import principal_cache
+
+    get_engine().dispose()
+    for suffix in ("-wal", "-shm"):
+        if os.path.exists(DATABASE + suffix):
+            os.remove(DATABASE + suffix)
+    shutil.copy(template_database, DATABASE)
+    principal_cache.clear()
+    query_cache.clear()
+    yield DATABASE
+
+
+@pytest.fixture
+def engine():
+    from app.core.database import get_engine
+
+    return get_engine()
+
+
+@pytest.fixture
+def client():
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture
+def make_users(engine) -> Callable[..., List[int]]:
+    """Insert users by id, as user<id>@example.com; columns apply to each."""
+    from app.models import User
+
+    def make(*ids: int, **columns) -> List[int]:
+        with engine.begin() as conn:
+            conn.execute(User.__table__.insert(), [
+                {"id": i, "email": f"user{i}@example.com", "full_name": f"User {i}",
+                 "hashed_password": "-", "is_active": True, "is_superuser": False,
+                 **columns}
+                for i in ids
+            ])
+        return list(ids)
+
+    return make
+
+
+@pytest.fixture
+def auth_headers() -> Callable[[str], Dict[str, str]]:
+    """Bearer headers for a user's email, without a bcrypt login."""
+    from app.core.security import create_access_token
+
+    def headers(email: str) -> Dict[str, str]:
+        token = create_access_token({"sub": email}, timedelta(hours=1))
+        return {"Authorization": f"Bearer {token}"}
+
+    return headers
@@ -0,0 +1,64 @@
+"""Due dates are stored as naive UTC, whatever offset they come in with."""
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import select
+
+from app.models import Task
+
+EAST, WEST = timezone(timedelta(hours=5)), timezone(timedelta(hours=-5))
+DUE = datetime(2030, 1, 1, 12, 0)
+
+
+@pytest.fixture
+def project(client, make_users, auth_headers):
+    """A project of user 1; returns the user's headers and the project id."""
+    make_users(1)
+    headers = auth_headers("user1@example.com")
+    project = client.post("/api/v1/projects/", json={"name": "Project"}, headers=headers)
+    return headers, project.json()["id"]
+
+
+def stored_due_dates(engine):
+    with engine.connect() as conn:
+        return conn.execute(select(Task.due_date).order_by(Task.id)).scalars().all()
+
+
+def test_offsets_are_converted_on_every_write_path(client, engine, project):
+    headers, project_id = project
+    east = DUE.replace(tzinfo=timezone.utc).astimezone(EAST).isoformat()
+    west = DUE.replace(tzinfo=timezone.utc).astimezone(WEST).isoformat()
+
+    task = client.post("/api/v1/tasks/", json={
+        "title": "Single", "project_id": project_id, "due_date": east,
+    }, headers=headers).json()
+    client.post("/api/v1/tasks/batch", json={"items": [
+        {"title": "Batch", "project_id": project_id, "due_date": west},
+    ]}, headers=headers).raise_for_status()
+    client.post("/api/v1/projects/import", content="\n".join(json.dumps(line) for line in (
+        {"type": "project", "name": "Imported"},
+        {"type": "task", "id": 1, "title": "Imported", "due_date": east},
+    )), headers={**headers, "Content-Type": "application/x-ndjson"}).raise_for_status()
+    assert stored_due_dates(engine) == [DUE] * 3
+
+    client.put(f"/api/v1/tasks/{task['id']}", json={
+        "due_date": (DUE + timedelta(days=1)).replace(tzinfo=timezone.utc).astimezone(WEST).isoformat(),
+    }, headers=headers).raise_for_status()
+    assert stored_due_dates(engine)[0] == DUE + timedelta(days=1)
+    assert client.get(f"/api/v1/tasks/{task['id']}", headers=headers).json()["due_date"] == "2030-01-02T12:00:00"
+
+
+def test_overdue_counts_in_utc(client, project):
+    headers, project_id = project
+    now = datetime.now(timezone.utc)
+    # Read as wall-clock time, both would be in the future
+    client.post("/api/v1/tasks/batch", json={"items": [
+        {"title": "Overdue", "project_id": project_id,
+         "due_date": (now - timedelta(hours=1)).astimezone(EAST).isoformat()},
+        {"title": "Not yet", "project_id": project_id,
+         "due_date": (now + timedelta(hours=1)).astimezone(EAST).isoformat()},
+    ]}, headers=headers).raise_for_status()
+
+    stats = client.get(f"/api/v1/projects/{project_id}/stats", headers=headers).json()
+    assert (stats["total"], stats["overdue"]) == (2, 1)
@@ -0,0 +1,59 @@
+"""Conditional requests and cached pages of the task list."""
+import pytest
+
+
+@pytest.fixture
+def assigned_task(client, make_users, auth_headers):
+    """User 1 owns a task assigned to user 2; returns both users' headers."""
+    make_users(1, 2)
+    owner, assignee = auth_headers("user1@example.com"), auth_headers("user2@example.com")
+    project = client.post("/api/v1/projects/", json={"name": "Project"}, headers=owner)
+    client.post(
+        "/api/v1/tasks/",
+        json={"title": "Task", "project_id": project.json()["id"], "assignee_id": 2},
+        headers=owner,
+    ).raise_for_status()
+    return owner, assignee
+
+
+def test_unchanged_list_is_not_modified(client, assigned_task):
+    owner, _ = assigned_task
+    etag = client.get("/api/v1/tasks/", headers=owner).headers["etag"]
+    response = client.get("/api/v1/tasks/", headers={**owner, "If-None-Match": etag})
+    assert response.status_code == 304
+
+
+def test_assignee_profile_change_invalidates_list_etag(client, assigned_task):
+    owner, assignee = assigned_task
+    etag = client.get("/api/v1/tasks/", headers=owner).headers["etag"]
+    client.put("/api/v1/users/me", json={"full_name": "Renamed"}, headers=assignee).raise_for_status()
+
+    response = client.get("/api/v1/tasks/", headers={**owner, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert response.json()[0]["assignee"]["full_name"] == "Renamed"
+
+
+def test_assignee_profile_change_misses_the_list_cache(client, assigned_task):
+    from app.api.query_cache import query_cache
+
+    owner, assignee = assigned_task
+    client.get("/api/v1/tasks/", headers=owner).raise_for_status()
+    cached = len(query_cache)
+    client.put("/api/v1/users/me", json={"full_name": "Renamed"}, headers=assignee).raise_for_status()
+
+    response = client.get("/api/v1/tasks/", headers=owner)
+    assert response.json()[0]["assignee"]["full_name"] == "Renamed"
+    assert len(query_cache) == cached + 1
+
+
+def test_assignee_profile_change_invalidates_task_etag(client, assigned_task):
+    owner, assignee = assigned_task
+    task = client.get("/api/v1/tasks/", headers=owner).json()[0]
+    etag = client.get(f"/api/v1/tasks/{task['id']}", headers=owner).headers["etag"]
+    client.put("/api/v1/users/me", json={"full_name": "Renamed"}, headers=assignee).raise_for_status()
+
+    response = client.get(f"/api/v1/tasks/{task['id']}", headers={**owner, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert response.json()["assignee"]["full_name"] == "Renamed"
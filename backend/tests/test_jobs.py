@@ -0,0 +1,87 @@
+"""Claiming jobs from the durable queue."""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import event, update
+
+from app.core.database import async_engine
+from app.core.jobs import JobWorkerPool
+from app.models.job import Job, JobStatus
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest_asyncio.fixture(autouse=True)
+async def statements(database):
+    """The SQL the async engine sends during the test."""
+    sent = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        sent.append(statement.split(None, 1)[0].upper())
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", record)
+    yield sent
+    event.remove(async_engine.sync_engine, "before_cursor_execute", record)
+    # Pooled aiosqlite connections belong to this test's event loop
+    await async_engine.dispose()
+
+
+def add_job(engine, **values):
+    with engine.begin() as conn:
+        conn.execute(Job.__table__.insert(), [{
+            "kind": "test", "payload": {}, "status": JobStatus.PENDING,
+            "run_at": datetime.now(timezone.utc) - timedelta(seconds=1), **values,
+        }])
+
+
+async def test_empty_queue_only_reads(statements):
+    assert await JobWorkerPool()._claim() is None
+    assert statements == ["SELECT"]
+
+
+async def test_job_is_claimed_once(engine, statements):
+    add_job(engine)
+    add_job(engine, run_at=datetime.now(timezone.utc) + timedelta(hours=1))
+    first, second = JobWorkerPool(), JobWorkerPool()
+
+    job = await first._claim()
+    assert (job.id, job.attempts) == (1, 1)
+    assert await second._claim() is None
+    assert "UPDATE" in statements
+
+
+async def test_expired_lease_is_claimed_again(engine):
+    add_job(engine)
+    pool = JobWorkerPool()
+    assert (await pool._claim()).attempts == 1
+
+    with engine.begin() as conn:
+        conn.execute(update(Job).values(run_at=datetime.now(timezone.utc) - timedelta(seconds=1)))
+    job = await pool._claim()
+    assert (job.id, job.attempts) == (1, 2)
+    with engine.connect() as conn:
+        assert conn.execute(Job.__table__.select()).first().status == JobStatus.RUNNING
+
+
+async def test_candidate_claimed_by_another_worker_is_skipped(engine):
+    add_job(engine)
+    add_job(engine)
+    raced = []
+
+    def claim_first(conn, cursor, statement, parameters, context, executemany):
+        # Another worker gets to job 1 between this worker's look and claim
+        if raced:
+            return
+        raced.append(statement)
+        with engine.begin() as other:
+            other.execute(update(Job).where(Job.id == 1).values(
+                status=JobStatus.RUNNING, run_at=datetime.now(timezone.utc) + timedelta(hours=1),
+            ))
+
+    event.listen(async_engine.sync_engine, "after_cursor_execute", claim_first)
+    try:
+        job = await JobWorkerPool()._claim()
+    finally:
+        event.remove(async_engine.sync_engine, "after_cursor_execute", claim_first)
+    assert (job.id, job.attempts) == (2, 1)
@@ -0,0 +1,43 @@
+"""Cached principals are dropped once a change to the user has committed."""
+import pytest
+import pytest_asyncio
+from sqlalchemy import select
+
+from app.core.database import AsyncSessionLocal, async_engine
+from app.core.security import principal_cache
+from app.models import User
+
+pytestmark = pytest.mark.asyncio
+
+EMAIL = "user1@example.com"
+
+
+@pytest_asyncio.fixture(autouse=True)
+async def cached(database, make_users):
+    make_users(1)
+    principal_cache.set(EMAIL, "cached")
+    yield
+    # Pooled aiosqlite connections belong to this test's event loop
+    await async_engine.dispose()
+
+
+async def deactivate(db):
+    user = await db.scalar(select(User).where(User.email == EMAIL))
+    user.is_active = False
+    await db.flush()
+
+
+async def test_evicted_after_commit_not_at_flush():
+    async with AsyncSessionLocal() as db:
+        await deactivate(db)
+        assert principal_cache.get(EMAIL) == "cached"
+        await db.commit()
+    assert principal_cache.get(EMAIL) is None
+
+
+async def test_rolled_back_change_evicts_nothing():
+    async with AsyncSessionLocal() as db:
+        await deactivate(db)
+        await db.rollback()
+        await db.commit()
+    assert principal_cache.get(EMAIL) == "cached"
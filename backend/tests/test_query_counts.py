@@ -0,0 +1,95 @@
+"""
+A read endpoint's SQL statement count must not grow with the size of its page.
+
+The database has a different assignee for every task and a different author
+for every comment. Each list endpoint is requested with a small and a large
+page and the X-Query-Count header read back; each endpoint has a fixed
+statement budget, and the small and the large page must need the same number
+of statements: a lazy load per row shows up as a difference even while it
+stays under the budget. The list cache is emptied before every request so
+each one reaches the database.
+"""
+import pytest
+
+USERS = 120
+TASKS = 200
+COMMENTS = 100
+
+SMALL, LARGE = 2, 100
+
+# (path, query params, statement budget, extra statements the large page may
+# need). The page size goes in "limit"; paths without one are run as they
+# are, on a small and a large fixture.
+ENDPOINTS = [
+    ("/api/v1/projects/", {}, 2, 0),
+    ("/api/v1/projects/stats", {}, 3, 0),
+    ("/api/v1/projects/1/stats", {}, 3, 0),
+    ("/api/v1/tasks/", {}, 3, 0),
+    ("/api/v1/tasks/", {"project_id": 1}, 3, 0),
+    ("/api/v1/tasks/", {"project_id": 1, "status": "todo"}, 3, 0),
+    ("/api/v1/tasks/", {"fields": "title,status,due_date"}, 2, 0),
+    ("/api/v1/tasks/", {"fields": "title,assignee"}, 3, 0),
+    ("/api/v1/tasks/search", {"q": "task"}, 2, 0),
+    ("/api/v1/tasks/{task_id}", {}, 1, 0),
+    ("/api/v1/tasks/{task_id}/comments", {}, 2, 0),
+    ("/api/v1/tasks/{task_id}/comments", {"fields": "content"}, 2, 0),
+    # Horizon, log page, then one query per entity kind on the page: the
+    # small page holds one kind, the large one all three
+    ("/api/v1/sync", {"since": 0}, 6, 2),
+]
+
+
+@pytest.fixture
+def seeded(engine, make_users):
+    from app.models import Comment, Project, Task, TaskStatus
+
+    statuses = list(TaskStatus)
+    make_users(*range(1, USERS + 1))
+    with engine.begin() as conn:
+        conn.execute(Project.__table__.insert(), [
+            {"id": i, "name": f"Project {i}", "owner_id": 1} for i in range(1, 4)
+        ])
+        conn.execute(Task.__table__.insert(), [
+            {"id": i, "title": f"Task {i}", "status": statuses[i % 3].name,
+             "priority": "MEDIUM", "project_id": 1 + i % 3, "owner_id": 1,
+             "assignee_id": 1 + i % USERS}
+            for i in range(1, TASKS + 1)
+        ])
+        # Task 1 gets one comment, task 2 a long thread by different authors
+        conn.execute(Comment.__table__.insert(), [
+            {"content": "First", "task_id": 1, "user_id": 2},
+        ] + [
+            {"content": f"Comment {i}", "task_id": 2, "user_id": 1 + i % USERS}
+            for i in range(COMMENTS)
+        ])
+
+
+def statement_count(client, headers, path, params):
+    from app.api.query_cache import query_cache
+
+    query_cache.clear()
+    response = client.get(path, params=params, headers=headers)
+    response.raise_for_status()
+    body = response.json()
+    return int(response.headers["x-query-count"]), len(body) if isinstance(body, list) else 1
+
+
+@pytest.mark.parametrize(
+    "path,params,budget,spread", ENDPOINTS,
+    ids=[f"{path} {params or ''}".strip() for path, params, _, _ in ENDPOINTS],
+)
+def test_statement_count(seeded, client, auth_headers, path, params, budget, spread):
+    headers = auth_headers("user1@example.com")
+    # Fill the principal cache so authentication costs no statements
+    client.get("/api/v1/users/me", headers=headers).raise_for_status()
+
+    if "{task_id}" in path:
+        runs = [(path.format(task_id=1), params), (path.format(task_id=2), params)]
+    else:
+        runs = [(path, {**params, "limit": size}) for size in (SMALL, LARGE)]
+    (small, small_rows), (large, large_rows) = [
+        statement_count(client, headers, run, run_params) for run, run_params in runs
+    ]
+    counts = f"{small} statements for {small_rows} rows, {large} for {large_rows}"
+    assert max(small, large) <= budget, f"{counts} (budget {budget})"
+    assert small <= large <= small + spread, f"{counts} (allowed difference {spread})"
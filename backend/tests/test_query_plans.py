@@ -0,0 +1,123 @@
+"""
+No query issued by the API endpoints may make SQLite scan a table.
+
+Exercises every read endpoint through the app while recording the SQL it
+executes, then runs EXPLAIN QUERY PLAN on each distinct statement. Any plan
+step of the form "SCAN <table>" (a full pass over the table or one of its
+indexes, as opposed to an index SEARCH) is a regression.
+"""
+import re
+import sqlite3
+
+import pytest
+from sqlalchemy import event
+
+# SQLite reports every unconstrained pass as SCAN, whether over the table
+# itself or over all entries of one of its indexes
+FULL_SCAN = re.compile(r"^SCAN (\w+)( USING (COVERING )?INDEX \w+)?$")
+# One-row tables read at start-up (the schema check's migration revision)
+SINGLE_ROW_TABLES = {"alembic_version"}
+
+# (method, path, query params) for every read path the frontend uses, as
+# user 2: project 1 and the tasks in it (30, 60, ...) are theirs
+REQUESTS = [
+    ("GET", "/api/v1/users/me", {}),
+    ("GET", "/api/v1/users/me/notifications", {}),
+    ("GET", "/api/v1/users/me/notifications", {"before": 10}),
+    ("GET", "/api/v1/projects/", {}),
+    ("GET", "/api/v1/projects/", {"order_by": "name"}),
+    ("GET", "/api/v1/projects/", {"skip": 2, "limit": 2}),
+    ("GET", "/api/v1/projects/1", {}),
+    ("GET", "/api/v1/projects/1/export", {}),
+    ("GET", "/api/v1/projects/1/stats", {}),
+    ("GET", "/api/v1/projects/stats", {}),
+    ("GET", "/api/v1/tasks/", {}),
+    ("GET", "/api/v1/tasks/", {"project_id": 1}),
+    ("GET", "/api/v1/tasks/", {"project_id": 1, "status": "todo"}),
+    ("GET", "/api/v1/tasks/", {"assignee_id": 2}),
+    ("GET", "/api/v1/tasks/", {"project_id": 1, "limit": 5}),
+    ("GET", "/api/v1/tasks/", {"fields": "title,status,due_date"}),
+    ("GET", "/api/v1/tasks/30", {}),
+    ("GET", "/api/v1/tasks/30/comments", {}),
+    ("GET", "/api/v1/tasks/search", {"q": "task"}),
+    ("GET", "/api/v1/tasks/search", {"q": "task", "project_id": 1}),
+    ("GET", "/api/v1/sync", {}),
+    ("GET", "/api/v1/sync", {"since": 500}),
+]
+
+
+@pytest.fixture
+def seeded(engine, make_users):
+    from app.models import Comment, Project, Task, TaskStatus
+
+    make_users(1, 2, 3)
+    with engine.begin() as conn:
+        conn.execute(Project.__table__.insert(), [
+            {"id": i, "name": f"Project {i}", "owner_id": 1 + i % 3}
+            for i in range(1, 31)
+        ])
+        statuses = list(TaskStatus)
+        conn.execute(Task.__table__.insert(), [
+            {"id": i, "title": f"Task {i}", "status": statuses[i % 3].name,
+             "priority": "MEDIUM", "project_id": 1 + i % 30, "owner_id": 1,
+             "assignee_id": 1 + i % 3}
+            for i in range(1, 601)
+        ])
+        conn.execute(Comment.__table__.insert(), [
+            {"content": f"Comment {i}", "task_id": 1 + i % 600, "user_id": 1 + i % 3}
+            for i in range(1, 1201)
+        ])
+
+
+@pytest.fixture
+def statements(seeded, auth_headers):
+    from fastapi.testclient import TestClient
+
+    from app.core.database import async_engine
+    from app.main import app
+
+    statements = {}
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.setdefault(statement, parameters)
+
+    headers = auth_headers("user2@example.com")
+    event.listen(async_engine.sync_engine, "before_cursor_execute", record)
+    try:
+        with TestClient(app, raise_server_exceptions=False) as client:
+            def request(method, path, params):
+                response = client.request(method, path, params=params, headers=headers)
+                # An error response skips the queries meant to be checked
+                assert response.status_code < 400, (path, params, response.status_code)
+                return response
+
+            for method, path, params in REQUESTS:
+                request(method, path, params)
+                # Follow one cursor so the keyset predicate is covered too
+                cursor = None
+                if path.endswith("/") and not params:
+                    cursor = request(method, path, {"limit": 2}).headers.get("x-next-cursor")
+                if cursor:
+                    request(method, path, {"limit": 2, "cursor": cursor})
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", record)
+    return statements
+
+
+def test_no_full_table_scans(statements, database):
+    conn = sqlite3.connect(database)
+    scanning = []
+    try:
+        for statement, parameters in statements.items():
+            plan = [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {statement}", parameters)]
+            scans = [
+                step for step in plan
+                if (match := FULL_SCAN.match(step)) and match.group(1) not in SINGLE_ROW_TABLES
+            ]
+            if scans:
+                scanning.append(f"{' '.join(statement.split())[:160]}: {', '.join(scans)}")
+    finally:
+        conn.close()
+    assert len(statements) > len(REQUESTS)
+    assert not scanning, "\n".join(scanning)
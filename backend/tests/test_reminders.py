@@ -0,0 +1,223 @@
+"""
+Due-date reminders go out once, at the right time, across clock jumps and
+restarts.
+
+``ReminderScheduler.tick`` is driven with a fake clock and a sink that
+records what it is given, so no test waits on the real time.
+"""
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import insert, select, update
+
+from app.api.reminders import ReminderScheduler, notify_due_tasks
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, async_engine
+from app.models import Notification, Project, Task
+
+pytestmark = pytest.mark.asyncio
+
+START = datetime(2030, 1, 1, 9, 0)
+
+
+class Clock:
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, **kwargs):
+        self.now += timedelta(**kwargs)
+
+
+class Recorder:
+    """A sink that remembers (task id, overdue) for everything sent.
+
+    It keeps nothing in the transaction, so it also sees batches that are
+    rolled back; exactly-once is checked against notifications instead.
+    """
+
+    def __init__(self):
+        self.sent = []
+
+    async def __call__(self, db, due):
+        self.sent.extend((task.task_id, task.overdue) for task in due)
+
+    def take(self):
+        sent, self.sent = self.sent, []
+        return sent
+
+
+@pytest_asyncio.fixture(autouse=True)
+async def seeded(database, engine, make_users):
+    make_users(1, 2)
+    with engine.begin() as conn:
+        conn.execute(Project.__table__.insert(), [{"id": 1, "name": "Project", "owner_id": 1}])
+    yield
+    # Pooled aiosqlite connections belong to this test's event loop
+    await async_engine.dispose()
+
+
+async def add_task(task_id, due_date, status="TODO", assignee_id=None):
+    async with AsyncSessionLocal() as db:
+        await db.execute(insert(Task), [{
+            "id": task_id, "title": f"Task {task_id}", "status": status, "priority": "MEDIUM",
+            "project_id": 1, "owner_id": 1, "assignee_id": assignee_id, "due_date": due_date,
+        }])
+        await db.commit()
+
+
+async def set_due_date(task_id, due_date):
+    async with AsyncSessionLocal() as db:
+        await db.execute(update(Task).where(Task.id == task_id).values(due_date=due_date))
+        await db.commit()
+
+
+async def test_fires_once():
+    clock, sink = Clock(START), Recorder()
+    scheduler = ReminderScheduler(sink, clock)
+    await scheduler.tick()
+    await add_task(1, START + timedelta(minutes=5))
+    scheduler.touch(1)
+    await scheduler.tick()
+    assert sink.take() == []
+    assert scheduler.next_delay() == min(300, settings.REMINDER_MAX_SLEEP_SECONDS)
+    clock.advance(minutes=5)
+    await scheduler.tick()
+    assert sink.take() == [(1, False)]
+    await scheduler.tick()
+    assert sink.take() == []
+
+
+async def test_forward_jump():
+    clock, sink = Clock(START), Recorder()
+    scheduler = ReminderScheduler(sink, clock)
+    for task_id in range(1, 4):
+        await add_task(task_id, START + timedelta(hours=task_id))
+    await scheduler.tick()
+    clock.advance(hours=5)
+    await scheduler.tick()
+    await scheduler.tick()
+    assert sink.take() == [(1, True), (2, True), (3, True)]
+
+
+async def test_backward_jump():
+    clock, sink = Clock(START), Recorder()
+    scheduler = ReminderScheduler(sink, clock)
+    await add_task(1, START + timedelta(minutes=1))
+    await add_task(2, START + timedelta(minutes=10))
+    await scheduler.tick()
+    clock.advance(minutes=2)
+    await scheduler.tick()
+    assert sink.take() == [(1, False)]
+    clock.advance(minutes=-30)
+    await scheduler.tick()
+    assert sink.take() == []
+    clock.advance(minutes=38)
+    await scheduler.tick()
+    assert sink.take() == [(2, False)]
+
+
+async def test_restart():
+    clock, sink = Clock(START), Recorder()
+    await add_task(1, START + timedelta(minutes=1))
+    await add_task(2, START + timedelta(minutes=10))
+    first = ReminderScheduler(sink, clock)
+    await first.tick()
+    clock.advance(minutes=2)
+    await first.tick()
+    assert sink.take() == [(1, False)]
+    # Down for an hour; a new process starts from the stored watermark
+    clock.advance(hours=1)
+    second = ReminderScheduler(sink, clock)
+    await second.tick()
+    assert sink.take() == [(2, True)]
+
+
+async def test_first_run_skips_past():
+    clock, sink = Clock(START), Recorder()
+    await add_task(1, START - timedelta(days=1))
+    await ReminderScheduler(sink, clock).tick()
+    assert sink.take() == []
+
+
+async def test_moved_due_date():
+    clock, sink = Clock(START), Recorder()
+    scheduler = ReminderScheduler(sink, clock)
+    await add_task(1, START + timedelta(minutes=5))
+    await scheduler.tick()
+    await set_due_date(1, START + timedelta(minutes=20))
+    scheduler.touch(1)
+    clock.advance(minutes=6)
+    await scheduler.tick()
+    assert sink.take() == []
+    # Moved earlier than the next heap entry: the wakeup must follow it
+    await add_task(2, START + timedelta(minutes=30))
+    await set_due_date(2, START + timedelta(minutes=8))
+    scheduler.touch(2)
+    await scheduler.tick()
+    assert scheduler.next_delay() <= 120
+    clock.advance(minutes=2)
+    await scheduler.tick()
+    assert sink.take() == [(2, False)]
+    clock.advance(minutes=12)
+    await scheduler.tick()
+    assert sink.take() == [(1, False)]
+
+
+async def test_skips_done():
+    clock, sink = Clock(START), Recorder()
+    scheduler = ReminderScheduler(sink, clock)
+    await add_task(1, START + timedelta(minutes=1), status="DONE")
+    await add_task(2, START + timedelta(minutes=2))
+    await scheduler.tick()
+    clock.advance(minutes=3)
+    await scheduler.tick()
+    assert sink.take() == [(2, False)]
+
+
+async def test_refills_in_batches():
+    clock, sink = Clock(START), Recorder()
+    scheduler = ReminderScheduler(sink, clock)
+    count = settings.REMINDER_BATCH * 2 + 7
+    for task_id in range(1, count + 1):
+        await add_task(task_id, START + timedelta(seconds=task_id))
+    await scheduler.tick()
+    assert len(scheduler._heap) == settings.REMINDER_BATCH
+    clock.advance(seconds=count)
+    await scheduler.tick()
+    assert [task_id for task_id, _ in sink.take()] == list(range(1, count + 1))
+
+
+async def test_two_schedulers():
+    clock = Clock(START)
+    schedulers = [ReminderScheduler(notify_due_tasks, clock) for _ in range(2)]
+    for task_id in range(1, 21):
+        await add_task(task_id, START + timedelta(minutes=task_id))
+    await asyncio.gather(*(scheduler.tick() for scheduler in schedulers))
+    for _ in range(4):
+        clock.advance(minutes=5)
+        await asyncio.gather(*(scheduler.tick() for scheduler in schedulers))
+    async with AsyncSessionLocal() as db:
+        notified = sorted((await db.scalars(select(Notification.task_id))).all())
+    assert notified == list(range(1, 21))
+    assert sum(scheduler.sent for scheduler in schedulers) == 20
+
+
+async def test_default_sink():
+    clock = Clock(START)
+    scheduler = ReminderScheduler(notify_due_tasks, clock)
+    await add_task(1, START + timedelta(minutes=1), assignee_id=2)
+    await add_task(2, START + timedelta(minutes=2), assignee_id=1)
+    await scheduler.tick()
+    clock.advance(minutes=10)
+    await scheduler.tick()
+    async with AsyncSessionLocal() as db:
+        rows = (await db.execute(
+            select(Notification.user_id, Notification.kind, Notification.task_id)
+            .order_by(Notification.task_id, Notification.user_id)
+        )).all()
+    assert [tuple(row) for row in rows] == [(1, "overdue", 1), (2, "overdue", 1), (1, "overdue", 2)]
@@ -0,0 +1,79 @@
+"""Comments in the task search index."""
+import json
+
+import pytest
+from sqlalchemy import insert, select, text
+
+from app.api.search import defer_comment_indexing, reindex_deferred_comments
+from app.core.database import AsyncSessionLocal, async_engine
+from app.models import Comment
+from app.models.search import task_search, task_search_deferred
+
+
+@pytest.fixture
+def user(make_users, auth_headers):
+    make_users(1)
+    return auth_headers("user1@example.com")
+
+
+def search(client, headers, q):
+    response = client.get("/api/v1/tasks/search", params={"q": q}, headers=headers)
+    response.raise_for_status()
+    return [result["task"]["title"] for result in response.json()]
+
+
+def test_comment_is_searchable(client, user):
+    project = client.post("/api/v1/projects/", json={"name": "Project"}, headers=user).json()
+    task = client.post(
+        "/api/v1/tasks/", json={"title": "Task", "project_id": project["id"]}, headers=user
+    ).json()
+    client.post(
+        f"/api/v1/tasks/{task['id']}/comments", json={"content": "needs a zebra"}, headers=user
+    ).raise_for_status()
+    assert search(client, user, "zebra") == ["Task"]
+
+
+def test_imported_thread_is_indexed(client, engine, user):
+    lines = [{"type": "project", "name": "Imported"}, {"type": "task", "id": 1, "title": "Thread"}]
+    lines += [
+        {"type": "comment", "id": i, "task_id": 1, "user_id": 1, "content": f"reply{i}"}
+        for i in range(50)
+    ]
+    client.post(
+        "/api/v1/projects/import", content="\n".join(json.dumps(line) for line in lines),
+        headers={**user, "Content-Type": "application/x-ndjson"},
+    ).raise_for_status()
+
+    assert search(client, user, "reply0") == ["Thread"]
+    assert search(client, user, "reply49") == ["Thread"]
+    with engine.connect() as conn:
+        assert conn.execute(select(task_search.c.comments)).scalar_one() == "\n".join(
+            f"reply{i}" for i in range(50)
+        )
+        assert conn.execute(select(task_search_deferred.c.task_id)).all() == []
+
+
+@pytest.mark.asyncio
+async def test_triggers_skip_deferred_tasks(client, engine, user):
+    project = client.post("/api/v1/projects/", json={"name": "Project"}, headers=user).json()
+    task = client.post(
+        "/api/v1/tasks/", json={"title": "Task", "project_id": project["id"]}, headers=user
+    ).json()
+    indexed = select(task_search.c.comments).where(task_search.c.rowid == task["id"])
+
+    try:
+        async with AsyncSessionLocal() as db:
+            await defer_comment_indexing(db, [task["id"]])
+            await db.execute(insert(Comment), [
+                {"task_id": task["id"], "user_id": 1, "content": "first"},
+                {"task_id": task["id"], "user_id": 1, "content": "second"},
+            ])
+            assert (await db.execute(indexed)).scalar_one() is None
+            await reindex_deferred_comments(db)
+            assert (await db.execute(indexed)).scalar_one() == "first\nsecond"
+            await db.commit()
+    finally:
+        await async_engine.dispose()
+
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT count(*) FROM task_search_deferred")).scalar_one() == 0
@@ -0,0 +1,82 @@
+"""Delta sync and change log compaction."""
+from datetime import timedelta
+
+import pytest
+
+from app.models.sync import compact_change_log
+
+
+@pytest.fixture
+def users(make_users, auth_headers):
+    make_users(1, 2)
+    return auth_headers("user1@example.com"), auth_headers("user2@example.com")
+
+
+def create_task(client, headers):
+    project = client.post("/api/v1/projects/", json={"name": "Project"}, headers=headers)
+    project.raise_for_status()
+    task = client.post(
+        "/api/v1/tasks/", json={"title": "Task", "project_id": project.json()["id"]},
+        headers=headers,
+    )
+    task.raise_for_status()
+    return task.json()["id"]
+
+
+def test_compaction_keeps_delete_when_another_owner_reuses_the_id(client, engine, users):
+    alice, bob = users
+    task_id = create_task(client, alice)
+    since = client.get("/api/v1/sync", params={"since": 0}, headers=alice).json()["version"]
+    assert client.delete(f"/api/v1/tasks/{task_id}", headers=alice).status_code == 204
+    # SQLite hands the highest deleted rowid out again
+    assert create_task(client, bob) == task_id
+
+    with engine.begin() as conn:
+        compact_change_log(conn, timedelta(days=30))
+
+    changes = client.get("/api/v1/sync", params={"since": since}, headers=alice).json()
+    assert changes["deleted"]["tasks"] == [task_id]
+    assert changes["tasks"] == []
+
+
+def test_compaction_drops_superseded_entries(client, engine, users):
+    alice, _ = users
+    task_id = create_task(client, alice)
+    for title in ("Renamed", "Renamed again"):
+        client.put(f"/api/v1/tasks/{task_id}", json={"title": title}, headers=alice).raise_for_status()
+
+    with engine.begin() as conn:
+        result = compact_change_log(conn, timedelta(days=30))
+
+    assert result.superseded == 2
+    changes = client.get("/api/v1/sync", params={"since": 0}, headers=alice).json()
+    assert [task["title"] for task in changes["tasks"]] == ["Renamed again"]
+
+
+def test_compacted_since_gets_the_version_to_resume_from(client, engine, users):
+    alice, _ = users
+    task_id = create_task(client, alice)
+    with engine.begin() as conn:
+        # Everything is past its retention
+        horizon = compact_change_log(conn, timedelta(days=-1)).horizon
+
+    gone = client.get("/api/v1/sync", params={"since": 0}, headers=alice)
+    assert gone.status_code == 410
+    assert int(gone.headers["x-sync-horizon"]) == horizon
+    version = int(gone.headers["x-sync-version"])
+    assert version >= horizon
+
+    client.put(f"/api/v1/tasks/{task_id}", json={"title": "Renamed"}, headers=alice).raise_for_status()
+    changes = client.get("/api/v1/sync", params={"since": version}, headers=alice).json()
+    assert [task["title"] for task in changes["tasks"]] == ["Renamed"]
+
+
+def test_assignee_profile_change_is_synced(client, users):
+    alice, bob = users
+    task_id = create_task(client, alice)
+    client.put(f"/api/v1/tasks/{task_id}", json={"assignee_id": 2}, headers=alice).raise_for_status()
+    since = client.get("/api/v1/sync", params={"since": 0}, headers=alice).json()["version"]
+
+    client.put("/api/v1/users/me", json={"full_name": "Bob"}, headers=bob).raise_for_status()
+    changes = client.get("/api/v1/sync", params={"since": since}, headers=alice).json()
+    assert [task["assignee"]["full_name"] for task in changes["tasks"]] == ["Bob"]
@@ -0,0 +1,38 @@
+"""Batch task endpoints."""
+import pytest
+
+
+@pytest.fixture
+def tasks(client, make_users, auth_headers):
+    """Two tasks of user 1; returns their headers and the task ids."""
+    make_users(1)
+    headers = auth_headers("user1@example.com")
+    project = client.post("/api/v1/projects/", json={"name": "Project"}, headers=headers).json()
+    created = client.post("/api/v1/tasks/batch", json={"items": [
+        {"title": f"Task {i}", "project_id": project["id"]} for i in range(2)
+    ]}, headers=headers).json()
+    assert created["succeeded"] == 2
+    return headers, [result["id"] for result in created["results"]]
+
+
+def test_batch_update_reports_nulls_per_item(client, tasks):
+    headers, (first, second) = tasks
+    response = client.put("/api/v1/tasks/batch", json={"items": [
+        {"id": first, "title": None},
+        {"id": second, "title": "Renamed", "description": None},
+        {"id": first, "status": None, "priority": None},
+    ]}, headers=headers)
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [result["status_code"] for result in body["results"]] == [400, 200, 400]
+    assert body["results"][0]["detail"] == "title cannot be null"
+    assert body["results"][2]["detail"] == "status, priority cannot be null"
+    assert client.get(f"/api/v1/tasks/{first}", headers=headers).json()["title"] == "Task 0"
+    assert client.get(f"/api/v1/tasks/{second}", headers=headers).json()["title"] == "Renamed"
+
+
+def test_update_rejects_null_title(client, tasks):
+    headers, (first, _) = tasks
+    response = client.put(f"/api/v1/tasks/{first}", json={"title": None}, headers=headers)
+    assert response.status_code == 400
@@ -0,0 +1,82 @@
+"""Project export and import."""
+import json
+
+import pytest
+from sqlalchemy import select
+
+from app.api.transfer import import_project_lines
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, async_engine
+from app.models import Comment, Project, Task
+
+
+@pytest.fixture
+def users(make_users, auth_headers):
+    make_users(1)
+    make_users(2, is_superuser=True)
+    return auth_headers("user1@example.com")
+
+
+def ndjson(*lines):
+    return "\n".join(json.dumps(line) for line in lines) + "\n"
+
+
+def test_import_does_not_trust_user_ids(client, engine, users):
+    body = ndjson(
+        {"type": "project", "name": "Imported"},
+        {"type": "task", "id": 7, "title": "Task", "assignee_id": 2},
+        {"type": "comment", "id": 9, "task_id": 7, "user_id": 2, "content": "Signed, the admin"},
+    )
+    response = client.post(
+        "/api/v1/projects/import", content=body,
+        headers={**users, "Content-Type": "application/x-ndjson"},
+    )
+    assert response.status_code == 201, response.text
+    assert (response.json()["tasks"], response.json()["comments"]) == (1, 1)
+
+    with engine.connect() as conn:
+        assert conn.execute(select(Task.assignee_id)).scalars().all() == [None]
+        assert conn.execute(select(Comment.user_id)).scalars().all() == [1]
+
+
+def test_export_round_trips(client, users):
+    project = client.post("/api/v1/projects/", json={"name": "Source"}, headers=users).json()
+    task = client.post(
+        "/api/v1/tasks/", json={"title": "Task", "project_id": project["id"]}, headers=users
+    ).json()
+    client.post(
+        f"/api/v1/tasks/{task['id']}/comments", json={"content": "Hello"}, headers=users
+    ).raise_for_status()
+
+    export = client.get(f"/api/v1/projects/{project['id']}/export", headers=users)
+    assert export.status_code == 200
+    imported = client.post(
+        "/api/v1/projects/import", content=export.content,
+        headers={**users, "Content-Type": "application/x-ndjson"},
+    )
+    assert imported.status_code == 201, imported.text
+    assert imported.json()["project"]["name"] == "Source"
+    assert (imported.json()["tasks"], imported.json()["comments"]) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_failed_stream_discards_committed_chunks(engine, users, monkeypatch):
+    monkeypatch.setattr(settings, "PROJECT_IMPORT_CHUNK_SIZE", 2)
+
+    async def chunks():
+        yield ndjson(
+            {"type": "project", "name": "Imported"},
+            *({"type": "task", "id": i, "title": f"Task {i}"} for i in range(5)),
+        ).encode()
+        raise ConnectionError("client went away")
+
+    try:
+        async with AsyncSessionLocal() as db:
+            with pytest.raises(ConnectionError):
+                await import_project_lines(db, 1, chunks())
+    finally:
+        await async_engine.dispose()
+
+    with engine.connect() as conn:
+        assert conn.execute(select(Project.id)).all() == []
+        assert conn.execute(select(Task.id)).all() == []
@@ -20,7 +20,7 @@ export interface Task {
   title: string;
   description: string | null;
   status: 'todo' | 'in_progress' | 'in_review' | 'done';
-  priority: number | null;
+  priority: 'low' | 'medium' | 'high';
   due_date: string | null;
   project_id: number;
   assignee_id: number | null;
@@ -88,7 +88,7 @@ export const useTaskStore = defineStore('tasks', () => {
     title: string;
     description?: string;
     status?: string;
-    priority?: number;
+    priority?: 'low' | 'medium' | 'high';
     due_date?: string;
     project_id: number;
     assignee_id?: number;
@@ -112,7 +112,7 @@ export const useTaskStore = defineStore('tasks', () => {
     title?: string;
     description?: string | null;
     status?: string;
-    priority?: number | null;
+    priority?: 'low' | 'medium' | 'high';
     due_date?: string | null;
     project_id?: number;
     assignee_id?: number | null;